@@ -1,8 +1,8 @@
+from services.startup import mark_first_paint, start_background_provisioning, start_warmup
+from services.memory import account_session
+from services.metrics import record_rerun, start_metrics_server
 import streamlit as st
-from ui.simulator import run_simulator
-from ui.auth import get_authenticator
-import pandas as pd
-import subprocess, os
+from ui.auth import logout, restore_session, sync_session_cookie
 from streamlit_javascript import st_javascript
 from ui.auth_pages import render_login, render_register
 
@@ -195,9 +195,10 @@ is_mobile = st.session_state.get("is_mobile", False)
 #</script>
 #""", unsafe_allow_html=True)
 
-
-if not os.path.exists("/home/appuser/.cache/ms-playwright"):
-    subprocess.run(["playwright", "install", "chromium"], check=True)
+# Playwright's Chromium is installed at deploy time (postCreate.sh →
+# python -m services.provision). Hosts without that step get it from a
+# background thread instead of blocking this script.
+start_background_provisioning()
 
 # --------------------------------------------------
 # GLOBAL session initialization (MUST BE FIRST)
@@ -225,6 +226,11 @@ if "authentication_status" not in st.session_state:
 if "username" not in st.session_state:
     st.session_state.username = None
 
+# Sign back in from the session cookie (refresh / new tab), and write
+# the cookie a login or logout queued on the previous run.
+restore_session()
+sync_session_cookie()
+
 # -------------------------------------------------------------------
 # UI RENDERERS
 # -------------------------------------------------------------------
@@ -511,6 +517,8 @@ def render_demo():
         st.rerun()
 
     # 🔥 DEMO MUST ALWAYS RENDER SIMULATOR
+    from ui.simulator import run_simulator
+
     run_simulator(is_guest=True)
 
 from datetime import datetime
@@ -623,13 +631,10 @@ def render_app_old():
     username = st.session_state.get("username")
     st.sidebar.success(f"Logged in as {username}")
 
-    authenticator = get_authenticator()
-
     # Logout
-    if authenticator.logout("Logout", "sidebar"):
+    if st.sidebar.button("Logout"):
         # Clear only auth-related state
-        for k in ["authentication_status", "username"]:
-            st.session_state[k] = None
+        logout()
 
         # Reset navigation
         st.session_state.view = "landing"
@@ -641,6 +646,8 @@ def render_app_old():
         #st.session_state.view = "landing"
         #st.rerun()
 
+    from ui.simulator import run_simulator
+
     run_simulator(is_guest=False)
 
 def render_app():
@@ -668,17 +675,12 @@ def render_app():
     with col1:
         st.success(f"Logged in as {username}")
 
-    authenticator = get_authenticator()
-
     with col2:
-        # 🟢 CHANGE: location="main" renders the button in the main page body
         # The key="unique_key" prevents duplicate ID errors if you have other buttons
-        if authenticator.logout("Logout", location="main", key="logout_btn"):
+        if st.button("Logout", key="logout_btn"):
             
             # Clear standard auth state
-            st.session_state["authentication_status"] = None
-            st.session_state["username"] = None
-            st.session_state["name"] = None # Good practice to clear name if used
+            logout()
             
             # Clear your custom app navigation state
             st.session_state.view = "landing"
@@ -688,6 +690,8 @@ def render_app():
 
     # --- YOUR APP LOGIC BELOW ---
     st.divider() # Visual separation
+    from ui.simulator import run_simulator
+
     run_simulator(is_guest=False)
 
 # -------------------------------------------------------------------
@@ -695,14 +699,27 @@ def render_app():
 # -------------------------------------------------------------------
 view = st.session_state.view
 
-if view == "landing":
-    if is_mobile:
-        render_landing()
-    else:
-        render_landing_old()
-elif view == "demo":
-    render_demo()
-elif view in ("login", "register"):
-    render_auth()
-else:
-    render_app()
+# Per-rerun latency (see services/metrics.py; scrape via METRICS_PORT)
+start_metrics_server()
+
+with record_rerun(page=view, is_mobile=is_mobile):
+    try:
+        if view == "landing":
+            if is_mobile:
+                render_landing()
+            else:
+                render_landing_old()
+            mark_first_paint("landing")
+        elif view == "demo":
+            render_demo()
+        elif view in ("login", "register"):
+            render_auth()
+        else:
+            render_app()
+    finally:
+        # Session memory budget (services/memory.py), also on st.stop / st.rerun
+        account_session()
+        # Configs, heavy imports, allocation tables, the PDF browser and
+        # the guest demo are warmed on a background thread once this page
+        # is drawn; see services.startup
+        start_warmup()
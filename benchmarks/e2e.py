@@ -0,0 +1,212 @@
+# benchmarks/e2e.py
+#
+# Full-rerun latency of app.py, driven through streamlit's AppTest
+# against the reference backend (devserver) served in-process, or
+# BACKEND_BASE_URL when --backend is given.
+#
+#   python -m benchmarks.e2e                       # all pages + interactions
+#   python -m benchmarks.e2e --repeat 20 --out e2e.json
+#   python -m benchmarks.e2e --latency 0.05        # simulate a remote API
+#
+# For every (user, device) pair it reports p50/p95 rerun time and the
+# backend calls made per rerun, for each page and each interaction.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+PAGES = ("Home", "Profile", "Expenses", "Strategy", "Report")
+USERS = ("guest", "premium")
+DEVICES = ("desktop", "mobile")
+
+DEFAULT_REPEAT = 10
+RUN_TIMEOUT_SECONDS = 120
+
+
+# -------------------------------------------------------------------
+# Sessions
+# -------------------------------------------------------------------
+def new_session(user: str, device: str):
+    """A fresh AppTest session already past the landing page."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT_SECONDS)
+    at.session_state["is_mobile"] = device == "mobile"
+
+    if user == "guest":
+        at.session_state["view"] = "demo"
+    else:
+        at.session_state["view"] = "app"
+        at.session_state["authentication_status"] = True
+        at.session_state["username"] = user
+        at.session_state["name"] = user
+
+    at.run()
+    return at
+
+
+def goto(at, page: str):
+    at.session_state["page"] = page
+    at.run()
+
+
+# -------------------------------------------------------------------
+# Interactions (each changes an input, so every call is a real rerun)
+# -------------------------------------------------------------------
+def move_allocation(at, i: int):
+    # Allocation controls are number inputs keyed alloc_<instrument>;
+    # on some layouts SWP is the (disabled) balancing remainder
+    widget = next(
+        w for w in at.number_input
+        if (w.key or "").startswith("alloc_") and not w.disabled
+    )
+    widget.set_value(float(widget.value) + (5 if i % 2 == 0 else -5)).run()
+
+
+def switch_scenario(at, i: int):
+    box = next(b for b in at.selectbox if "Conservative" in b.options)
+    options = [o for o in box.options if o != box.value]
+    box.select(options[i % len(options)]).run()
+
+
+def apply_expense_template(at, i: int):
+    box = at.selectbox(key="recurring_template")
+    box.select(box.options[i % len(box.options)])
+    next(b for b in at.button if b.label.startswith("Apply")).click().run()
+
+
+INTERACTIONS = {
+    "move_allocation": ("Strategy", move_allocation),
+    "switch_scenario": ("Strategy", switch_scenario),
+    "apply_expense_template": ("Expenses", apply_expense_template),
+}
+
+
+# -------------------------------------------------------------------
+# Measurement
+# -------------------------------------------------------------------
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _summarize(samples_ms, calls):
+    total_calls = {}
+    for c in calls:
+        for endpoint, n in c.items():
+            total_calls[endpoint] = total_calls.get(endpoint, 0) + n
+
+    return {
+        "p50_ms": round(statistics.median(samples_ms), 2),
+        "p95_ms": round(_percentile(samples_ms, 95), 2),
+        "max_ms": round(max(samples_ms), 2),
+        "reruns": len(samples_ms),
+        "backend_calls_per_rerun": {
+            k: round(v / len(calls), 2) for k, v in sorted(total_calls.items())
+        },
+    }
+
+
+def measure(at, action, repeat: int, backend) -> dict:
+    samples, calls, errors = [], [], 0
+
+    for i in range(repeat):
+        if backend is not None:
+            backend.reset_calls()
+        start = time.perf_counter()
+        action(at, i)
+        samples.append((time.perf_counter() - start) * 1000)
+        errors += len(at.exception)
+        if backend is not None:
+            calls.append(dict(backend.reset_calls()))
+
+    result = _summarize(samples, calls or [{}])
+    result["exceptions"] = errors
+    return result
+
+
+def run(repeat: int = DEFAULT_REPEAT, backend=None, users=USERS, devices=DEVICES) -> dict:
+    results = {}
+
+    for user in users:
+        for device in devices:
+            label = f"{user}/{device}"
+            at = new_session(user, device)
+
+            for page in PAGES:
+                goto(at, page)
+                results[f"page:{page}[{label}]"] = measure(
+                    at, lambda a, i: a.run(), repeat, backend
+                )
+
+            for name, (page, action) in INTERACTIONS.items():
+                goto(at, page)
+                try:
+                    results[f"{name}[{label}]"] = measure(at, action, repeat, backend)
+                except (StopIteration, KeyError) as e:
+                    # Widget not on this variant of the page (e.g. paywalled)
+                    results[f"{name}[{label}]"] = {"skipped": repr(e)}
+
+            for key in results:
+                if key.endswith(f"[{label}]") and "p50_ms" in results[key]:
+                    r = results[key]
+                    print(f"{key:<45} p50 {r['p50_ms']:>8.1f} ms  p95 {r['p95_ms']:>8.1f} ms  "
+                          f"calls/rerun {sum(r['backend_calls_per_rerun'].values()):.1f}",
+                          file=sys.stderr)
+
+    return {
+        "meta": {"repeat": repeat, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end rerun latency via AppTest")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--latency", type=float, default=0.0, help="reference backend delay per call (s)")
+    parser.add_argument("--backend", action="store_true", help="use BACKEND_BASE_URL instead of the reference backend")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    # Keep the harness hermetic: no Chromium download, no metrics port
+    os.environ.setdefault("SKIP_BROWSER_PROVISIONING", "1")
+    os.environ.pop("METRICS_PORT", None)
+
+    backend = None
+    if not args.backend:
+        from devserver.server import FaultInjector, ReferenceBackend
+        from devserver.store import Store, seed_demo_users
+
+        store = Store()
+        seed_demo_users(store)
+        backend = ReferenceBackend(store, FaultInjector(latency=args.latency))
+        # Must be set before services.api_client is first imported
+        os.environ["BACKEND_BASE_URL"] = backend.start()
+
+        from benchmarks.fixtures import make_user_data
+
+        # A complete saved plan, so every page renders its full content
+        store.save_user_data("premium", make_user_data("IN", 30))
+
+    try:
+        current = run(repeat=args.repeat, backend=backend)
+    finally:
+        if backend is not None:
+            backend.stop()
+
+    out = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# benchmarks/fixtures.py
+#
+# Fixture payloads for the benchmarks: one per country (IN/US/UK) and
+# projection length (2/30/60 years). Each file holds the config, the
+# user_data the UI would send and the /projections/ response it gets
+# back, in the backend's own shape.
+#
+#   python -m benchmarks.fixtures                  # synthesize
+#   python -m benchmarks.fixtures --record URL     # capture from a backend
+
+import argparse
+import copy
+import json
+import os
+
+import requests
+
+# Country config is shared with the reference backend (python -m devserver)
+from devserver.config import (
+    COUNTRY_LABEL,
+    CURRENCY,
+    GL_DEFAULTS,
+    ONETIME_DEFAULTS as ONETIME,
+    RECURRING_DEFAULTS as RECURRING,
+    SCALE,
+    make_config,
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+COUNTRIES = ("IN", "US", "UK")
+PROJECTION_YEARS = (2, 30, 60)
+
+INITIAL_CORPUS = {
+    "IN": {"PF": 3_500_000, "PPF": 1_500_000, "Gratuity": 1_000_000, "Savings": 2_000_000},
+    "US": {"401K": 450_000, "IRA": 120_000, "Savings": 60_000},
+    "UK": {"PENSION": 380_000, "ISA": 90_000, "Savings": 40_000},
+}
+
+
+def make_user_data(country: str, years: int) -> dict:
+    """Saved simulator inputs as the UI holds them in st.session_state.user_data."""
+    # Imported here so `--record` works without pulling in the UI
+    from ui.investment_plan import ensure_scenarios
+
+    scale = SCALE[country]
+    user_data = {k: {"input": v} for k, v in GL_DEFAULTS.items()}
+    user_data["GLProjectionYears"] = {"input": years}
+    user_data["country"] = country
+    user_data["initial_corpus"] = {country: dict(INITIAL_CORPUS[country])}
+    user_data["onetime_expenses"] = {
+        country: {k: {"input": round(v * scale)} for k, v in ONETIME.items()}
+    }
+    user_data["recurring_expenses"] = {
+        country: {k: {"monthly": round(v * scale)} for k, v in RECURRING.items()}
+    }
+
+    plan = {}
+    ensure_scenarios(plan, country)
+    user_data["investment_plan"] = {country: copy.deepcopy(plan), **copy.deepcopy(plan)}
+    return user_data
+
+
+def _gl(user_data: dict, key: str, default: float) -> float:
+    try:
+        return float(user_data.get(key, {}).get("input", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _synthetic_projections(user_data: dict, scenario: dict) -> list:
+    """Simple year-by-year model; only the shape and magnitudes matter here."""
+    country = user_data.get("country", "IN")
+    years = int(_gl(user_data, "GLProjectionYears", 30))
+    inflation = _gl(user_data, "GLInflationRate", 6.0) / 100
+
+    corpus = float(sum(user_data.get("initial_corpus", {}).get(country, {}).values()))
+    onetime = sum(float(v.get("input", 0)) for v in user_data.get("onetime_expenses", {}).get(country, {}).values())
+    recurring = user_data.get("recurring_expenses", {}).get(country, {})
+    must = 12 * sum(float(v.get("monthly", 0)) for k, v in recurring.items() if not k.endswith("Opt"))
+    optional = 12 * sum(float(v.get("monthly", 0)) for k, v in recurring.items() if k.endswith("Opt"))
+
+    allocations = scenario.get("allocations", {})
+    rates = scenario.get("rates", {})
+    withdrawal = 12 * float(scenario.get("withdrawal", {}).get("monthly", 0))
+    other_income = 12 * sum(float(v or 0) for v in scenario.get("income_sources", {}).values())
+
+    rows = []
+    corpus -= onetime
+    for year in range(1, years + 1):
+        growth = 1 + inflation
+        row = {"Year": year}
+        for name, pct in allocations.items():
+            row[f"{name}Income"] = round(corpus * pct / 100 * rates.get(name, 0) / 100, 2)
+        income = sum(row[f"{n}Income"] for n in allocations) + other_income
+        row["AnnualMustExpenses"] = round(must * growth ** (year - 1), 2)
+        row["AnnualOptionalExpenses"] = round(optional * growth ** (year - 1), 2)
+        row["TotalExpenses"] = row["AnnualMustExpenses"] + row["AnnualOptionalExpenses"]
+        row["TotalIncome"] = round(income, 2)
+        row["TotalTax"] = round(income * 0.1, 2)
+        row["NetIncomeAfterTax"] = round(income - row["TotalTax"], 2)
+        row["TotalWithdrawal"] = withdrawal
+        corpus = corpus + row["NetIncomeAfterTax"] - row["TotalExpenses"] - withdrawal
+        row["EndingCorpus"] = round(corpus, 2)
+        rows.append(row)
+    return rows
+
+
+def synthesize_result(user_data: dict) -> dict:
+    country = user_data.get("country", "IN")
+    plan = user_data["investment_plan"][country]
+    active = plan.get("active_scenario", "Base")
+
+    results = {
+        name: {"projections": _synthetic_projections(user_data, sc)}
+        for name, sc in plan["scenarios"].items()
+    }
+
+    return {
+        "active_result": {"projections": results[active]["projections"], "scenario": active},
+        "results_by_scenario": results,
+        "base_context": {
+            "_meta": {
+                "currency": CURRENCY[country],
+                "scenario": active,
+                "country_label": COUNTRY_LABEL[country],
+            },
+            "initial_corpus": {"total": sum(user_data.get("initial_corpus", {}).get(country, {}).values())},
+            "one_time": {"total": sum(v.get("input", 0) for v in user_data.get("onetime_expenses", {}).get(country, {}).values())},
+            "scenario_results": {name: r["projections"] for name, r in results.items()},
+        },
+        "life_stage": "retired",
+        "life_stage_metrics": {"Years Covered": int(_gl(user_data, "GLProjectionYears", 30))},
+    }
+
+
+def fixture_path(country: str, years: int) -> str:
+    return os.path.join(FIXTURE_DIR, f"{country.lower()}_{years}y.json")
+
+
+def load_fixture(country: str, years: int) -> dict:
+    with open(fixture_path(country, years), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def all_fixtures():
+    for country in COUNTRIES:
+        for years in PROJECTION_YEARS:
+            yield f"{country}-{years}y", load_fixture(country, years)
+
+
+def write_fixtures(record_url: str | None = None):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+
+    for country in COUNTRIES:
+        for years in PROJECTION_YEARS:
+            user_data = make_user_data(country, years)
+
+            if record_url:
+                config = requests.get(f"{record_url}/config/", params={"country": country}, timeout=30).json()
+                resp = requests.post(
+                    f"{record_url}/projections/",
+                    json={"user_data": user_data, "user": {"username": "bench", "is_guest": False, "is_premium": True}},
+                    timeout=60,
+                )
+                resp.raise_for_status()
+                result = resp.json()
+            else:
+                config = make_config(country)
+                result = synthesize_result(user_data)
+
+            with open(fixture_path(country, years), "w", encoding="utf-8") as f:
+                json.dump(
+                    {"country": country, "years": years, "config": config,
+                     "user_data": user_data, "result": result},
+                    f, ensure_ascii=False, separators=(",", ":"),
+                )
+            print(f"wrote {fixture_path(country, years)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write benchmark fixtures")
+    parser.add_argument("--record", metavar="BACKEND_URL", help="capture responses from a running backend")
+    args = parser.parse_args()
+    write_fixtures(args.record)
@@ -0,0 +1,112 @@
+# benchmarks/goal_seek.py
+#
+# Checks each goal-seek answer against the year-by-year reference and
+# times the solves. The batched kernel itself is covered by
+# tests/test_projection_engine.py.
+#
+#   python -m benchmarks.goal_seek
+#   python -m benchmarks.goal_seek --repeat 20
+#
+# Each answer must survive the horizon when projected stepwise, and one
+# step past it (a unit more withdrawal, a unit less corpus, a year
+# later) must not. Exits 1 on any failure.
+
+import argparse
+import math
+import sys
+from dataclasses import replace
+
+from benchmarks.fixtures import all_fixtures
+from benchmarks.run import timeit
+
+
+def _scenario_inputs(fixture):
+    from services.projection_engine import inputs_from_user_data
+
+    user_data = fixture["user_data"]
+    plan = user_data["investment_plan"][fixture["country"]]
+    return {name: inputs_from_user_data(user_data, sc) for name, sc in plan["scenarios"].items()}
+
+
+def _survives(inputs) -> bool:
+    from services.projection_engine import project_stepwise
+
+    return all(row["EndingCorpus"] >= 0 for row in project_stepwise(inputs))
+
+
+def check_solves() -> tuple:
+    from services.goal_seek import latest_affordable_year, max_monthly_withdrawal, min_starting_corpus
+
+    cases = failed = 0
+
+    def expect(ok, what):
+        nonlocal cases, failed
+        cases += 1
+        if not ok:
+            failed += 1
+            print(f"SOLVE FAILED {what}", file=sys.stderr)
+
+    for fixture_name, fixture in all_fixtures():
+        for scenario_name, inputs in _scenario_inputs(fixture).items():
+            where = f"{fixture_name} {scenario_name}"
+
+            monthly = max_monthly_withdrawal(inputs)
+            if monthly is None:
+                expect(not _survives(replace(inputs, withdrawal=0.0)), f"{where} withdrawal None")
+            elif math.isinf(monthly):
+                expect(_survives(replace(inputs, withdrawal=12 * max(inputs.corpus, 1.0))),
+                       f"{where} withdrawal unbounded")
+            else:
+                expect(_survives(replace(inputs, withdrawal=12 * monthly)), f"{where} withdrawal {monthly}")
+                expect(not _survives(replace(inputs, withdrawal=12 * (monthly + 2))),
+                       f"{where} withdrawal {monthly} not maximal")
+
+            corpus = min_starting_corpus(inputs)
+            expect(corpus is not None and _survives(replace(inputs, corpus=corpus)), f"{where} corpus {corpus}")
+            if corpus:
+                expect(not _survives(replace(inputs, corpus=corpus * (1 - 1e-5) - 2)),
+                       f"{where} corpus {corpus} not minimal")
+
+            rich = replace(inputs, corpus=corpus * 1.5) if corpus else inputs
+            amount = rich.corpus * 0.2
+            year = latest_affordable_year(rich, amount)
+            if year is not None:
+                expect(_survives(replace(rich, one_time={**rich.one_time, year: rich.one_time.get(year, 0) + amount})),
+                       f"{where} year {year}")
+                if year < rich.years:
+                    expect(not _survives(replace(rich, one_time={**rich.one_time, year + 1: rich.one_time.get(year + 1, 0) + amount})),
+                           f"{where} year {year} not latest")
+    return cases, failed
+
+
+def timings(repeat: int) -> dict:
+    from services.goal_seek import latest_affordable_year, max_monthly_withdrawal, min_starting_corpus
+
+    out = {}
+    for fixture_name, fixture in all_fixtures():
+        inputs = _scenario_inputs(fixture)["Base"]
+        out[fixture_name] = {
+            "max_monthly_withdrawal_ms": timeit(lambda: max_monthly_withdrawal(inputs), repeat=repeat)["median_ms"],
+            "min_starting_corpus_ms": timeit(lambda: min_starting_corpus(inputs), repeat=repeat)["median_ms"],
+            "latest_affordable_year_ms": timeit(
+                lambda: latest_affordable_year(inputs, inputs.corpus * 0.1), repeat=repeat
+            )["median_ms"],
+        }
+        print(f"{fixture_name:<8} " + "   ".join(f"{k[:-3]} {v:>7.2f} ms" for k, v in out[fixture_name].items()),
+              file=sys.stderr)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal-seek checks and timings")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    solves = check_solves()
+    print(f"solves: {solves[0]} checks, {solves[1]} failed", file=sys.stderr)
+    timings(args.repeat)
+    return 1 if solves[1] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
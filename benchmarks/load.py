@@ -0,0 +1,392 @@
+# benchmarks/load.py
+#
+# Multi-session load generator for capacity planning.
+#
+# Starts the reference backend (python -m devserver) and a real
+# `streamlit run app.py` server, then opens N concurrent sessions over
+# Streamlit's websocket protocol. Each session walks
+#   landing -> demo -> Profile -> Expenses -> Strategy -> Report
+# with exponential think times, sending the same widget states a
+# browser would (viewport width, the demo button, the nav menu).
+#
+#   python -m benchmarks.load                           # ramp 1,2,4,8
+#   python -m benchmarks.load --sessions 1,4,16,32 --think 3 --walks 3
+#   python -m benchmarks.load --latency 0.05 --out load.json
+#   python -m benchmarks.load --url http://127.0.0.1:8501 --server-pid 1234
+#
+# For every concurrency level it reports throughput (steps/s), rerun
+# latency percentiles, server CPU, RSS growth per live session, and the
+# saturation point: the first level where throughput grows by less
+# than --min-gain over the previous level, or p95 exceeds --slo-ms.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.e2e import APP_PATH, _percentile
+
+FLOW = ("landing", "demo", "Profile", "Expenses", "Strategy", "Report")
+
+DEFAULT_LEVELS = "1,2,4,8"
+DEFAULT_THINK_SECONDS = 2.0
+DEFAULT_WALKS = 2
+DEFAULT_MIN_GAIN = 0.10
+DEFAULT_SLO_MS = 2000.0
+DEFAULT_PORT = 8599
+
+RERUN_TIMEOUT_SECONDS = 120
+VIEWPORT = {"desktop": "1280", "mobile": "390"}
+
+# ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN: st.rerun() inside the
+# run; the user is still waiting for the follow-up run
+FINISHED_EARLY_FOR_RERUN = 2
+
+
+# -------------------------------------------------------------------
+# Server process
+# -------------------------------------------------------------------
+def _proc_status(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def rss_bytes(pid: int) -> int:
+    return _proc_status(pid, "VmRSS:")
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime are fields 14 and 15 (1-based) of the full line
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def start_app(port: int, backend_url: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "BACKEND_BASE_URL": backend_url,
+        "SKIP_BROWSER_PROVISIONING": "1",
+    })
+    env.pop("METRICS_PORT", None)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true",
+         "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).ok:
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+
+    proc.terminate()
+    raise RuntimeError(f"streamlit did not come up on port {port}")
+
+
+# -------------------------------------------------------------------
+# One simulated browser tab
+# -------------------------------------------------------------------
+class StreamlitClient:
+    """Minimal Streamlit websocket client: widget states in, elements out."""
+
+    def __init__(self, base_url: str):
+        from websockets.sync.client import connect
+
+        ws_url = base_url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        try:
+            # websockets >= 17 returns a lazy proxy unless asked for the connection
+            self.ws = connect(ws_url, subprotocols=["streamlit"], max_size=None, legacy=True)
+        except TypeError:
+            self.ws = connect(ws_url, subprotocols=["streamlit"], max_size=None)
+        self.states = {}         # widget id -> (field, value), resent every rerun
+        self.elements = []       # (type, proto) from the last completed run
+
+    def rerun(self, trigger: str | None = None) -> float:
+        """Run the script once (plus any st.rerun follow-ups); returns ms."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.SetInParent()
+        for wid, (field, value) in self.states.items():
+            w = state.widget_states.widgets.add()
+            w.id = wid
+            setattr(w, field, value)
+        if trigger:
+            w = state.widget_states.widgets.add()
+            w.id = trigger
+            w.trigger_value = True
+
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+
+        elements = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=RERUN_TIMEOUT_SECONDS))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                el = fwd.delta.new_element
+                et = el.WhichOneof("type")
+                elements.append((et, getattr(el, et)))
+            elif kind == "script_finished":
+                if fwd.script_finished != FINISHED_EARLY_FOR_RERUN:
+                    break
+                elements = []
+
+        self.elements = elements
+        return (time.perf_counter() - start) * 1000
+
+    def find(self, kind: str, match) -> str:
+        return next(e.id for et, e in self.elements if et == kind and match(e))
+
+    def component(self, name_part: str) -> str:
+        return self.find("component_instance", lambda e: name_part in e.component_name)
+
+    @property
+    def exceptions(self) -> list:
+        return [e.message for et, e in self.elements if et == "exception"]
+
+    def close(self):
+        self.ws.close()
+
+
+class Session:
+
+    def __init__(self, base_url: str, seed: int, think: float, device: str = "desktop"):
+        self.base_url = base_url
+        self.rng = random.Random(seed)
+        self.think = think
+        self.device = device
+        self.samples = []        # step latencies (ms)
+        self.errors = 0
+        self.client = None
+
+    def _pause(self):
+        if self.think > 0:
+            time.sleep(self.rng.expovariate(1 / self.think))
+
+    def _step(self, stage):
+        c = self.client
+        if stage == "landing":
+            # First paint, then the browser reports its width through
+            # st_javascript, which reruns into the device's layout
+            elapsed = c.rerun()
+            c.states[c.component("javascript")] = ("json_value", VIEWPORT[self.device])
+            return elapsed + c.rerun()
+        if stage == "demo":
+            return c.rerun(trigger=c.find("button", lambda b: "Demo" in b.label))
+        # Nav menu id changes with its default_index, so look it up each time
+        c.states[c.component("option_menu")] = ("json_value", json.dumps(stage))
+        return c.rerun()
+
+    def walk(self):
+        """One visit; the connection stays open (a live session) until close()."""
+        self.close()
+        self.client = StreamlitClient(self.base_url)
+
+        for stage in FLOW:
+            try:
+                self.samples.append(self._step(stage))
+                self.errors += len(self.client.exceptions)
+            except Exception as e:
+                print(f"[load] {stage}: {e!r}", file=sys.stderr)
+                self.errors += 1
+                return
+            self._pause()
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+# -------------------------------------------------------------------
+# Concurrency levels
+# -------------------------------------------------------------------
+def run_level(base_url: str, server_pid: int | None, n: int, walks: int, think: float,
+              mobile_share: float, seed: int) -> dict:
+    sessions = [
+        Session(base_url, seed * 1000 + i, think,
+                device="mobile" if i < round(n * mobile_share) else "desktop")
+        for i in range(n)
+    ]
+
+    rss_before = rss_bytes(server_pid) if server_pid else 0
+    cpu_before = cpu_seconds(server_pid) if server_pid else 0.0
+    rss_peak = [rss_before]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.25):
+            rss_peak[0] = max(rss_peak[0], rss_bytes(server_pid))
+
+    def worker(session):
+        for _ in range(walks):
+            session.walk()
+
+    if server_pid:
+        threading.Thread(target=sample_rss, daemon=True).start()
+
+    threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in sessions]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    done.set()
+    cpu = (cpu_seconds(server_pid) - cpu_before) if server_pid else None
+    for s in sessions:
+        s.close()
+
+    samples = [ms for s in sessions for ms in s.samples]
+    result = {
+        "sessions": n,
+        "steps": len(samples),
+        "errors": sum(s.errors for s in sessions),
+        "wall_s": round(wall, 2),
+        "throughput_rps": round(len(samples) / wall, 2) if wall else 0.0,
+    }
+    if samples:
+        result.update({
+            "p50_ms": round(statistics.median(samples), 1),
+            "p95_ms": round(_percentile(samples, 95), 1),
+            "p99_ms": round(_percentile(samples, 99), 1),
+            "max_ms": round(max(samples), 1),
+        })
+    if server_pid:
+        result.update({
+            "server_cpu_util": round(cpu / wall, 2) if wall else 0.0,
+            "cpu_ms_per_step": round(cpu * 1000 / len(samples), 1) if samples else None,
+            "rss_mb": round(rss_peak[0] / 2**20, 1),
+            "rss_per_session_mb": round((rss_peak[0] - rss_before) / n / 2**20, 2),
+        })
+    return result
+
+
+def saturation_point(levels: list, min_gain: float, slo_ms: float):
+    """First level that no longer pays for itself, or None."""
+    for prev, cur in zip([None] + levels, levels):
+        if cur.get("p95_ms", 0) > slo_ms:
+            return {"sessions": cur["sessions"], "reason": f"p95 {cur['p95_ms']} ms > SLO {slo_ms} ms"}
+        if prev and prev["throughput_rps"]:
+            gain = cur["throughput_rps"] / prev["throughput_rps"] - 1
+            if gain < min_gain:
+                return {
+                    "sessions": cur["sessions"],
+                    "reason": f"throughput {gain:+.0%} over {prev['sessions']} sessions",
+                }
+    return None
+
+
+def run(base_url, server_pid, levels, walks=DEFAULT_WALKS, think=DEFAULT_THINK_SECONDS,
+        mobile_share=0.5, seed=1, min_gain=DEFAULT_MIN_GAIN, slo_ms=DEFAULT_SLO_MS) -> dict:
+    # One untimed visit so lazy imports and first-use caches don't land
+    # on the first level's numbers
+    warmup = Session(base_url, seed=0, think=0)
+    warmup.walk()
+    warmup.close()
+
+    results = []
+    for n in levels:
+        r = run_level(base_url, server_pid, n, walks, think, mobile_share, seed)
+        results.append(r)
+        print(f"{n:>4} sessions  {r['throughput_rps']:>7.2f} steps/s  "
+              f"p50 {r.get('p50_ms', 0):>8.1f} ms  p95 {r.get('p95_ms', 0):>8.1f} ms  "
+              f"cpu {r.get('server_cpu_util', 0):>5.2f}  "
+              f"rss/session {r.get('rss_per_session_mb', 0):>6.1f} MB  errors {r['errors']}",
+              file=sys.stderr)
+
+    return {
+        "meta": {
+            "flow": FLOW,
+            "walks": walks,
+            "think_s": think,
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "levels": results,
+        "saturation": saturation_point(results, min_gain, slo_ms),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load generator")
+    parser.add_argument("--sessions", default=DEFAULT_LEVELS, help="comma-separated concurrency levels")
+    parser.add_argument("--walks", type=int, default=DEFAULT_WALKS, help="flow walks per session")
+    parser.add_argument("--think", type=float, default=DEFAULT_THINK_SECONDS, help="mean think time (s)")
+    parser.add_argument("--mobile-share", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-gain", type=float, default=DEFAULT_MIN_GAIN)
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS)
+    parser.add_argument("--latency", type=float, default=0.0, help="reference backend delay per call (s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port for the app server")
+    parser.add_argument("--url", help="drive an already running app instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="with --url: app server pid, for RSS/CPU")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    backend = app = None
+    if args.url:
+        base_url, server_pid = args.url, args.server_pid
+    else:
+        from devserver.server import FaultInjector, ReferenceBackend
+
+        backend = ReferenceBackend(faults=FaultInjector(latency=args.latency))
+        app = start_app(args.port, backend.start())
+        base_url, server_pid = f"http://127.0.0.1:{args.port}", app.pid
+
+    try:
+        result = run(
+            base_url, server_pid,
+            [int(n) for n in args.sessions.split(",")],
+            walks=args.walks,
+            think=args.think,
+            mobile_share=args.mobile_share,
+            seed=args.seed,
+            min_gain=args.min_gain,
+            slo_ms=args.slo_ms,
+        )
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait(timeout=30)
+        if backend is not None:
+            backend.stop()
+
+    sat = result["saturation"]
+    print(f"saturation: {sat['sessions']} sessions ({sat['reason']})" if sat
+          else "saturation: not reached", file=sys.stderr)
+
+    out = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# benchmarks/run.py
+#
+# Micro-benchmarks for the simulator's hot paths, run against every
+# fixture in benchmarks/fixtures.
+#
+#   python -m benchmarks.run                          # print JSON
+#   python -m benchmarks.run --out bench.json         # write JSON
+#   python -m benchmarks.run --save-baseline          # refresh baseline
+#   python -m benchmarks.run --compare                # fail on regression
+#
+# A case regresses when its median is more than --threshold times the
+# baseline median (and slower by at least --min-delta-ms, so sub-ms
+# noise doesn't fail the build).
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.fixtures import all_fixtures
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+DEFAULT_REPEAT = 15
+DEFAULT_THRESHOLD = 1.25
+DEFAULT_MIN_DELTA_MS = 0.5
+
+
+def timeit(fn, repeat: int = DEFAULT_REPEAT, min_time: float = 0.005) -> dict:
+    """Time fn() `repeat` times; calls are batched so each sample lasts >= min_time."""
+    fn()  # warm caches / imports
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time or number >= 10_000:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "calls_per_sample": number,
+        "samples": repeat,
+    }
+
+
+# -------------------------------------------------------------------
+# Cases (one list per fixture)
+# -------------------------------------------------------------------
+def _cases(fixture: dict):
+    import pandas as pd
+
+    from ui.allocations_engine import AllocationEngine
+    from ui.investment_plan import apply_instrument_caps, ensure_scenarios
+    from ui.onetime_expenses import _eval_formula
+    from ui import summary
+    from ui.pdf import build_financial_html
+
+    country = fixture["country"]
+    user_data = fixture["user_data"]
+    result = fixture["result"]
+    config = fixture["config"]
+
+    projections = result["active_result"]["projections"]
+    base_context = result["base_context"]
+    plan = user_data["investment_plan"][country]
+    scenario = plan["scenarios"][plan["active_scenario"]]
+    corpus = base_context["initial_corpus"]["total"]
+    age = user_data["GLAge"]["input"]
+
+    df = pd.DataFrame(projections)
+    score, breakdown = summary.compute_retirement_score(df, base_context)
+    onetime_rows, recurring_rows = summary.expense_rows(user_data)
+    cmp_df = summary.build_scenario_comparison_df(base_context)
+
+    formula = next(f["Field Input"] for f in config["onetime_expenses"] if f.get("Field Input"))
+    onetime_data = user_data["onetime_expenses"][country]
+
+    def pdf_html():
+        figs = (
+            summary.build_income_expense_figure(df),
+            summary.build_corpus_figure(df),
+            summary.build_tax_figure(df),
+            summary.build_onetime_figure(onetime_rows),
+            summary.build_recurring_figure(recurring_rows),
+            summary.build_expense_growth_figure(df),
+        )
+        return summary.build_pdf_chart_html(*figs)
+
+    chart_html = pdf_html()
+
+    return {
+        "allocation_engine_build": lambda: AllocationEngine(country, age, corpus).build(scenario["allocations"]),
+        "apply_instrument_caps": lambda: apply_instrument_caps(corpus, scenario["allocations"], age),
+        "ensure_scenarios_fresh": lambda: ensure_scenarios({}, country),
+        "ensure_scenarios_existing": lambda: ensure_scenarios(copy.deepcopy(plan), country),
+        "eval_formula": lambda: _eval_formula(formula, onetime_data),
+        "dataframe_from_projections": lambda: pd.DataFrame(projections),
+        "dataframe_scenario_comparison": lambda: summary.build_scenario_comparison_df(base_context),
+        "compute_retirement_score": lambda: summary.compute_retirement_score(df, base_context),
+        "figure_score": lambda: summary.build_score_figure(breakdown),
+        "figure_income_expense": lambda: summary.build_income_expense_figure(df),
+        "figure_corpus": lambda: summary.build_corpus_figure(df),
+        "figure_tax": lambda: summary.build_tax_figure(df),
+        "figure_onetime": lambda: summary.build_onetime_figure(onetime_rows),
+        "figure_recurring": lambda: summary.build_recurring_figure(recurring_rows),
+        "figure_expense_growth": lambda: summary.build_expense_growth_figure(df),
+        "figure_scenario_comparison": lambda: summary.build_scenario_comparison_figure(cmp_df),
+        "pdf_chart_html": pdf_html,
+        "build_financial_html": lambda: build_financial_html(
+            "bench", base_context, df, base_context["_meta"]["currency"],
+            retirement_score=score,
+            score_breakdown=breakdown,
+            scenario_comparison_df=cmp_df,
+            **chart_html,
+        ),
+    }
+
+
+def run(repeat: int = DEFAULT_REPEAT, only: str | None = None) -> dict:
+    results = {}
+    for fixture_name, fixture in all_fixtures():
+        for case, fn in _cases(fixture).items():
+            name = f"{case}[{fixture_name}]"
+            if only and only not in name:
+                continue
+            results[name] = timeit(fn, repeat=repeat)
+            print(f"{name:<55} {results[name]['median_ms']:>10.3f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """List of regressions: cases whose median grew past threshold x baseline."""
+    regressions = []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if ratio > threshold and res["median_ms"] - base["median_ms"] > min_delta_ms:
+            regressions.append({
+                "case": name,
+                "baseline_ms": base["median_ms"],
+                "current_ms": res["median_ms"],
+                "ratio": round(ratio, 2),
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator hot-path benchmarks")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", help="run cases whose name contains this substring")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(argv)
+
+    current = run(repeat=args.repeat, only=args.only)
+
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        current["regressions"] = compare(current, baseline, args.threshold, args.min_delta_ms)
+
+    out = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(out)
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+
+    if current.get("regressions"):
+        for r in current["regressions"]:
+            print(f"REGRESSION {r['case']}: {r['baseline_ms']} -> {r['current_ms']} ms "
+                  f"(x{r['ratio']})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Local reference backend for offline and load testing.
+#
+#   python -m devserver                                  # :8000, in-memory DB
+#   python -m devserver --db dev.sqlite3 --port 8001
+#   python -m devserver --latency 0.05 --jitter 0.02 --error-rate 0.01 --seed 7
+#   python -m devserver --endpoint-latency /projections/=0.4
+#
+# Point the UI at it with BACKEND_BASE_URL=http://127.0.0.1:8000.
+# Demo accounts: demo / demo (free) and premium / premium (lifetime).
+
+import argparse
+import sys
+
+from devserver.server import FaultInjector, ReferenceBackend
+from devserver.store import Store, seed_demo_users
+
+
+def _endpoint_latency(values):
+    overrides = {}
+    for v in values:
+        template, _, seconds = v.partition("=")
+        overrides[template] = float(seconds)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local reference backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--db", default=":memory:", help="SQLite file (default: in-memory)")
+    parser.add_argument("--latency", type=float, default=0.0, help="added delay per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--seed", type=int, default=None, help="seed for jitter and errors")
+    parser.add_argument("--endpoint-latency", action="append", default=[],
+                        metavar="TEMPLATE=SECONDS", help="per-endpoint delay, e.g. /projections/=0.4")
+    args = parser.parse_args(argv)
+
+    store = Store(args.db)
+    seed_demo_users(store)
+
+    faults = FaultInjector(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        endpoint_latency=_endpoint_latency(args.endpoint_latency),
+    )
+
+    print(f"[devserver] http://{args.host}:{args.port} (db={args.db}, latency={args.latency}s, "
+          f"jitter={args.jitter}s, error_rate={args.error_rate})")
+    try:
+        ReferenceBackend(store, faults).serve_forever(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
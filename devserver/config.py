@@ -0,0 +1,86 @@
+# Country configuration served by the reference backend's /config/.
+# Field lists follow the backend's sheet-derived shape ("Field Name",
+# "Field Description", "Field Default Value", optional "Field Input"
+# formula).
+
+from services.projection_engine import base_data_defaults
+
+CURRENCY = {"IN": "₹", "US": "$", "UK": "£"}
+COUNTRY_LABEL = {"IN": "India", "US": "United States", "UK": "United Kingdom"}
+
+# Rough local scale so amounts look like real plans
+SCALE = {"IN": 1.0, "US": 1 / 80, "UK": 1 / 100}
+
+GL_DEFAULTS = {
+    "GLAge": 58,
+    "GLInflationRate": 6.0,
+    "GLSWPGrowthRate": 10.0,
+    "GLNormalFDRate": 6.5,
+    "GLSrCitizenFDRate": 7.0,
+    "GLSCSSRate": 8.2,
+    "GLPOMISRate": 7.4,
+}
+DEFAULT_PROJECTION_YEARS = 30
+
+ONETIME_DEFAULTS = {
+    "LocalKidsEducation": 1_500_000,
+    "LocalHouseRenovation": 800_000,
+    "LocalVehicleRenewal": 900_000,
+    "LocalJewelry": 300_000,
+    "LocalTravelForeign": 400_000,
+    "LocalMarriages": 1_200_000,
+    "LocalProperty": 0,
+    "LocalOthers": 150_000,
+}
+
+# Monthly amounts; names ending in "Opt" are optional spending
+RECURRING_DEFAULTS = {
+    "LocalGroceryVeg": 9_000,
+    "LocalWaterElectricity": 4_000,
+    "LocalTransportFuel": 5_000,
+    "LocalMedicalInsurance": 3_500,
+    "LocalHouseHelp": 4_000,
+    "LocalEntertainmentOpt": 3_000,
+    "LocalTravelOpt": 5_000,
+    "LocalDiningOpt": 2_500,
+}
+
+
+def _field(name, description, default, formula=None):
+    f = {
+        "Field Name": name,
+        "Field Description": description,
+        "Field Default Value": default,
+    }
+    if formula:
+        f["Field Input"] = formula
+    return f
+
+
+def make_config(country: str) -> dict:
+    scale = SCALE.get(country, 1.0)
+
+    onetime_fields = [
+        _field(k, k.replace("Local", ""), round(v * scale)) for k, v in ONETIME_DEFAULTS.items()
+    ]
+    onetime_fields.append(_field(
+        "LocalOneTimeTotal", "Total one-time", 0,
+        formula="=" + "+".join("{%s}" % k for k in ONETIME_DEFAULTS),
+    ))
+
+    return {
+        "about": "Future Finance Simulator",
+        "base_data": [
+            _field(k, k[2:], v) for k, v in GL_DEFAULTS.items()
+        ] + [_field("GLProjectionYears", "Projection years", DEFAULT_PROJECTION_YEARS)],
+        "onetime_expenses": onetime_fields,
+        "recurring_expenses": [
+            _field(k, k.replace("Local", ""), round(v * scale)) for k, v in RECURRING_DEFAULTS.items()
+        ],
+        "investment_plan": [],
+    }
+
+
+def assumption_defaults(country: str) -> dict:
+    """Default value of every numeric base_data field."""
+    return base_data_defaults(make_config(country)["base_data"])
@@ -0,0 +1,136 @@
+from devserver.config import COUNTRY_LABEL, CURRENCY, assumption_defaults
+from services.attribution import attribute
+from services.goal_seek import solve
+from services.sensitivity import SENSITIVITY_DELTA, tornado
+from services.projection_engine import (
+    active_plan,
+    active_scenario,
+    inputs_from_user_data,
+    life_stage,
+    project,
+    scenario_inputs,
+)
+
+# -------------------------------------------------------------------
+# /projections/ and /advisor for the reference backend
+# -------------------------------------------------------------------
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+def project_scenario(user_data: dict, scenario: dict) -> list:
+    defaults = assumption_defaults(user_data.get("country", "IN"))
+    return project(scenario_inputs(user_data, scenario, defaults))
+
+
+def calculate_projections(user_data: dict, user: dict | None = None) -> dict:
+    country = user_data.get("country", "IN")
+    plan = active_plan(user_data)
+    scenarios = plan.get("scenarios") or {}
+    if not scenarios:
+        raise ProjectionError("investment plan has no scenarios")
+
+    active = plan.get("active_scenario")
+    if active not in scenarios:
+        active = next(iter(scenarios))
+
+    results = {
+        name: {"projections": project_scenario(user_data, sc)}
+        for name, sc in scenarios.items()
+    }
+    projections = results[active]["projections"]
+
+    inputs = inputs_from_user_data(user_data, scenarios[active])
+    stage = life_stage(inputs.start_age)
+    depleted = next((r["Year"] for r in projections if r["EndingCorpus"] < 0), None)
+    year1 = projections[0]
+    withdrawal_rate = (
+        year1["TotalWithdrawal"] / inputs.corpus * 100 if inputs.corpus else 0.0
+    )
+
+    return {
+        "active_result": {"projections": projections, "scenario": active},
+        "results_by_scenario": results,
+        "base_context": {
+            "_meta": {
+                "currency": CURRENCY.get(country, "₹"),
+                "scenario": active,
+                "country_label": COUNTRY_LABEL.get(country, country),
+            },
+            "initial_corpus": {
+                "total": inputs.corpus,
+                **user_data.get("initial_corpus", {}).get(country, {}),
+            },
+            "one_time": {"total": sum(inputs.one_time.values())},
+            "scenario_results": {name: r["projections"] for name, r in results.items()},
+        },
+        "life_stage": stage,
+        "life_stage_metrics": {
+            "Age": inputs.start_age,
+            "Corpus Lasts": f"{depleted - 1} yrs" if depleted else "Full horizon",
+            "Year-1 Withdrawal Rate": f"{withdrawal_rate:.1f}%",
+        },
+    }
+
+
+def solve_goal(user_data: dict, scenario: dict | None, goal: str, amount: float | None = None) -> dict:
+    """/projections/solve: goal seek on one scenario (the active one by default)."""
+    defaults = assumption_defaults(user_data.get("country", "IN"))
+    inputs = scenario_inputs(user_data, scenario or active_scenario(user_data), defaults)
+    try:
+        result = solve(inputs, goal, amount)
+    except ValueError as e:
+        raise ProjectionError(str(e)) from e
+    return {**result, "years": inputs.years, "start_age": inputs.start_age, "corpus": inputs.corpus}
+
+
+def sensitivity(user_data: dict, drivers: list, delta: float | None = None) -> dict:
+    """/projections/sensitivity: tornado over `drivers` for the active scenario."""
+    defaults = assumption_defaults(user_data.get("country", "IN"))
+    inputs = scenario_inputs(user_data, active_scenario(user_data), defaults)
+    return tornado(inputs, drivers, SENSITIVITY_DELTA if delta is None else float(delta))
+
+
+def attribution(user_data: dict) -> dict:
+    """/projections/attribution: outcome change per edited assumption, active scenario."""
+    defaults = assumption_defaults(user_data.get("country", "IN"))
+    return attribute(user_data, active_scenario(user_data), defaults)
+
+
+def advise(projections: list, base_context: dict) -> dict:
+    """Rule-based advice: deterministic, so load tests see stable payloads."""
+    currency = base_context.get("_meta", {}).get("currency", "")
+    advice = {"summary": "", "positives": [], "warnings": [], "recommendations": []}
+    if not projections:
+        advice["summary"] = "No projections to review."
+        return advice
+
+    first, last = projections[0], projections[-1]
+    depleted = next((r["Year"] for r in projections if r["EndingCorpus"] < 0), None)
+
+    if depleted:
+        advice["summary"] = f"Your corpus runs out in year {depleted}."
+        advice["warnings"].append(
+            f"Ending corpus is {currency}{last['EndingCorpus']:,.0f} after {last['Year']} years."
+        )
+        advice["recommendations"].append("Lower the planned withdrawal or optional spending.")
+    else:
+        advice["summary"] = (
+            f"Your corpus lasts the full {last['Year']} years, ending at "
+            f"{currency}{last['EndingCorpus']:,.0f}."
+        )
+        advice["positives"].append("Corpus stays positive for the whole horizon.")
+
+    if first["NetIncomeAfterTax"] >= first["TotalExpenses"]:
+        advice["positives"].append("Year-1 post-tax income covers living costs.")
+    else:
+        gap = first["TotalExpenses"] - first["NetIncomeAfterTax"]
+        advice["warnings"].append(f"Year-1 living costs exceed income by {currency}{gap:,.0f}.")
+
+    if first["TotalIncome"] and first["TotalTax"] / first["TotalIncome"] > 0.15:
+        advice["recommendations"].append("Review tax-efficient instruments for investment income.")
+
+    advice["recommendations"].append("Revisit allocations once a year.")
+    return advice
@@ -0,0 +1,288 @@
+import json
+import random
+import re
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from devserver.config import make_config
+from devserver.projections import (
+    ProjectionError,
+    advise,
+    attribution,
+    calculate_projections,
+    sensitivity,
+    solve_goal,
+)
+from devserver.sessions import issue_token, read_token, revoke_token
+from devserver.store import Store
+
+# -------------------------------------------------------------------
+# Reference backend: the API the UI talks to, served locally
+# -------------------------------------------------------------------
+# (method, regex, endpoint template). Templates match the names
+# services.api_client records in its metrics.
+ROUTES = [
+    ("GET", r"^/healthz$", "/healthz"),
+    ("GET", r"^/config/?$", "/config/"),
+    ("GET", r"^/users/auth/?$", "/users/auth/"),
+    ("POST", r"^/auth/login$", "/auth/login"),
+    ("POST", r"^/auth/session$", "/auth/session"),
+    ("POST", r"^/auth/logout$", "/auth/logout"),
+    ("POST", r"^/auth/register$", "/auth/register"),
+    ("GET", r"^/user-data/(?P<username>[^/]+)$", "/user-data/{username}"),
+    ("POST", r"^/user-data/save$", "/user-data/save"),
+    ("GET", r"^/entitlements/(?P<username>[^/]+)$", "/entitlements/{username}"),
+    ("POST", r"^/payments/create-order$", "/payments/create-order"),
+    ("GET", r"^/payments/status/(?P<order_id>[^/]+)$", "/payments/status/{order_id}"),
+    ("POST", r"^/payments/simulate/(?P<order_id>[^/]+)$", "/payments/simulate/{order_id}"),
+    ("POST", r"^/projections/?$", "/projections/"),
+    ("POST", r"^/projections/solve$", "/projections/solve"),
+    ("POST", r"^/projections/sensitivity$", "/projections/sensitivity"),
+    ("POST", r"^/projections/attribution$", "/projections/attribution"),
+    ("POST", r"^/advisor$", "/advisor"),
+    ("POST", r"^/advisor/stream$", "/advisor/stream"),
+]
+
+PLAN_PRICES = {"monthly": 299, "lifetime": 2999}
+PREMIUM_PLANS = {"monthly", "lifetime"}
+
+# Never delayed or failed, so load tests can tell "up" from "slow"
+UNFAULTED = {"/healthz"}
+
+
+class FaultInjector:
+    """
+    Latency and error injection, reproducible for a given seed.
+
+    latency / jitter are seconds; every request sleeps
+    latency + uniform(0, jitter), or the per-endpoint override.
+    error_rate is the fraction of requests answered with 503.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=None, endpoint_latency=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.endpoint_latency = dict(endpoint_latency or {})
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, template: str) -> float:
+        base = self.endpoint_latency.get(template, self.latency)
+        with self._lock:
+            return base + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+
+class ReferenceBackend:
+
+    def __init__(self, store: Store | None = None, faults: FaultInjector | None = None):
+        self.store = store or Store()
+        self.faults = faults or FaultInjector()
+        self.calls = Counter()      # "METHOD template" -> requests served
+        self._calls_lock = threading.Lock()
+        self._server = None
+
+    # ---------------- handlers ----------------
+    def handle(self, method, template, params, query, body):
+        store = self.store
+
+        if template == "/healthz":
+            return 200, {"status": "ok"}
+
+        if template == "/config/":
+            return 200, make_config(query.get("country", ["IN"])[0])
+
+        if template == "/users/auth/":
+            return 200, store.users_for_auth()
+
+        if template == "/auth/login":
+            user = store.verify_user(body.get("username", ""), body.get("password", ""))
+            if not user:
+                return 401, {"detail": "invalid credentials"}
+            return 200, {**user, "session_token": issue_token(user["username"])}
+
+        if template == "/auth/session":
+            username = read_token(body.get("token", ""))
+            user = store.get_user(username) if username else None
+            return (200, user) if user else (401, {"detail": "invalid or expired session"})
+
+        if template == "/auth/logout":
+            if not revoke_token(body.get("token", "")):
+                return 401, {"detail": "invalid or expired session"}
+            return 200, {"ok": True}
+
+        if template == "/auth/register":
+            email = (body.get("email") or "").strip()
+            if not email or not body.get("password"):
+                return 400, {"detail": "email and password are required"}
+            if not store.create_user(email, body["password"], body.get("name", ""), email):
+                return 400, {"detail": "user already exists"}
+            return 200, {"username": email, "message": "registered"}
+
+        if template == "/user-data/{username}":
+            return 200, store.get_user_data(params["username"])
+
+        if template == "/user-data/save":
+            if not body.get("username"):
+                return 400, {"detail": "username is required"}
+            store.save_user_data(body["username"], body.get("data") or {})
+            return 200, {"ok": True}
+
+        if template == "/entitlements/{username}":
+            plan = store.get_plan(params["username"])
+            return 200, {"plan": plan, "is_premium": plan in PREMIUM_PLANS}
+
+        if template == "/payments/create-order":
+            plan = body.get("plan")
+            if plan not in PLAN_PRICES:
+                return 400, {"detail": f"unknown plan {plan!r}"}
+            order_id = f"order_{uuid.uuid4().hex[:14]}"
+            store.create_payment(order_id, body.get("user_id", ""), plan)
+            return 200, {
+                "order_id": order_id,
+                "amount": PLAN_PRICES[plan] * 100,
+                "currency": "INR",
+                "razorpay_key": "rzp_test_local",
+            }
+
+        if template == "/payments/status/{order_id}":
+            payment = store.get_payment(params["order_id"])
+            if payment is None:
+                return 404, {"detail": "order not found"}
+            return 200, {k: payment[k] for k in ("order_id", "status", "username")}
+
+        if template == "/payments/simulate/{order_id}":
+            # Stands in for the payment provider's webhook
+            if not store.mark_paid(params["order_id"]):
+                return 404, {"detail": "order not found"}
+            return 200, {"ok": True}
+
+        if template == "/projections/":
+            try:
+                return 200, calculate_projections(body.get("user_data") or {}, body.get("user"))
+            except ProjectionError as e:
+                return 422, {"detail": str(e)}
+
+        if template == "/projections/solve":
+            try:
+                return 200, solve_goal(
+                    body.get("user_data") or {}, body.get("scenario"), body.get("goal"), body.get("amount")
+                )
+            except ProjectionError as e:
+                return 422, {"detail": str(e)}
+
+        if template == "/projections/sensitivity":
+            return 200, sensitivity(body.get("user_data") or {}, body.get("drivers") or [], body.get("delta"))
+
+        if template == "/projections/attribution":
+            return 200, attribution(body.get("user_data") or {})
+
+        if template in ("/advisor", "/advisor/stream"):
+            return 200, advise(body.get("projections") or [], body.get("base_context") or {})
+
+        return 404, {"detail": "not found"}
+
+    def _handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, data: bytes, content_type="application/json; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self, method):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+
+                match = None
+                for m, rx, template in ROUTES:
+                    if m == method:
+                        match = re.match(rx, url.path)
+                        if match:
+                            break
+                if not match:
+                    self._send(404, b'{"detail": "not found"}')
+                    return
+
+                with backend._calls_lock:
+                    backend.calls[f"{method} {template}"] += 1
+
+                if template not in UNFAULTED:
+                    delay = backend.faults.delay(template)
+                    if delay:
+                        time.sleep(delay)
+                    if backend.faults.should_fail():
+                        self._send(503, b'{"detail": "injected failure"}')
+                        return
+
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = backend.handle(
+                        method, template, match.groupdict(), parse_qs(url.query), body
+                    )
+                except Exception as e:
+                    traceback.print_exc()
+                    status, payload = 500, {"detail": repr(e)}
+
+                if template == "/advisor/stream" and status == 200:
+                    lines = [{"section": "summary", "item": payload["summary"]}]
+                    for section in ("positives", "warnings", "recommendations"):
+                        lines += [{"section": section, "item": i} for i in payload[section]]
+                    data = "".join(json.dumps(line) + "\n" for line in lines)
+                    self._send(200, data.encode("utf-8"), "application/x-ndjson; charset=utf-8")
+                    return
+
+                self._send(status, json.dumps(payload).encode("utf-8"))
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    # ---------------- lifecycle ----------------
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on a daemon thread; returns the base URL."""
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}"
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8000):
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_calls(self) -> Counter:
+        """Calls served since the last reset, per endpoint."""
+        with self._calls_lock:
+            calls, self.calls = self.calls, Counter()
+        return calls
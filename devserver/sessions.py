@@ -0,0 +1,69 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+# -------------------------------------------------------------------
+# Signed session tokens
+# -------------------------------------------------------------------
+# /auth/login hands out a token the UI keeps in a cookie; /auth/session
+# turns it back into the user record on the next page load. The token
+# is "<payload>.<signature>", payload being base64url JSON
+# {"u": username, "exp": unix time}, signed with HMAC-SHA256. Set
+# AUTH_SESSION_SECRET to keep tokens valid across restarts. /auth/logout
+# revokes a token before it expires.
+AUTH_SESSION_SECRET = os.getenv("AUTH_SESSION_SECRET") or os.urandom(32).hex()
+AUTH_SESSION_DAYS = float(os.getenv("AUTH_SESSION_DAYS", "30"))
+
+_revoked = {}   # signature -> exp, kept until the token would have expired anyway
+_revoked_lock = threading.Lock()
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(AUTH_SESSION_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def issue_token(username: str) -> str:
+    claims = {"u": username, "exp": int(time.time() + AUTH_SESSION_DAYS * 86400)}
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"{payload}.{_sign(payload)}"
+
+
+def _claims(token: str):
+    payload, _, signature = (token or "").partition(".")
+    if not payload or not hmac.compare_digest(_sign(payload), signature):
+        return None
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except ValueError:
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def read_token(token: str):
+    """The token's username, or None if it is malformed, forged, expired or revoked."""
+    claims = _claims(token)
+    if claims is None:
+        return None
+    with _revoked_lock:
+        if token.rpartition(".")[2] in _revoked:
+            return None
+    return claims.get("u")
+
+
+def revoke_token(token: str) -> bool:
+    """Revoke a still-valid token. False if it was not valid to begin with."""
+    claims = _claims(token)
+    if claims is None:
+        return False
+    now = time.time()
+    with _revoked_lock:
+        for signature in [sig for sig, exp in _revoked.items() if exp < now]:
+            del _revoked[signature]
+        _revoked[token.rpartition(".")[2]] = claims["exp"]
+    return True
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# -------------------------------------------------------------------
+# SQLite persistence for the reference backend
+# -------------------------------------------------------------------
+# One connection shared by the server threads behind a lock: the
+# workload is tiny and this keeps writes strictly ordered.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username      TEXT PRIMARY KEY,
+    name          TEXT,
+    email         TEXT,
+    salt          TEXT NOT NULL,
+    password_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_data (
+    username   TEXT PRIMARY KEY,
+    data       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entitlements (
+    username TEXT PRIMARY KEY,
+    plan     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payments (
+    order_id   TEXT PRIMARY KEY,
+    username   TEXT NOT NULL,
+    plan       TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+PBKDF2_ROUNDS = 100_000
+
+# Demo accounts: (username, password, plan)
+DEMO_USERS = (
+    ("demo", "demo", "free"),
+    ("premium", "premium", "lifetime"),
+)
+
+
+def hash_password(password: str, salt: str) -> str:
+    return hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), bytes.fromhex(salt), PBKDF2_ROUNDS
+    ).hex()
+
+
+class Store:
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def _query(self, sql: str, params=(), one=False):
+        with self._lock:
+            cur = self._db.execute(sql, params)
+            return cur.fetchone() if one else cur.fetchall()
+
+    def _write(self, sql: str, params=()):
+        with self._lock, self._db:
+            self._db.execute(sql, params)
+
+    # ---------------- users ----------------
+    def create_user(self, username: str, password: str, name: str = "", email: str = "") -> bool:
+        salt = os.urandom(16).hex()
+        try:
+            self._write(
+                "INSERT INTO users (username, name, email, salt, password_hash) VALUES (?, ?, ?, ?, ?)",
+                (username, name, email, salt, hash_password(password, salt)),
+            )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def verify_user(self, username: str, password: str):
+        row = self._query("SELECT * FROM users WHERE username = ?", (username,), one=True)
+        if row is None or hash_password(password, row["salt"]) != row["password_hash"]:
+            return None
+        return {"username": row["username"], "name": row["name"], "email": row["email"]}
+
+    def get_user(self, username: str):
+        row = self._query("SELECT username, name, email FROM users WHERE username = ?", (username,), one=True)
+        return dict(row) if row else None
+
+    def users_for_auth(self) -> dict:
+        """Credentials in streamlit-authenticator's shape."""
+        rows = self._query("SELECT username, name, email, password_hash FROM users")
+        return {
+            "usernames": {
+                r["username"]: {"name": r["name"], "email": r["email"], "password": r["password_hash"]}
+                for r in rows
+            }
+        }
+
+    # ---------------- user data ----------------
+    def get_user_data(self, username: str) -> dict:
+        row = self._query("SELECT data FROM user_data WHERE username = ?", (username,), one=True)
+        return json.loads(row["data"]) if row else {}
+
+    def save_user_data(self, username: str, data: dict):
+        self._write(
+            "INSERT INTO user_data (username, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(username) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            (username, json.dumps(data), time.time()),
+        )
+
+    # ---------------- entitlements / payments ----------------
+    def get_plan(self, username: str) -> str:
+        row = self._query("SELECT plan FROM entitlements WHERE username = ?", (username,), one=True)
+        return row["plan"] if row else "free"
+
+    def set_plan(self, username: str, plan: str):
+        self._write(
+            "INSERT INTO entitlements (username, plan) VALUES (?, ?) "
+            "ON CONFLICT(username) DO UPDATE SET plan = excluded.plan",
+            (username, plan),
+        )
+
+    def create_payment(self, order_id: str, username: str, plan: str):
+        self._write(
+            "INSERT INTO payments (order_id, username, plan, status, created_at) VALUES (?, ?, ?, 'pending', ?)",
+            (order_id, username, plan, time.time()),
+        )
+
+    def get_payment(self, order_id: str):
+        row = self._query("SELECT * FROM payments WHERE order_id = ?", (order_id,), one=True)
+        return dict(row) if row else None
+
+    def mark_paid(self, order_id: str) -> bool:
+        payment = self.get_payment(order_id)
+        if payment is None:
+            return False
+        self._write("UPDATE payments SET status = 'paid' WHERE order_id = ?", (order_id,))
+        self.set_plan(payment["username"], payment["plan"])
+        return True
+
+
+def seed_demo_users(store: Store):
+    for username, password, plan in DEMO_USERS:
+        if store.create_user(username, password, name=username.title()):
+            store.set_plan(username, plan)
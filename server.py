@@ -0,0 +1,75 @@
+# server.py
+#
+# ASGI entry point: `streamlit run server.py` serves app.py exactly like
+# `streamlit run app.py`, but the warm-up (services.startup) starts when
+# the server starts instead of on the first session, and readiness is
+# served on the app's own port at /readyz (503 until warmed). It also
+# sets and clears the HttpOnly session cookie (services/session_cookie.py).
+#
+# Hosts that can only run app.py still get the warm-up, started by the
+# first script run.
+
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from services import session_cookie
+from services.metrics import start_metrics_server
+from services.startup import readiness, start_background_provisioning, start_warmup
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    start_metrics_server()
+    start_background_provisioning()
+    start_warmup()
+    yield
+
+
+async def readyz(_request):
+    health = readiness()
+    return JSONResponse(health, status_code=200 if health["ready"] else 503)
+
+
+def _is_https(request) -> bool:
+    return request.url.scheme == "https" or request.headers.get("x-forwarded-proto") == "https"
+
+
+async def set_session_cookie(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    handoff = session_cookie.redeem(body.get("nonce") if isinstance(body, dict) else None)
+    if handoff is None:
+        return JSONResponse({"detail": "unknown or expired nonce"}, status_code=400)
+
+    token, max_age = handoff
+    response = Response(status_code=204)
+    response.set_cookie(
+        session_cookie.SESSION_COOKIE, token, max_age=max_age, path="/",
+        secure=_is_https(request), httponly=True, samesite="strict",
+    )
+    return response
+
+
+async def clear_session_cookie(request):
+    response = Response(status_code=204)
+    response.delete_cookie(
+        session_cookie.SESSION_COOKIE, path="/",
+        secure=_is_https(request), httponly=True, samesite="strict",
+    )
+    return response
+
+
+app = st.App(
+    "app.py",
+    lifespan=lifespan,
+    routes=[
+        Route("/readyz", readyz),
+        Route(session_cookie.COOKIE_ROUTE, set_session_cookie, methods=["POST"]),
+        Route(session_cookie.COOKIE_ROUTE, clear_session_cookie, methods=["DELETE"]),
+    ],
+)
@@ -0,0 +1,159 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from services.api_client import (
+    ADVISOR_SECTIONS,
+    get_advisor_recommendations,
+    stream_advisor_recommendations,
+)
+
+# -------------------------------------------------------------------
+# Advisor cache (process-wide)
+# -------------------------------------------------------------------
+# The advisor is LLM-backed and slow, so results are keyed by the
+# inputs that actually shape the advice and fetched off the script
+# thread. Every session rendering the same plan shares one request.
+ADVISOR_CACHE_MAX_ENTRIES = 256
+ADVISOR_WAIT_SECONDS = 15
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="advisor")
+_lock = threading.Lock()
+_jobs: "OrderedDict[str, AdvisorJob]" = OrderedDict()
+
+
+class AdvisorJob:
+    """
+    One advisor fetch. `advice` fills in section by section while the
+    stream is open; it stays None if nothing could be fetched.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.advice = None
+        self.error = None
+        self.version = 0
+        self.done = threading.Event()
+        self._changed = threading.Condition()
+
+    def _add(self, section: str, item):
+        with self._changed:
+            if self.advice is None:
+                self.advice = {"summary": "", "positives": [], "warnings": [], "recommendations": []}
+            if section == "summary":
+                self.advice["summary"] = (self.advice["summary"] + " " + str(item)).strip()
+            else:
+                self.advice[section].append(item)
+            self.version += 1
+            self._changed.notify_all()
+
+    def _finish(self):
+        with self._changed:
+            self.done.set()
+            self._changed.notify_all()
+
+    def wait_for_update(self, seen_version: int, timeout: float):
+        """Block until new items arrive (or the job ends). Returns the new version."""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self.version != seen_version or self.done.is_set(),
+                timeout,
+            )
+            return self.version
+
+    def snapshot(self):
+        """Copy of the advice received so far, safe to render."""
+        with self._changed:
+            return copy.deepcopy(self.advice), self.version
+
+    @property
+    def failed(self) -> bool:
+        return self.done.is_set() and self.error is not None
+
+    def wait(self, timeout: float | None = ADVISOR_WAIT_SECONDS):
+        self.done.wait(timeout)
+        return self.advice
+
+
+def advice_key(projections: list, base_context: dict, scenario: dict) -> str:
+    raw = json.dumps(
+        [projections, base_context, scenario],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _run(job: AdvisorJob, payload: dict):
+    try:
+        try:
+            for section, item in stream_advisor_recommendations(**payload):
+                job._add(section, item)
+        except requests.HTTPError as e:
+            # Older backends have no streaming endpoint
+            if e.response is None or e.response.status_code not in (404, 405):
+                raise
+            advice = get_advisor_recommendations(**payload)
+            for section in ADVISOR_SECTIONS:
+                value = (advice or {}).get(section)
+                if section == "summary":
+                    if value:
+                        job._add(section, value)
+                else:
+                    for item in value or []:
+                        job._add(section, item)
+    except Exception as e:
+        job.error = e
+    finally:
+        job._finish()
+
+
+def request_advice(
+    projections: list,
+    user_data: dict,
+    base_context: dict,
+    scenario: dict,
+) -> AdvisorJob:
+    """
+    Return the cached job for these inputs, starting a background
+    fetch the first time they are seen (or after a failed attempt).
+    """
+    key = advice_key(projections, base_context, scenario)
+
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and not job.failed:
+            _jobs.move_to_end(key)
+            return job
+
+        job = AdvisorJob(key)
+        _jobs[key] = job
+        while len(_jobs) > ADVISOR_CACHE_MAX_ENTRIES:
+            _jobs.popitem(last=False)
+
+    # Snapshot inputs: the script thread keeps mutating user_data
+    payload = copy.deepcopy({
+        "projections": projections,
+        "user_data": user_data,
+        "base_context": base_context,
+        "scenario": scenario,
+    })
+    _executor.submit(_run, job, payload)
+    return job
+
+
+def get_cached_advice(key: str, timeout: float | None = ADVISOR_WAIT_SECONDS):
+    """
+    Advice for a previously requested key, waiting for an in-flight
+    fetch if needed. None when unknown or unavailable.
+    """
+    with _lock:
+        job = _jobs.get(key)
+    if job is None:
+        return None
+    return job.wait(timeout)
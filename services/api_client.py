@@ -1,7 +1,18 @@
+import copy
 import os
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from json import dumps as _json_dumps
 import requests
 import streamlit as st
-import pandas as pd
+
+from services import shared_cache, traffic
+from services.circuit_breaker import CircuitBreaker
+from services.metrics import SIZE_BUCKETS, current_trace, inc, observe
 
 # -------------------------------------------------------------------
 # Backend configuration
@@ -13,28 +24,151 @@ BACKEND_BASE_URL = os.getenv(
 
 
 # -------------------------------------------------------------------
-# Low-level HTTP helpers
+# Instrumented transport
 # -------------------------------------------------------------------
-def _get(path: str):
+# Every backend call goes through backend_request(), which records
+# latency, payload sizes and retries per endpoint *template* (so
+# "/user-data/{username}" is one series, not one per user) and sends
+# a correlation id the backend can log alongside its own traces.
+CORRELATION_HEADER = "X-Correlation-ID"
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "1"))
+RETRY_STATUSES = (502, 503, 504)
+RETRY_BACKOFF_SECONDS = 0.2
+
+
+def correlation_id() -> str:
+    """Id of the current rerun (shared by all its calls), or a fresh one off-rerun."""
+    trace = current_trace()
+    if trace is not None:
+        return trace["id"]
+    return uuid.uuid4().hex[:16]
+
+
+def _record(method, endpoint, status, elapsed, sent, received, retries):
+    labels = {"method": method, "endpoint": endpoint}
+
+    observe("ffs_http_seconds", elapsed, status=status, **labels)
+    observe("ffs_http_request_bytes", sent, buckets=SIZE_BUCKETS, **labels)
+    if received is not None:
+        observe("ffs_http_response_bytes", received, buckets=SIZE_BUCKETS, **labels)
+    inc("ffs_http_requests_total", status=status, **labels)
+    if retries:
+        inc("ffs_http_retries_total", retries, **labels)
+
+
+def backend_request(
+    method: str,
+    endpoint: str,
+    *,
+    path_params: dict | None = None,
+    params: dict | None = None,
+    json: dict | None = None,
+    timeout: float = 10,
+    stream: bool = False,
+):
+    """
+    Send one request to the backend and return the `requests.Response`.
+
+    `endpoint` is the path template, filled from `path_params`.
+    Idempotent GETs are retried on connection errors and 502/503/504.
+    Does not raise for HTTP status and never touches st.*, so it is safe
+    from background threads. For streamed responses, response bytes are
+    recorded only when the server sends Content-Length.
+
+    With TRAFFIC_MODE=record every call is also appended to the traffic
+    log; with TRAFFIC_MODE=replay calls are answered from it and never
+    reach the network (see services/traffic.py).
+    """
+    path = endpoint.format(**(path_params or {}))
     url = f"{BACKEND_BASE_URL}{path}"
+    headers = {CORRELATION_HEADER: correlation_id()}
+
+    body = None
+    if json is not None:
+        body = _json_dumps(json).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+
+    start = time.perf_counter()
+
+    if traffic.REPLAYING:
+        try:
+            resp = traffic.replay(method, path, params, json, url)
+        except requests.RequestException:
+            _record(method, endpoint, "error", time.perf_counter() - start,
+                    len(body or b""), None, 0)
+            raise
+        _record(method, endpoint, resp.status_code, time.perf_counter() - start,
+                len(body or b""), len(resp.content), 0)
+        return resp
+
+    attempts = 1 + (HTTP_RETRIES if method == "GET" else 0)
+
+    for attempt in range(attempts):
+        try:
+            resp = requests.request(
+                method, url,
+                params=params,
+                data=body,
+                headers=headers,
+                timeout=timeout,
+                stream=stream,
+            )
+        except requests.RequestException:
+            if attempt + 1 < attempts:
+                time.sleep(RETRY_BACKOFF_SECONDS)
+                continue
+            _record(method, endpoint, "error", time.perf_counter() - start,
+                    len(body or b""), None, attempt)
+            raise
+
+        if resp.status_code in RETRY_STATUSES and attempt + 1 < attempts:
+            resp.close()
+            time.sleep(RETRY_BACKOFF_SECONDS)
+            continue
+        break
+
+    elapsed = time.perf_counter() - start
+
+    if traffic.RECORDING:
+        traffic.record(method, path, params, json, resp, elapsed)
+
+    if stream and not traffic.RECORDING:
+        length = resp.headers.get("Content-Length")
+        received = int(length) if length and length.isdigit() else None
+    else:
+        received = len(resp.content)
+
+    _record(method, endpoint, resp.status_code, elapsed,
+            len(body or b""), received, attempt)
+
+    if resp.status_code >= 500:
+        print(f"[api] {method} {endpoint} -> {resp.status_code} "
+              f"(correlation id {headers[CORRELATION_HEADER]})")
+
+    return resp
+
+
+# -------------------------------------------------------------------
+# Low-level HTTP helpers
+# -------------------------------------------------------------------
+def _get(endpoint: str, **path_params):
     try:
-        resp = requests.get(url, timeout=10)
+        resp = backend_request("GET", endpoint, path_params=path_params)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
-        st.error(f"Backend GET failed: {url}")
+        st.error(f"Backend GET failed: {endpoint.format(**path_params)}")
         st.exception(e)
         st.stop()
 
 
-def _post(path: str, payload: dict):
-    url = f"{BACKEND_BASE_URL}{path}"
+def _post(endpoint: str, payload: dict, **path_params):
     try:
-        resp = requests.post(url, json=payload, timeout=10)
+        resp = backend_request("POST", endpoint, path_params=path_params, json=payload)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
-        st.error(f"Backend POST failed: {url}")
+        st.error(f"Backend POST failed: {endpoint.format(**path_params)}")
         st.exception(e)
         st.stop()
 
@@ -65,10 +199,14 @@ def get_config():
     #return _get("/config/")
 
 def get_config(country="IN"):
+    """Country config, shared across sessions (and processes) via services.shared_cache."""
     #print("Fetching config for country:", country)
-    resp = requests.get(f"{BACKEND_BASE_URL}/config/", params={"country": country})
-    resp.raise_for_status()
-    return resp.json()
+    def fetch():
+        resp = backend_request("GET", "/config/", params={"country": country})
+        resp.raise_for_status()
+        return resp.json()
+
+    return shared_cache.get_or_compute("config", country, fetch)
 
 # -------------------------------------------------------------------
 # Authentication (Streamlit Authenticator)
@@ -80,6 +218,55 @@ def get_users_for_auth():
     return _get("/users/auth/")
 
 
+def login_user(username: str, password: str):
+    """
+    Verify one username/password against the backend.
+
+    Returns that user's record ({"username", "name", "email", ...})
+    or None when the credentials are rejected.
+    """
+    resp = backend_request(
+        "POST", "/auth/login",
+        json={"username": username, "password": password},
+    )
+
+    if resp.status_code in (400, 401, 403, 404):
+        return None
+
+    resp.raise_for_status()
+    return resp.json()
+
+
+def validate_session(token: str):
+    """The user record for a session token from /auth/login, or None if it is no longer valid."""
+    resp = backend_request("POST", "/auth/session", json={"token": token})
+
+    if resp.status_code in (400, 401, 403, 404):
+        return None
+
+    resp.raise_for_status()
+    return resp.json()
+
+
+def revoke_session(token: str) -> bool:
+    """Revoke a session token from /auth/login. False if the backend did not know it."""
+    resp = backend_request("POST", "/auth/logout", json={"token": token})
+
+    if resp.status_code in (400, 401, 403, 404):
+        return False
+
+    resp.raise_for_status()
+    return True
+
+
+def register_user(name: str, email: str, password: str):
+    """Create an account. Returns the raw response so callers can show the backend's message."""
+    return backend_request(
+        "POST", "/auth/register",
+        json={"name": name, "email": email, "password": password},
+    )
+
+
 # -------------------------------------------------------------------
 # User data persistence
 # -------------------------------------------------------------------
@@ -88,7 +275,7 @@ def get_user_data(username: str):
     Load saved simulator inputs for a user
     """
     #print("IN get user data for",username)
-    return _get(f"/user-data/{username}")
+    return _get("/user-data/{username}", username=username)
 
 
 def save_user_data(username: str, data: dict):
@@ -118,7 +305,38 @@ def get_entitlement(username: str):
       "is_premium": bool
     }
     """
-    return _get(f"/entitlements/{username}")
+    return _get("/entitlements/{username}", username=username)
+
+
+# Entitlements change only on payment, so reruns share a short-lived copy
+ENTITLEMENT_TTL_SECONDS = float(os.getenv("ENTITLEMENT_TTL_SECONDS", "60"))
+
+_entitlement_cache = {}   # username -> (fetched_at, entitlement)
+_entitlement_lock = threading.Lock()
+
+
+def get_entitlement_cached(username: str):
+    """
+    get_entitlement() with a per-process TTL cache.
+    Call invalidate_entitlement() when a payment completes.
+    """
+    now = time.monotonic()
+
+    with _entitlement_lock:
+        hit = _entitlement_cache.get(username)
+    if hit and now - hit[0] < ENTITLEMENT_TTL_SECONDS:
+        return hit[1]
+
+    entitlement = get_entitlement(username)
+
+    with _entitlement_lock:
+        _entitlement_cache[username] = (now, entitlement)
+    return entitlement
+
+
+def invalidate_entitlement(username: str):
+    with _entitlement_lock:
+        _entitlement_cache.pop(username, None)
 
 
 # -------------------------------------------------------------------
@@ -144,32 +362,257 @@ def create_payment_order(user_id: str, plan: str):
         "plan": plan
     }
 
-    resp = requests.post(
-        f"{BACKEND_BASE_URL}/payments/create-order",
-        json=payload
-    )
+    resp = backend_request("POST", "/payments/create-order", json=payload)
 
     resp.raise_for_status()
     return resp.json()
 
+def get_payment_status(order_id: str):
+    """
+    Returns:
+    {
+      "order_id": str,
+      "status": "pending" | "paid" | "failed",
+      "username": str
+    }
+    """
+    resp = backend_request(
+        "GET", "/payments/status/{order_id}",
+        path_params={"order_id": order_id},
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+# -------------------------------------------------------------------
+# Projections (stale-while-revalidate)
+# -------------------------------------------------------------------
+# Results are cached by canonical payload (services.shared_cache), so
+# every session with the same inputs shares one entry, and count as
+# fresh for PROJECTIONS_FRESH_SECONDS. Otherwise the backend is asked
+# on a worker thread and
+#   - an answer within PROJECTIONS_STALE_AFTER_SECONDS is returned;
+#   - if it is slower or fails, the last good result for this payload
+#     (else a signed-in user's most recent result for any payload) is
+#     returned at once, marked result["_stale"], and the refresh carries
+#     on and fills the cache; ui.stale_notice reruns once it lands;
+#   - with nothing to fall back on, the caller waits as before.
+# After PROJECTIONS_BREAKER_FAILURES consecutive backend failures the
+# breaker skips the backend for PROJECTIONS_BREAKER_COOLDOWN_SECONDS.
+# 4xx answers (invalid inputs) are raised, never hidden behind a stale
+# result.
+PROJECTIONS_FRESH_SECONDS = float(os.getenv("PROJECTIONS_FRESH_SECONDS", "3600"))
+PROJECTIONS_STALE_AFTER_SECONDS = float(os.getenv("PROJECTIONS_STALE_AFTER_SECONDS", "2"))
+PROJECTIONS_STALE_TTL_SECONDS = 24 * 3600
+PROJECTIONS_TIMEOUT_SECONDS = 30
+
+projections_breaker = CircuitBreaker(
+    "projections",
+    failures=int(os.getenv("PROJECTIONS_BREAKER_FAILURES", "3")),
+    cooldown=float(os.getenv("PROJECTIONS_BREAKER_COOLDOWN_SECONDS", "30")),
+)
+
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="projections")
+_inflight = {}      # payload key -> Future
+_inflight_lock = threading.Lock()
+
+
+def _cached_projection(key):
+    entry = shared_cache.get("projections", key) if key else None
+    # Entries are {"result", "stored"}; anything else predates this format
+    if isinstance(entry, dict) and "stored" in entry:
+        return entry
+    return None
+
+
+def _fetch_projections(key, payload, latest_key):
+    try:
+        resp = backend_request(
+            "POST", "/projections/", json=payload, timeout=PROJECTIONS_TIMEOUT_SECONDS
+        )
+    except requests.RequestException:
+        projections_breaker.record_failure()
+        raise
+    if resp.status_code >= 500:
+        projections_breaker.record_failure()
+    else:
+        projections_breaker.record_success()
+    resp.raise_for_status()
+
+    result = resp.json()
+    ttl = PROJECTIONS_STALE_TTL_SECONDS
+    shared_cache.put("projections", key, {"result": result, "stored": time.time()}, ttl)
+    if latest_key:
+        shared_cache.put("projections", latest_key, key, ttl)
+    return result
+
+
+def _refresh_projections(key, payload, latest_key):
+    """The in-flight fetch for this payload, starting one if there is none."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            # Snapshot: the script thread keeps mutating user_data
+            future = _refresh_pool.submit(
+                _fetch_projections, key, copy.deepcopy(payload), latest_key
+            )
+            _inflight[key] = future
+            future.add_done_callback(lambda _f: _inflight.pop(key, None))
+    return future
+
+
+def _stale_projection(entry, reason, exact, key):
+    inc("ffs_projection_results_total", freshness="stale", reason=reason)
+    result = dict(entry["result"])
+    result["_stale"] = {
+        "reason": reason,                 # "slow" | "error" | "circuit_open"
+        "exact": exact,                   # same inputs, or an earlier edit's
+        "age_seconds": round(time.time() - entry["stored"]),
+        "key": key,                       # for projection_refresh_ready
+    }
+    return result
+
+
+def projection_refresh_ready(key) -> bool:
+    """
+    Whether a rerun would do better than the stale result served for
+    `key`: its refresh has landed, or nothing is in flight and the
+    breaker lets a retry through.
+    """
+    entry = _cached_projection(key)
+    if entry and time.time() - entry["stored"] < PROJECTIONS_FRESH_SECONDS:
+        return True
+    with _inflight_lock:
+        if key in _inflight:
+            return False
+    return projections_breaker.retry_in() == 0
+
+
 def calculate_projections(user_data: dict, user: dict):
     payload = {
         "user_data": user_data,
         "user": user
     }
     #print("Payload inside cal porjections",payload)
-    resp = requests.post(
-        f"{BACKEND_BASE_URL}/projections/",
-        json=payload
-    )
+    key = shared_cache.cache_key(payload)
+    # Guests share one username, so they get no "latest" fallback:
+    # it would show one guest another guest's results
+    latest_key = None
+    if not (user or {}).get("is_guest"):
+        latest_key = shared_cache.cache_key(
+            "latest", (user or {}).get("username"), user_data.get("country")
+        )
+
+    entry = _cached_projection(key)
+    if entry and time.time() - entry["stored"] < PROJECTIONS_FRESH_SECONDS:
+        inc("ffs_projection_results_total", freshness="fresh", reason="cache")
+        return entry["result"]
+
+    exact = entry is not None
+    if entry is None and latest_key:
+        entry = _cached_projection(shared_cache.get("projections", latest_key))
+
+    if not projections_breaker.allow():
+        if entry:
+            return _stale_projection(entry, "circuit_open", exact, key)
+        raise requests.ConnectionError(
+            "projection backend unavailable, retrying in "
+            f"{projections_breaker.retry_in():.0f}s"
+        )
+
+    future = _refresh_projections(key, payload, latest_key)
+    if entry is None:
+        inc("ffs_projection_results_total", freshness="fresh", reason="backend")
+        return future.result()
+
+    try:
+        result = future.result(timeout=PROJECTIONS_STALE_AFTER_SECONDS)
+    except FutureTimeoutError:
+        return _stale_projection(entry, "slow", exact, key)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code < 500:
+            raise
+        return _stale_projection(entry, "error", exact, key)
+    except requests.RequestException:
+        return _stale_projection(entry, "error", exact, key)
+
+    inc("ffs_projection_results_total", freshness="fresh", reason="backend")
+    return result
+
+
+# -------------------------------------------------------------------
+# Projection analyses (goal seek, sensitivity, attribution)
+# -------------------------------------------------------------------
+# Run by the backend on the engine behind /projections/; successful
+# answers are cached like projections, by canonical payload. Callers
+# get None whenever the backend did not produce an answer, and show
+# nothing in its place: the local reference engine's numbers are not
+# the backend's. A backend without the endpoint (404) is remembered
+# per process for ANALYSIS_RECHECK_SECONDS, so pages can leave the
+# analysis out without asking again (analysis_available).
+ANALYSIS_RECHECK_SECONDS = 300
+
+_missing_analyses = {}      # endpoint -> monotonic time of its last 404
+_missing_lock = threading.Lock()
+
+
+def analysis_available(endpoint: str) -> bool:
+    """False while the backend is known not to serve `endpoint`."""
+    with _missing_lock:
+        seen = _missing_analyses.get(endpoint)
+    return seen is None or time.monotonic() - seen >= ANALYSIS_RECHECK_SECONDS
 
-    # 🚨 ADD THIS TEMPORARY DEBUG BLOCK:
-    if resp.status_code == 500:
-        print("🚨 BACKEND 500 CRASH DETECTED!")
-        print("Response Text:", resp.text)
-        
-    resp.raise_for_status()
-    return resp.json()
+
+def _analysis(endpoint: str, payload: dict):
+    if not analysis_available(endpoint):
+        return None
+
+    key = shared_cache.cache_key(endpoint, payload)
+    cached = shared_cache.get("projections", key)
+    if cached is not None:
+        return cached
+
+    try:
+        resp = backend_request("POST", endpoint, json=payload, timeout=PROJECTIONS_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        print(f"[api] {endpoint} unavailable: {e}")
+        return None
+    if resp.status_code == 404:
+        with _missing_lock:
+            _missing_analyses[endpoint] = time.monotonic()
+        print(f"[api] {endpoint} not served by this backend")
+        return None
+    if not resp.ok:
+        print(f"[api] {endpoint} -> {resp.status_code}")
+        return None
+
+    result = resp.json()
+    shared_cache.put("projections", key, result)
+    return result
+
+
+def solve_goal(user_data: dict, user: dict, scenario: dict, goal: str, amount: float | None = None):
+    """/projections/solve: {"goal", "status", "value", "years", "start_age", "corpus"}, or None."""
+    return _analysis("/projections/solve", {
+        "user_data": user_data,
+        "user": user,
+        "scenario": scenario,
+        "goal": goal,
+        "amount": amount,
+    })
+
+
+def get_sensitivity(user_data: dict, user: dict, drivers: list):
+    """/projections/sensitivity: tornado rows for the active scenario, or None."""
+    return _analysis("/projections/sensitivity", {
+        "user_data": user_data,
+        "user": user,
+        "drivers": list(drivers),
+    })
+
+
+def get_attribution(user_data: dict, user: dict):
+    """/projections/attribution: services.attribution.attribute() for the active scenario, or None."""
+    return _analysis("/projections/attribution", {"user_data": user_data, "user": user})
 
 
 def get_advisor_recommendations(
@@ -185,10 +628,54 @@ def get_advisor_recommendations(
         "scenario": scenario,
     }
 
-    resp = requests.post(
-        f"{BACKEND_BASE_URL}/advisor",
-        json=payload,
-        timeout=15
-    )
+    resp = backend_request("POST", "/advisor", json=payload, timeout=15)
     resp.raise_for_status()
     return resp.json()
+
+
+ADVISOR_SECTIONS = ("summary", "positives", "warnings", "recommendations")
+
+
+def stream_advisor_recommendations(
+    projections: list,
+    user_data: dict,
+    base_context: dict,
+    scenario: dict,
+):
+    """
+    Streaming variant of /advisor.
+
+    The backend answers with NDJSON (or SSE "data:" lines), one insight
+    per line:
+        {"section": "warnings", "item": "..."}
+
+    Yields (section, item) tuples as they arrive. "summary" items are
+    strings; the other sections yield one list entry at a time.
+    """
+    payload = {
+        "projections": projections,
+        "user_data": user_data,
+        "base_context": base_context,
+        "scenario": scenario,
+    }
+
+    with backend_request(
+        "POST", "/advisor/stream",
+        json=payload,
+        stream=True,
+        timeout=15,
+    ) as resp:
+        resp.raise_for_status()
+
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            if line.startswith("data:"):
+                line = line[5:].strip()
+            if line == "[DONE]":
+                break
+
+            event = json.loads(line)
+            section = event.get("section")
+            if section in ADVISOR_SECTIONS:
+                yield section, event.get("item")
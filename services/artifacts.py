@@ -0,0 +1,128 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO
+
+from services.metrics import inc, set_gauge
+
+# -------------------------------------------------------------------
+# Disk-backed artifact store (generated PDFs)
+# -------------------------------------------------------------------
+# Content-addressed: the key is the SHA-256 of the bytes, so identical
+# reports from many sessions share one file. Sessions keep only the
+# key; downloads open the file when the user clicks.
+#
+# Files are written atomically (temp file + rename). Cleanup runs at
+# most every ARTIFACT_CLEANUP_SECONDS from put(): artifacts untouched
+# for ARTIFACT_TTL_SECONDS are removed, then the oldest go until the
+# store fits ARTIFACT_MAX_MB.
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "ffs-artifacts"))
+ARTIFACT_TTL_SECONDS = float(os.getenv("ARTIFACT_TTL_SECONDS", "3600"))
+ARTIFACT_MAX_MB = float(os.getenv("ARTIFACT_MAX_MB", "512"))
+ARTIFACT_CLEANUP_SECONDS = 60
+
+_cleanup_lock = threading.Lock()
+_last_cleanup = 0.0
+
+
+def _path(key: str, suffix: str) -> str:
+    return os.path.join(ARTIFACT_DIR, key[:2], key + suffix)
+
+
+def put(data: bytes, suffix: str = ".pdf") -> str:
+    """Store bytes and return their key (re-putting refreshes the TTL)."""
+    key = hashlib.sha256(data).hexdigest()
+    path = _path(key, suffix)
+
+    if os.path.exists(path):
+        os.utime(path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        inc("ffs_artifact_writes_total")
+
+    maybe_cleanup()
+    return key + suffix
+
+
+def exists(key: str) -> bool:
+    return bool(key) and os.path.exists(_path(*os.path.splitext(key)))
+
+
+def open_artifact(key: str) -> BinaryIO:
+    """A stored artifact, open for binary reading; the caller closes it (FileNotFoundError once expired)."""
+    path = _path(*os.path.splitext(key))
+    f = open(path, "rb")
+    os.utime(path)
+    return f
+
+
+def _scan():
+    entries = []
+    for root, _dirs, files in os.walk(ARTIFACT_DIR):
+        for name in files:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def _remove(path: str, reason: str) -> bool:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return False
+    inc("ffs_artifact_evictions_total", reason=reason)
+    return True
+
+
+def cleanup(now: float | None = None) -> dict:
+    """Apply TTL, then the size cap (oldest first). Returns what remains."""
+    now = time.time() if now is None else now
+    entries = []
+
+    for mtime, size, path in _scan():
+        if now - mtime > ARTIFACT_TTL_SECONDS:
+            _remove(path, "ttl")
+        else:
+            entries.append((mtime, size, path))
+
+    total = sum(size for _, size, _ in entries)
+    cap = ARTIFACT_MAX_MB * 2**20
+    entries.sort()
+    while entries and total > cap:
+        _mtime, size, path = entries.pop(0)
+        if _remove(path, "size"):
+            total -= size
+
+    set_gauge("ffs_artifact_bytes", total)
+    set_gauge("ffs_artifact_files", len(entries))
+    return {"files": len(entries), "bytes": total}
+
+
+def maybe_cleanup():
+    global _last_cleanup
+    now = time.time()
+    if now - _last_cleanup < ARTIFACT_CLEANUP_SECONDS:
+        return
+    if not _cleanup_lock.acquire(blocking=False):
+        return
+    try:
+        _last_cleanup = now
+        cleanup(now)
+    finally:
+        _cleanup_lock.release()
@@ -0,0 +1,130 @@
+from itertools import combinations
+from math import factorial
+
+import numpy as np
+
+from services.projection_engine import project_batch, scenario_inputs
+
+# -------------------------------------------------------------------
+# Attribution of outcome changes to assumption edits
+# -------------------------------------------------------------------
+# Splits the change in ending corpus and year-1 net income (all fields
+# at their defaults -> as the user has them) between the fields that
+# differ from their defaults. Each evaluation re-projects with some of
+# the edits reverted; all of them run as one project_batch call.
+#
+# Up to SHAPLEY_MAX_FIELDS edits: exact Shapley values over every subset
+# (2**k variants), so contributions add up to the total exactly.
+# Beyond that: one-at-a-time effects plus half of each pairwise
+# interaction (1 + k + k(k-1)/2 variants); whatever higher-order
+# interactions remain is reported as the residual.
+SHAPLEY_MAX_FIELDS = 8
+METRICS = ("EndingCorpus", "NetIncomeAfterTax")
+
+# Not assumptions: the horizon is set by the app (capped for guests),
+# and reverting it would change which year "ending" means
+ENGINE_FIELDS = {"GLProjectionYears"}
+
+
+def _input(user_data: dict, key: str, default):
+    value = user_data.get(key, {})
+    return value.get("input", default) if isinstance(value, dict) else value
+
+
+def changed_fields(user_data: dict, defaults: dict) -> dict:
+    """{field: (default, current)} for numeric assumptions edited away from their default."""
+    changed = {}
+    for key, default in defaults.items():
+        if key in ENGINE_FIELDS:
+            continue
+        current = _input(user_data, key, default)
+        if isinstance(current, (int, float)) and current != default:
+            changed[key] = (default, current)
+    return changed
+
+
+def _outcomes(user_data: dict, scenario: dict, defaults: dict, fields: list, subsets: list) -> dict:
+    """{metric: array per subset}, each subset keeping only its fields' edits."""
+    batch = []
+    for subset in subsets:
+        variant = dict(user_data)
+        for key in fields:
+            if key not in subset:
+                variant[key] = {"input": defaults[key]}
+        batch.append(scenario_inputs(variant, scenario, defaults))
+
+    result = project_batch(batch)
+    rows = np.arange(len(batch))
+    return {
+        "EndingCorpus": result["EndingCorpus"][rows, result["years"] - 1],
+        "NetIncomeAfterTax": result["NetIncomeAfterTax"][:, 0],
+    }
+
+
+def _shapley(fields: list, values: dict) -> dict:
+    k = len(fields)
+    weight = [factorial(s) * factorial(k - s - 1) / factorial(k) for s in range(k)]
+    contributions = {}
+    for i, key in enumerate(fields):
+        bit = 1 << i
+        without = [m for m in range(1 << k) if not m & bit]
+        w = np.array([weight[bin(m).count("1")] for m in without])
+        contributions[key] = {
+            metric: float((w * (v[[m | bit for m in without]] - v[without])).sum())
+            for metric, v in values.items()
+        }
+    return contributions
+
+
+def _pairwise(fields: list, values: dict, index: dict) -> dict:
+    contributions = {}
+    for key in fields:
+        contributions[key] = {}
+        for metric, v in values.items():
+            base, single = v[index[()]], v[index[(key,)]]
+            effect = single - base
+            for other in fields:
+                if other != key:
+                    pair = index[tuple(sorted((key, other)))]
+                    effect += (v[pair] - single - v[index[(other,)]] + base) / 2
+            contributions[key][metric] = float(effect)
+    return contributions
+
+
+def attribute(user_data: dict, scenario: dict, defaults: dict) -> dict:
+    """
+    {"method", "total": {metric: change}, "fields": {field: {metric: contribution}},
+     "residual": {metric: change not assigned to a field}}
+    """
+    fields = list(changed_fields(user_data, defaults))
+    if not fields:
+        zero = dict.fromkeys(METRICS, 0.0)
+        return {"method": "none", "total": zero, "fields": {}, "residual": dict(zero)}
+
+    if len(fields) <= SHAPLEY_MAX_FIELDS:
+        method = "shapley"
+        subsets = [
+            tuple(key for i, key in enumerate(fields) if m >> i & 1)
+            for m in range(1 << len(fields))
+        ]
+    else:
+        method = "pairwise"
+        subsets = [(), tuple(fields)]
+        subsets += [(key,) for key in fields]
+        subsets += [tuple(sorted(pair)) for pair in combinations(fields, 2)]
+
+    values = _outcomes(user_data, scenario, defaults, fields, subsets)
+    if method == "shapley":
+        contributions = _shapley(fields, values)
+        none, everything = 0, len(subsets) - 1
+    else:
+        index = {subset: i for i, subset in enumerate(subsets)}
+        contributions = _pairwise(fields, values, index)
+        none, everything = 0, 1
+
+    total = {metric: float(v[everything] - v[none]) for metric, v in values.items()}
+    residual = {
+        metric: total[metric] - sum(c[metric] for c in contributions.values())
+        for metric in METRICS
+    }
+    return {"method": method, "total": total, "fields": contributions, "residual": residual}
@@ -0,0 +1,95 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+from services.metrics import inc, set_gauge
+
+# -------------------------------------------------------------------
+# Shared headless Chromium for PDF rendering
+# -------------------------------------------------------------------
+# Launching Chromium costs about a second per PDF. The pool keeps one
+# browser running on a dedicated event-loop thread; every render opens
+# a fresh page on it (at most PDF_BROWSER_PAGES at once) and closes it
+# afterwards. A browser that has died is relaunched by the next render.
+PDF_BROWSER_PAGES = int(os.getenv("PDF_BROWSER_PAGES", "2"))
+PDF_RENDER_TIMEOUT_SECONDS = 120
+
+_loop = None
+_loop_lock = threading.Lock()
+
+# Touched only on the pool's loop thread
+_playwright = None
+_browser = None
+_launch_lock = None
+_pages = None
+
+
+def _ensure_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="pdf-browser",
+                daemon=True,
+            ).start()
+    return _loop
+
+
+def _submit(coro, timeout):
+    future = asyncio.run_coroutine_threadsafe(coro, _ensure_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        # Otherwise the coroutine keeps its page (and _pages slot) after we give up
+        future.cancel()
+        raise
+
+
+async def _get_browser():
+    global _playwright, _browser, _launch_lock, _pages
+
+    if _launch_lock is None:
+        _launch_lock = asyncio.Lock()
+        _pages = asyncio.Semaphore(PDF_BROWSER_PAGES)
+
+    async with _launch_lock:
+        if _browser is None or not _browser.is_connected():
+            from playwright.async_api import async_playwright
+
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch()
+            inc("ffs_pdf_browser_launches_total")
+            print("[pdf] browser launched")
+        set_gauge("ffs_pdf_browser_up", 1)
+        return _browser
+
+
+def start(timeout: float | None = PDF_RENDER_TIMEOUT_SECONDS):
+    """Launch the shared browser now (raises if Chromium cannot start)."""
+    try:
+        _submit(_get_browser(), timeout)
+    except Exception:
+        set_gauge("ffs_pdf_browser_up", 0)
+        raise
+
+
+def is_running() -> bool:
+    return _browser is not None and _browser.is_connected()
+
+
+def render(page_fn, timeout: float | None = PDF_RENDER_TIMEOUT_SECONDS):
+    """`await page_fn(page)` on a fresh page of the shared browser; returns its result."""
+    async def run():
+        browser = await _get_browser()
+        async with _pages:
+            page = await browser.new_page()
+            try:
+                return await page_fn(page)
+            finally:
+                await page.close()
+
+    return _submit(run(), timeout)
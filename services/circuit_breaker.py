@@ -0,0 +1,68 @@
+import threading
+import time
+
+from services.metrics import inc, set_gauge
+
+# -------------------------------------------------------------------
+# Circuit breaker
+# -------------------------------------------------------------------
+# closed     calls go through; `failures` consecutive failures open it
+# open       calls are skipped for `cooldown` seconds
+# half_open  one trial call goes through; its outcome closes the
+#            breaker or opens it for another cooldown
+STATES = {"closed": 0, "open": 1, "half_open": 2}
+
+
+class CircuitBreaker:
+
+    def __init__(self, name: str, failures: int = 3, cooldown: float = 30.0):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self._publish()
+
+    def _publish(self):
+        set_gauge("ffs_circuit_state", STATES[self.state], breaker=self.name)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.time() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._publish()
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.cooldown - (time.time() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            if self.state != "closed":
+                print(f"[breaker] {self.name} closed")
+            self.state = "closed"
+            self._publish()
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == "half_open" or (
+                self.state == "closed" and self._consecutive >= self.failures
+            ):
+                self.state = "open"
+                self._opened_at = time.time()
+                inc("ffs_circuit_trips_total", breaker=self.name)
+                print(f"[breaker] {self.name} open for {self.cooldown:.0f}s "
+                      f"after {self._consecutive} failures")
+            self._publish()
@@ -0,0 +1,117 @@
+import math
+from dataclasses import replace
+
+import numpy as np
+
+from services.projection_engine import ProjectionInputs, project_batch, survives
+
+# -------------------------------------------------------------------
+# Goal seek
+# -------------------------------------------------------------------
+# Solves for one input instead of projecting a guess, on the projection
+# engine (services.projection_engine). The reference backend runs these
+# behind POST /projections/solve (see solve()):
+#   max_monthly_withdrawal   largest withdrawal that keeps EndingCorpus
+#                            >= 0 through the whole horizon
+#   min_starting_corpus      smallest corpus that does the same for the
+#                            current expenses and withdrawal
+#   latest_affordable_year   last projection year a one-time expense can
+#                            fall in without the corpus running out
+#
+# The first two are monotone in their input, so they are bracketed and
+# the bracket narrowed by evaluating SOLVER_CANDIDATES points across it
+# in one project_batch call per round (each round shrinks it ~31x).
+# The third tries every year in a single batch.
+SOLVER_CANDIDATES = 32
+SOLVER_MAX_ROUNDS = 12
+SOLVER_EXPAND = 4.0 ** np.arange(1, 9)   # bracket growth tried in one batch
+
+GOALS = ("max_withdrawal", "min_corpus", "latest_expense_year")
+
+# solve() outcomes
+SOLVED = "solved"
+INFEASIBLE = "infeasible"       # no value of the input keeps the corpus positive
+UNBOUNDED = "unbounded"         # every value tried does
+
+
+def _feasible(make, xs) -> np.ndarray:
+    return survives(project_batch([make(float(x)) for x in xs]))
+
+
+def _boundary(make, lo: float, hi: float, tol: float, feasible_low: bool) -> tuple:
+    """Narrow [lo, hi] around the point where feasibility flips."""
+    for _ in range(SOLVER_MAX_ROUNDS):
+        if hi - lo <= tol:
+            break
+        xs = np.linspace(lo, hi, SOLVER_CANDIDATES)
+        ok = _feasible(make, xs)
+        # index of the first point on the other side of the boundary
+        flip = int(np.argmin(ok)) if feasible_low else int(np.argmax(ok))
+        lo, hi = xs[max(flip - 1, 0)], xs[max(flip, 1)]
+    return lo, hi
+
+
+def max_monthly_withdrawal(inputs: ProjectionInputs, tol: float = 1.0):
+    """
+    Largest monthly withdrawal (within tol) that never empties the
+    corpus; None if even 0 does, math.inf if no withdrawal tried does.
+    """
+    def make(monthly):
+        return replace(inputs, withdrawal=12 * monthly)
+
+    if not _feasible(make, [0.0])[0]:
+        return None
+    start = max(inputs.corpus, inputs.must_expenses + inputs.optional_expenses, 1.0) / 12
+    ok = _feasible(make, start * SOLVER_EXPAND)
+    if ok.all():
+        return math.inf
+    hi = start * SOLVER_EXPAND[int(np.argmin(ok))]
+    lo, _ = _boundary(make, 0.0, hi, tol, feasible_low=True)
+    return float(np.floor(lo))
+
+
+def min_starting_corpus(inputs: ProjectionInputs, tol: float | None = None):
+    """Smallest starting corpus (within tol) that never runs out; None if none does."""
+    def make(corpus):
+        return replace(inputs, corpus=corpus)
+
+    if _feasible(make, [0.0])[0]:
+        return 0.0
+    yearly = inputs.must_expenses + inputs.optional_expenses + inputs.withdrawal
+    start = max(inputs.corpus, yearly + sum(inputs.one_time.values()), 1.0)
+    ok = _feasible(make, start * SOLVER_EXPAND)
+    if not ok.any():
+        return None
+    hi = start * SOLVER_EXPAND[int(np.argmax(ok))]
+    tol = max(1.0, hi * 1e-7) if tol is None else tol
+    _, hi = _boundary(make, 0.0, hi, tol, feasible_low=False)
+    return float(np.ceil(hi))
+
+
+def latest_affordable_year(inputs: ProjectionInputs, amount: float):
+    """Last projection year (1-based) a one-time `amount` can be spent in; None if no year works."""
+    variants = []
+    for year in range(1, inputs.years + 1):
+        one_time = dict(inputs.one_time)
+        one_time[year] = one_time.get(year, 0.0) + amount
+        variants.append(replace(inputs, one_time=one_time))
+    ok = survives(project_batch(variants))
+    return int(np.flatnonzero(ok)[-1]) + 1 if ok.any() else None
+
+
+def solve(inputs: ProjectionInputs, goal: str, amount: float | None = None) -> dict:
+    """{"goal", "status", "value"}; value is None unless status is SOLVED."""
+    if goal == "max_withdrawal":
+        value = max_monthly_withdrawal(inputs)
+    elif goal == "min_corpus":
+        value = min_starting_corpus(inputs)
+    elif goal == "latest_expense_year":
+        value = latest_affordable_year(inputs, float(amount or 0.0))
+    else:
+        raise ValueError(f"unknown goal {goal!r}")
+
+    if value is None:
+        return {"goal": goal, "status": INFEASIBLE, "value": None}
+    if value == math.inf:
+        return {"goal": goal, "status": UNBOUNDED, "value": None}
+    return {"goal": goal, "status": SOLVED, "value": value}
@@ -0,0 +1,237 @@
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from services.metrics import SIZE_BUCKETS, inc, observe, set_gauge, span
+
+# -------------------------------------------------------------------
+# Session memory accounting
+# -------------------------------------------------------------------
+# At the end of every rerun the session's evictable state is accounted
+# in a process-wide ledger. Sizes are sampled: all of session_state is
+# walked every MEMORY_FULL_SCAN_RERUNS reruns; in between only entries
+# that appeared since are measured, the rest keep their last size and
+# "other" (never evicted) is carried over. Recomputable objects are grouped
+# into categories and dropped, cheapest to rebuild first, when either
+#   - this session's evictable bytes exceed SESSION_MEMORY_BUDGET_MB, or
+#   - all sessions' evictable bytes exceed PROCESS_MEMORY_BUDGET_MB.
+# Under the process budget, eviction works in levels: every session
+# sheds its PDFs before any session loses figures, and figures before
+# projections. A session applies this on its own next rerun, so
+# session_state is only ever touched from its own script thread.
+SESSION_MEMORY_BUDGET_MB = float(os.getenv("SESSION_MEMORY_BUDGET_MB", "64"))
+PROCESS_MEMORY_BUDGET_MB = float(os.getenv("PROCESS_MEMORY_BUDGET_MB", "1024"))
+MEMORY_FULL_SCAN_RERUNS = max(1, int(os.getenv("MEMORY_FULL_SCAN_RERUNS", "20")))
+
+EVICTION_ORDER = ("pdf", "figures", "projections")
+
+# session_state key -> category. Plotly figures under any key count as
+# "figures"; everything else is "other" (measured, never evicted).
+# Generated PDFs live in services.artifacts; the session holds a key.
+EVICTABLE_KEYS = {
+    "generated_pdf_key": "pdf",
+    "generated_pdf_name": "pdf",
+    "projection_result": "projections",
+}
+
+_MB = 2 ** 20
+
+# session id -> {"updated": ts, "reruns": n, "sizes": {category: bytes},
+#                "known": {key: bytes}}
+_ledger = {}
+_ledger_lock = threading.Lock()
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate retained size of an object graph, each object counted once."""
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            total += sys.getsizeof(o)
+            continue
+
+        # numpy / pandas report their own buffers
+        nbytes = getattr(o, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+        memory_usage = getattr(o, "memory_usage", None)
+        if callable(memory_usage) and hasattr(o, "columns"):
+            total += int(memory_usage(deep=True).sum())
+            continue
+        if hasattr(o, "to_plotly_json"):
+            stack.append(o.to_plotly_json())
+            continue
+
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+
+    return total
+
+
+def _category(key, value) -> str:
+    if key in EVICTABLE_KEYS:
+        return EVICTABLE_KEYS[key]
+    if hasattr(value, "to_plotly_json"):
+        return "figures"
+    return "other"
+
+
+def measure_session(state, known: dict | None = None) -> tuple[dict, dict]:
+    """
+    ({category: bytes}, {key: (category, bytes)}) for one session_state.
+    With `known` ({key: bytes} from an earlier pass) only evictable entries
+    missing from it are measured, the others keep their known size, and
+    "other" is left at 0.
+    """
+    sizes = {c: 0 for c in (*EVICTION_ORDER, "other")}
+    per_key = {}
+    for key in list(state.keys()):
+        value = state[key]
+        category = _category(key, value)
+        if known is not None:
+            if category == "other":
+                continue
+            size = known[key] if key in known else deep_sizeof(value)
+        else:
+            size = deep_sizeof(value)
+        sizes[category] += size
+        per_key[key] = (category, size)
+    return sizes, per_key
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def _prune_ledger():
+    """Forget sessions the runtime has closed."""
+    try:
+        from streamlit.runtime import Runtime
+
+        runtime = Runtime.instance()
+    except Exception:
+        return
+    with _ledger_lock:
+        for sid in list(_ledger):
+            if not runtime.is_active_session(sid):
+                del _ledger[sid]
+
+
+def _evictable(sizes: dict) -> int:
+    return sum(sizes.get(c, 0) for c in EVICTION_ORDER)
+
+
+def _process_level(budget: float):
+    """
+    Highest category (index into EVICTION_ORDER) that must go process-wide
+    to fit the budget, or -1 when already under it.
+    """
+    with _ledger_lock:
+        totals = {c: sum(e["sizes"].get(c, 0) for e in _ledger.values()) for c in EVICTION_ORDER}
+    remaining = sum(totals.values())
+    if remaining <= budget:
+        return -1
+    for level, category in enumerate(EVICTION_ORDER):
+        remaining -= totals[category]
+        if remaining <= budget:
+            return level
+    return len(EVICTION_ORDER) - 1
+
+
+def _evict(state, per_key, sizes, category, reason):
+    freed = 0
+    for key, (cat, size) in per_key.items():
+        if cat == category and key in state:
+            del state[key]
+            freed += size
+    if freed:
+        sizes[category] -= freed
+        inc("ffs_session_cache_evictions_total", category=category, reason=reason)
+        inc("ffs_session_cache_evicted_bytes_total", freed, category=category)
+        print(f"[memory] evicted {category} ({freed / _MB:.1f} MB, {reason} budget)")
+    return freed
+
+
+def _known(state, per_key) -> dict:
+    return {key: size for key, (category, size) in per_key.items() if category != "other" and key in state}
+
+
+def account_session():
+    """Measure this session, enforce both budgets and publish usage gauges."""
+    sid = _session_id()
+    if sid is None:
+        return
+
+    with span("memory_accounting"):
+        state = st.session_state
+        with _ledger_lock:
+            previous = _ledger.get(sid, {})
+        reruns = previous.get("reruns", 0) + 1
+        full = (reruns - 1) % MEMORY_FULL_SCAN_RERUNS == 0
+        sizes, per_key = measure_session(state, None if full else previous.get("known", {}))
+        if not full:
+            sizes["other"] = previous.get("sizes", {}).get("other", 0)
+
+        session_budget = SESSION_MEMORY_BUDGET_MB * _MB
+        for category in EVICTION_ORDER:
+            if _evictable(sizes) <= session_budget:
+                break
+            _evict(state, per_key, sizes, category, "session")
+
+        with _ledger_lock:
+            _ledger[sid] = {"updated": time.time(), "reruns": reruns, "sizes": dict(sizes), "known": _known(state, per_key)}
+        _prune_ledger()
+
+        level = _process_level(PROCESS_MEMORY_BUDGET_MB * _MB)
+        if level >= 0:
+            for category in EVICTION_ORDER[:level + 1]:
+                _evict(state, per_key, sizes, category, "process")
+            with _ledger_lock:
+                _ledger[sid] = {"updated": time.time(), "reruns": reruns, "sizes": dict(sizes), "known": _known(state, per_key)}
+
+        if full:
+            observe("ffs_session_state_bytes", sum(sizes.values()), buckets=SIZE_BUCKETS)
+        publish_usage()
+
+
+def usage() -> dict:
+    with _ledger_lock:
+        entries = list(_ledger.values())
+    totals = {c: sum(e["sizes"].get(c, 0) for e in entries) for c in (*EVICTION_ORDER, "other")}
+    return {
+        "sessions": len(entries),
+        "bytes": totals,
+        "evictable_bytes": _evictable(totals),
+        "largest_session_bytes": max((sum(e["sizes"].values()) for e in entries), default=0),
+    }
+
+
+def publish_usage():
+    u = usage()
+    for category, value in u["bytes"].items():
+        set_gauge("ffs_session_cache_bytes", value, category=category)
+    set_gauge("ffs_session_cache_sessions", u["sessions"])
+    set_gauge("ffs_session_cache_largest_session_bytes", u["largest_session_bytes"])
+    set_gauge("ffs_session_cache_budget_bytes", SESSION_MEMORY_BUDGET_MB * _MB, scope="session")
+    set_gauge("ffs_session_cache_budget_bytes", PROCESS_MEMORY_BUDGET_MB * _MB, scope="process")
@@ -0,0 +1,291 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -------------------------------------------------------------------
+# Lightweight in-process metrics
+# -------------------------------------------------------------------
+# Histograms / gauges keyed by (name, sorted labels). Exposed as
+# Prometheus text or JSON, optionally over a tiny local HTTP server
+# (METRICS_PORT) so it can be scraped without touching Streamlit.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+)
+
+_lock = threading.Lock()
+_histograms = {}    # (name, labels) -> {"buckets", "counts", "sum", "count"}
+_gauges = {}        # (name, labels) -> value
+_counters = {}      # (name, labels) -> value
+
+_local = threading.local()
+_last_trace = None
+
+
+def _key(name: str, labels: dict):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def observe(name: str, value: float, buckets=DEFAULT_BUCKETS, **labels):
+    key = _key(name, labels)
+
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = {
+                "buckets": tuple(buckets),
+                "counts": [0] * len(buckets),
+                "sum": 0.0,
+                "count": 0,
+            }
+            _histograms[key] = h
+
+        for i, bound in enumerate(h["buckets"]):
+            if value <= bound:
+                h["counts"][i] += 1
+        h["sum"] += value
+        h["count"] += 1
+
+
+def set_gauge(name: str, value: float, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def inc(name: str, value: float = 1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+# -------------------------------------------------------------------
+# Per-rerun spans
+# -------------------------------------------------------------------
+def _device(is_mobile: bool) -> str:
+    return "mobile" if is_mobile else "desktop"
+
+
+@contextmanager
+def record_rerun(page: str, is_mobile: bool = False):
+    """
+    Wraps one script rerun. Spans opened inside are collected and, at
+    the end, observed under the final page label (see set_rerun_page).
+    """
+    global _last_trace
+
+    trace = {
+        "id": uuid.uuid4().hex[:16],
+        "page": page,
+        "device": _device(is_mobile),
+        "phases": [],
+        "started_at": time.time(),
+    }
+    _local.trace = trace
+    start = time.perf_counter()
+
+    try:
+        yield trace
+    finally:
+        total = time.perf_counter() - start
+        _local.trace = None
+
+        labels = {"page": trace["page"], "device": trace["device"]}
+        # A phase timed in several places (e.g. build_figures) counts once per rerun
+        phases = {}
+        for phase, seconds in trace["phases"]:
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        for phase, seconds in phases.items():
+            observe("ffs_phase_seconds", seconds, phase=phase, **labels)
+        observe("ffs_rerun_seconds", total, **labels)
+
+        trace["total"] = total
+        _last_trace = trace
+
+
+def set_rerun_page(page: str):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace["page"] = page
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def span(phase: str):
+    """
+    Time a phase of the current rerun. Outside a rerun (background
+    threads) the span is observed immediately under page="background".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        trace = getattr(_local, "trace", None)
+        if trace is not None:
+            trace["phases"].append((phase, elapsed))
+        else:
+            observe(
+                "ffs_phase_seconds", elapsed,
+                phase=phase, page="background", device="none",
+            )
+
+
+# -------------------------------------------------------------------
+# Exposition
+# -------------------------------------------------------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + inner + "}"
+
+
+def render_prometheus() -> str:
+    lines = []
+
+    with _lock:
+        histograms = {k: dict(v, counts=list(v["counts"])) for k, v in _histograms.items()}
+        gauges = dict(_gauges)
+        counters = dict(_counters)
+
+    seen = set()
+    for (name, labels), h in sorted(histograms.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} histogram")
+            seen.add(name)
+        for bound, count in zip(h["buckets"], h["counts"]):
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', bound)])} {count}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {h['count']}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {h['sum']:.6f}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {h['count']}")
+
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    for (name, labels), value in sorted(gauges.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} gauge")
+            seen.add(name)
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": list(h["buckets"]),
+                    "counts": list(h["counts"]),
+                    "sum": h["sum"],
+                    "count": h["count"],
+                }
+                for (name, labels), h in _histograms.items()
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": v}
+                for (name, labels), v in _counters.items()
+            ],
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": v}
+                for (name, labels), v in _gauges.items()
+            ],
+            "last_rerun": _last_trace,
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _gauges.clear()
+        _counters.clear()
+
+
+# -------------------------------------------------------------------
+# Local scrape endpoint
+# -------------------------------------------------------------------
+METRICS_PORT = os.getenv("METRICS_PORT")
+
+_server = None
+_server_lock = threading.Lock()
+_health_probe = None
+
+
+def set_health_probe(probe):
+    """probe() -> dict with a boolean "ready"; served at /readyz (503 until ready)."""
+    global _health_probe
+    _health_probe = probe
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        status = 200
+        if self.path.startswith("/metrics.json"):
+            body = json.dumps(snapshot(), default=str).encode("utf-8")
+            ctype = "application/json"
+        elif self.path.startswith("/metrics"):
+            body = render_prometheus().encode("utf-8")
+            ctype = "text/plain; version=0.0.4"
+        elif self.path.startswith("/readyz"):
+            health = _health_probe() if _health_probe else {"ready": True}
+            status = 200 if health.get("ready") else 503
+            body = json.dumps(health, default=str).encode("utf-8")
+            ctype = "application/json"
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_metrics_server():
+    """Serve /metrics, /metrics.json and /readyz on 127.0.0.1:METRICS_PORT (once per process)."""
+    global _server
+
+    if not METRICS_PORT or _server is not None:
+        return
+
+    with _server_lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), _MetricsHandler)
+        except OSError as e:
+            print(f"[metrics] could not bind port {METRICS_PORT}: {e}")
+            _server = False
+            return
+
+        threading.Thread(
+            target=_server.serve_forever,
+            name="metrics-server",
+            daemon=True,
+        ).start()
+        print(f"[metrics] serving on http://127.0.0.1:{METRICS_PORT}/metrics")
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import requests
+
+from services.api_client import (
+    backend_request,
+    get_payment_status,
+    invalidate_entitlement,
+)
+
+# -------------------------------------------------------------------
+# Payment confirmation watcher (process-wide)
+# -------------------------------------------------------------------
+# One daemon thread polls /payments/status/{order_id} for every order
+# awaiting confirmation, across all sessions. Sessions only read the
+# in-memory status, so no script thread ever sleeps on a payment.
+POLL_INTERVAL_SECONDS = 2
+MAX_WAIT_SECONDS = 15 * 60
+
+PENDING = "pending"
+PAID = "paid"
+FAILED = "failed"
+EXPIRED = "expired"
+
+_lock = threading.Lock()
+_orders = {}        # order_id -> {"username", "status", "started_at"}
+_poller = None
+_wakeup = threading.Event()
+
+
+def watch_payment(order_id: str, username: str):
+    """Start tracking an order; safe to call again on every rerun."""
+    global _poller
+
+    with _lock:
+        _orders.setdefault(order_id, {
+            "username": username,
+            "status": PENDING,
+            "started_at": time.monotonic(),
+        })
+
+        if _poller is None or not _poller.is_alive():
+            _poller = threading.Thread(
+                target=_poll_forever,
+                name="payment-status",
+                daemon=True,
+            )
+            _poller.start()
+
+    _wakeup.set()
+
+
+def payment_status(order_id: str) -> str | None:
+    with _lock:
+        order = _orders.get(order_id)
+        return order["status"] if order else None
+
+
+def forget_payment(order_id: str):
+    with _lock:
+        _orders.pop(order_id, None)
+
+
+def _fetch_status(order_id: str, username: str) -> str:
+    try:
+        return get_payment_status(order_id).get("status", PENDING)
+    except requests.HTTPError as e:
+        # Backends without the status endpoint: entitlement is the authority
+        if e.response is None or e.response.status_code != 404:
+            raise
+        # (get_entitlement() reports errors via st.*, unusable on this thread)
+        resp = backend_request(
+            "GET", "/entitlements/{username}",
+            path_params={"username": username},
+        )
+        resp.raise_for_status()
+        return PAID if resp.json().get("is_premium") else PENDING
+
+
+def _poll_once():
+    now = time.monotonic()
+
+    with _lock:
+        pending = {
+            oid: dict(o) for oid, o in _orders.items()
+            if o["status"] == PENDING
+        }
+
+    for order_id, order in pending.items():
+        if now - order["started_at"] > MAX_WAIT_SECONDS:
+            status = EXPIRED
+        else:
+            try:
+                status = _fetch_status(order_id, order["username"])
+            except Exception as e:
+                print(f"[payments] status check failed for {order_id}: {e}")
+                continue
+
+        if status == PENDING:
+            continue
+
+        if status == PAID:
+            invalidate_entitlement(order["username"])
+
+        with _lock:
+            if order_id in _orders:
+                _orders[order_id]["status"] = status
+
+
+def _poll_forever():
+    while True:
+        with _lock:
+            has_pending = any(o["status"] == PENDING for o in _orders.values())
+
+        if not has_pending:
+            _wakeup.wait()
+            _wakeup.clear()
+            continue
+
+        _poll_once()
+        time.sleep(POLL_INTERVAL_SECONDS)
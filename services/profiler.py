@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import streamlit as st
+
+# -------------------------------------------------------------------
+# On-demand rerun profiler (admins only)
+# -------------------------------------------------------------------
+# A wall-clock stack sampler: a helper thread snapshots the script
+# thread's stack every PROFILE_INTERVAL_SECONDS. Waiting on the backend
+# shows up as time spent in `requests`, which is what we want to see.
+# Output is in "collapsed stack" format (one `frame;frame;frame count`
+# line per unique stack), readable by flamegraph.pl and speedscope.
+ADMIN_USERS = {
+    u.strip() for u in os.getenv("ADMIN_USERS", "").split(",") if u.strip()
+}
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", "0.005"))
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_SESSION_FLAG = "profile_next_rerun"
+
+
+class StackSampler:
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self.elapsed = 0.0
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+
+def is_admin(user: dict) -> bool:
+    return not user.get("is_guest") and user.get("username") in ADMIN_USERS
+
+
+def profiling_requested(user: dict) -> bool:
+    """True when an admin asked for this rerun to be profiled (?profile=1 or the sidebar toggle)."""
+    if not is_admin(user):
+        return False
+    return (
+        st.query_params.get(PROFILE_QUERY_PARAM) == "1"
+        or st.session_state.get(PROFILE_SESSION_FLAG, False)
+    )
+
+
+@contextmanager
+def profile_rerun(label: str):
+    """
+    Sample the current thread for the duration of the block. The result
+    is kept in st.session_state.last_profile even if the block ends in
+    st.stop()/st.rerun(), so it can be downloaded on the next rerun.
+    """
+    # One-shot: consume the request before running
+    st.session_state.pop(PROFILE_SESSION_FLAG, None)
+    if PROFILE_QUERY_PARAM in st.query_params:
+        del st.query_params[PROFILE_QUERY_PARAM]
+
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    try:
+        yield sampler
+    finally:
+        sampler.stop()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        st.session_state.last_profile = {
+            "name": f"profile-{label}-{stamp}.collapsed.txt",
+            "data": sampler.collapsed(),
+            "elapsed": sampler.elapsed,
+            "samples": sum(sampler.samples.values()),
+        }
+        print(f"[profiler] {label}: {sampler.elapsed:.3f}s, "
+              f"{st.session_state.last_profile['samples']} samples")
+
+
+def render_profiler_controls(user: dict):
+    """Sidebar controls for admins: arm the next rerun and download the last profile."""
+    if not is_admin(user):
+        return
+
+    with st.sidebar.expander("🔬 Profiler"):
+        if st.button("Profile next rerun", key="profile_arm"):
+            st.session_state[PROFILE_SESSION_FLAG] = True
+            st.rerun()
+
+        last = st.session_state.get("last_profile")
+        if last:
+            st.caption(f"Last: {last['elapsed']:.2f}s, {last['samples']} samples")
+            st.download_button(
+                "Download collapsed stacks",
+                data=last["data"],
+                file_name=last["name"],
+                mime="text/plain",
+                key="profile_download",
+            )
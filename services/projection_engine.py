@@ -0,0 +1,356 @@
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from ui.allocations_engine import COUNTRY_RULES
+
+# -------------------------------------------------------------------
+# Deterministic projection engine (reference model)
+# -------------------------------------------------------------------
+# A single corpus, split across instruments by the scenario's
+# allocation. Each year, in order:
+#   1. one-time expenses scheduled for that year leave the corpus
+#   2. every instrument earns its rate on its share of the corpus
+#      (SCSS/POMIS style age limits and amount caps are re-applied
+#      each year; blocked share goes to SWP)
+#   3. income (investment + other) is taxed at a flat effective rate
+#   4. inflation-grown living costs and the planned withdrawal are paid
+# Nothing grows while the corpus is empty.
+TAX_RATES = {"IN": 0.10, "US": 0.15, "UK": 0.20}
+
+# Income sources entered per month in the Strategy page (others are yearly)
+MONTHLY_INCOME_SOURCES = {"rental", "pension", "annuity", "social_security"}
+
+# Profile-page market assumptions and the instruments they drive.
+# GLNormalFDRate / GLSrCitizenFDRate both target FD; which one applies
+# depends on the starting age.
+ASSUMPTION_TARGETS = {
+    "GLSWPGrowthRate": ("SWP",),
+    "GLNormalFDRate": ("FD",),
+    "GLSrCitizenFDRate": ("FD",),
+    "GLSCSSRate": ("SCSS",),
+    "GLPOMISRate": ("POMIS",),
+}
+SENIOR_CITIZEN_AGE = 60
+
+
+@dataclass(frozen=True)
+class ProjectionInputs:
+    years: int
+    start_age: int
+    corpus: float                      # initial corpus
+    allocations: dict                  # instrument -> % of corpus
+    rates: dict                        # instrument -> % per year
+    other_income: float = 0.0          # per year, not inflated
+    must_expenses: float = 0.0         # year-1 amount, grows with inflation
+    optional_expenses: float = 0.0     # year-1 amount, grows with inflation
+    inflation: float = 0.0             # % per year
+    withdrawal: float = 0.0            # year-1 amount
+    withdrawal_indexed: bool = False   # grow withdrawal with inflation
+    one_time: dict = field(default_factory=dict)   # year -> amount
+    tax_rate: float = 0.0
+    rules: dict = field(default_factory=dict)      # instrument -> InstrumentRule
+
+
+def _num(value, default=0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _gl(user_data: dict, key: str, default=0.0) -> float:
+    value = user_data.get(key)
+    if isinstance(value, dict):
+        value = value.get("input")
+    return _num(value, default)
+
+
+def inputs_from_user_data(user_data: dict, scenario: dict) -> ProjectionInputs:
+    """Flatten saved simulator inputs + one scenario into engine inputs."""
+    country = user_data.get("country", "IN")
+
+    corpus = sum(_num(v) for v in user_data.get("initial_corpus", {}).get(country, {}).values())
+
+    onetime_total = sum(
+        _num(v.get("input") if isinstance(v, dict) else v)
+        for v in user_data.get("onetime_expenses", {}).get(country, {}).values()
+    )
+
+    must = optional = 0.0
+    for name, v in user_data.get("recurring_expenses", {}).get(country, {}).items():
+        yearly = 12 * _num(v.get("monthly") if isinstance(v, dict) else v)
+        if name.endswith("Opt"):
+            optional += yearly
+        else:
+            must += yearly
+
+    other_income = 0.0
+    for name, amount in (scenario.get("income_sources") or {}).items():
+        other_income += _num(amount) * (12 if name in MONTHLY_INCOME_SOURCES else 1)
+
+    withdrawal = scenario.get("withdrawal") or {}
+
+    return ProjectionInputs(
+        years=max(1, int(_gl(user_data, "GLProjectionYears", 30))),
+        start_age=int(_gl(user_data, "GLAge", 60)),
+        corpus=corpus,
+        allocations={k: _num(v) for k, v in (scenario.get("allocations") or {}).items()},
+        rates={k: _num(v) for k, v in (scenario.get("rates") or {}).items()},
+        other_income=other_income,
+        must_expenses=must,
+        optional_expenses=optional,
+        inflation=_gl(user_data, "GLInflationRate", 0.0),
+        withdrawal=12 * _num(withdrawal.get("monthly")),
+        withdrawal_indexed=bool(withdrawal.get("indexed", False)),
+        one_time={1: onetime_total} if onetime_total else {},
+        tax_rate=TAX_RATES.get(country, 0.0),
+        rules=COUNTRY_RULES.get(country, {}),
+    )
+
+
+def apply_assumption_shifts(inputs: ProjectionInputs, shifts: dict) -> ProjectionInputs:
+    """
+    Shift market assumptions by percentage points, e.g.
+    {"GLInflationRate": +1, "GLSWPGrowthRate": -0.5}.
+    """
+    rates = dict(inputs.rates)
+    inflation = inputs.inflation
+    senior = inputs.start_age >= SENIOR_CITIZEN_AGE
+
+    for key, delta in shifts.items():
+        if not delta:
+            continue
+        if key == "GLInflationRate":
+            inflation += delta
+            continue
+        if key == "GLNormalFDRate" and senior or key == "GLSrCitizenFDRate" and not senior:
+            continue
+        for instrument in ASSUMPTION_TARGETS.get(key, ()):
+            if instrument in rates:
+                rates[instrument] += delta
+
+    return replace(inputs, rates=rates, inflation=inflation)
+
+
+def active_plan(user_data: dict) -> dict:
+    """The UI keeps the plan per country, with an older top-level copy."""
+    country = user_data.get("country", "IN")
+    plan = user_data.get("investment_plan") or {}
+    if isinstance(plan.get(country), dict) and plan[country].get("scenarios"):
+        return plan[country]
+    return plan
+
+
+def active_scenario(user_data: dict) -> dict:
+    """The scenario /projections/ reports as active_result."""
+    plan = active_plan(user_data)
+    scenarios = plan.get("scenarios") or {}
+    return scenarios.get(plan.get("active_scenario")) or next(iter(scenarios.values()), {})
+
+
+def base_data_defaults(base_data: list) -> dict:
+    """Default value of every numeric base_data field (config["base_data"])."""
+    return {
+        f["Field Name"]: f["Field Default Value"]
+        for f in base_data
+        if isinstance(f.get("Field Default Value"), (int, float))
+    }
+
+
+def assumption_shifts(user_data: dict, defaults: dict) -> dict:
+    """Profile-page rate changes relative to `defaults`, in % points."""
+    shifts = {}
+    for key in ASSUMPTION_TARGETS:
+        current = user_data.get(key, {})
+        current = current.get("input") if isinstance(current, dict) else current
+        if isinstance(current, (int, float)) and key in defaults:
+            shifts[key] = current - defaults[key]
+    return shifts
+
+
+def scenario_inputs(user_data: dict, scenario: dict, defaults: dict) -> ProjectionInputs:
+    """Engine inputs for one scenario as /projections/ runs it."""
+    return apply_assumption_shifts(
+        inputs_from_user_data(user_data, scenario), assumption_shifts(user_data, defaults)
+    )
+
+
+def effective_weights(inputs: ProjectionInputs, age: int, balance: float) -> dict:
+    """Allocation fractions for one year after age limits and amount caps."""
+    total = sum(inputs.allocations.values()) or 1.0
+    weights = {k: v / total for k, v in inputs.allocations.items()}
+
+    surplus = 0.0
+    for name, w in weights.items():
+        rule = inputs.rules.get(name)
+        if rule is None or name == "SWP" or w <= 0:
+            continue
+        if rule.min_age is not None and age < rule.min_age:
+            surplus += w
+            weights[name] = 0.0
+            continue
+        if rule.max_investment_amount and balance > 0:
+            limit = rule.max_investment_amount / balance
+            if w > limit:
+                surplus += w - limit
+                weights[name] = limit
+
+    if surplus:
+        weights["SWP"] = weights.get("SWP", 0.0) + surplus
+    return weights
+
+
+def project_stepwise(inputs: ProjectionInputs) -> list:
+    """Year-by-year projection rows (the shape /projections/ returns)."""
+    rows = []
+    balance = inputs.corpus
+    growth = 1 + inputs.inflation / 100
+
+    for year in range(1, inputs.years + 1):
+        age = inputs.start_age + year - 1
+        start = balance
+        one_time = inputs.one_time.get(year, 0.0)
+        balance -= one_time
+
+        row = {"Year": year, "Age": age, "StartingCorpus": round(start, 2)}
+
+        invested = max(balance, 0.0)
+        weights = effective_weights(inputs, age, invested)
+        investment_income = 0.0
+        for name in inputs.allocations:
+            income = invested * weights.get(name, 0.0) * inputs.rates.get(name, 0.0) / 100
+            row[f"{name}Income"] = round(income, 2)
+            investment_income += income
+
+        factor = growth ** (year - 1)
+        total_income = investment_income + inputs.other_income
+        tax = total_income * inputs.tax_rate
+        must = inputs.must_expenses * factor
+        optional = inputs.optional_expenses * factor
+        withdrawal = inputs.withdrawal * (factor if inputs.withdrawal_indexed else 1)
+
+        balance += total_income - tax - must - optional - withdrawal
+
+        row.update({
+            "OtherIncome": round(inputs.other_income, 2),
+            "TotalIncome": round(total_income, 2),
+            "TotalTax": round(tax, 2),
+            "NetIncomeAfterTax": round(total_income - tax, 2),
+            "AnnualMustExpenses": round(must, 2),
+            "AnnualOptionalExpenses": round(optional, 2),
+            "TotalExpenses": round(must + optional, 2),
+            "OneTimeExpenses": round(one_time, 2),
+            "TotalWithdrawal": round(withdrawal, 2),
+            "EndingCorpus": round(balance, 2),
+        })
+        rows.append(row)
+
+    return rows
+
+
+def project(inputs: ProjectionInputs) -> list:
+    return project_stepwise(inputs)
+
+
+# -------------------------------------------------------------------
+# Batched kernel
+# -------------------------------------------------------------------
+# project_stepwise over many input sets at once: the year loop stays,
+# but each step is one set of numpy operations over every variant and
+# instrument, so 2 or 2,000 variants cost about the same. Variants may
+# differ in anything (horizons too; columns past a variant's horizon
+# are NaN). Goal seek, sensitivity and attribution are built on it.
+BATCH_COLUMNS = ("StartingCorpus", "TotalIncome", "NetIncomeAfterTax", "TotalExpenses", "EndingCorpus")
+
+
+def project_batch(batch: list) -> dict:
+    """{column: array (variants x years)} for BATCH_COLUMNS, plus "years" per variant."""
+    n = len(batch)
+    T = max(inputs.years for inputs in batch)
+    names = list(dict.fromkeys(name for inputs in batch for name in inputs.allocations))
+
+    def matrix(get, default=0.0):
+        return np.array([[get(inputs, name, default) for name in names] for inputs in batch], dtype=float)
+
+    def vector(get):
+        return np.array([get(inputs) for inputs in batch], dtype=float)
+
+    def rule(attr):
+        def get(inputs, name, default):
+            r = inputs.rules.get(name)
+            value = getattr(r, attr) if r is not None and name != "SWP" else None
+            return default if value is None else value
+        return get
+
+    held = matrix(lambda i, name, d: name in i.allocations) > 0
+    alloc = matrix(lambda i, name, d: i.allocations.get(name, d))
+    total = alloc.sum(axis=1, keepdims=True)
+    base = alloc / np.where(total == 0, 1.0, total)
+    rates = matrix(lambda i, name, d: i.rates.get(name, d)) / 100
+    min_age = matrix(rule("min_age"), np.nan)
+    cap = matrix(rule("max_investment_amount"))
+    limited = (matrix(lambda i, name, d: name != "SWP" and name in i.rules) > 0) & (base > 0)
+    swp = names.index("SWP") if "SWP" in names else None
+
+    start_age = vector(lambda i: i.start_age)
+    other = vector(lambda i: i.other_income)
+    living = vector(lambda i: i.must_expenses + i.optional_expenses)
+    growth = 1 + vector(lambda i: i.inflation) / 100
+    withdrawal = vector(lambda i: i.withdrawal)
+    indexed = vector(lambda i: i.withdrawal_indexed) > 0
+    tax = vector(lambda i: i.tax_rate)
+    years = vector(lambda i: i.years).astype(int)
+    one_time = np.zeros((n, T))
+    for row, inputs in enumerate(batch):
+        for year, amount in inputs.one_time.items():
+            if 1 <= year <= T:
+                one_time[row, year - 1] += amount
+
+    out = {column: np.empty((n, T)) for column in BATCH_COLUMNS}
+    balance = vector(lambda i: i.corpus)
+    for y in range(T):
+        out["StartingCorpus"][:, y] = balance
+        balance = balance - one_time[:, y]
+        invested = np.maximum(balance, 0.0)[:, None]
+
+        blocked = limited & ((start_age + y)[:, None] < min_age)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limit = cap / invested
+        binds = limited & ~blocked & (cap > 0) & (invested > 0) & (base > limit)
+        weights = np.where(blocked, 0.0, np.where(binds, limit, base))
+        if swp is not None:
+            weights[:, swp] += (base - weights).sum(axis=1)
+
+        factor = growth ** y
+        total_income = (invested * weights * rates * held).sum(axis=1) + other
+        expenses = living * factor
+        balance = (
+            balance + total_income * (1 - tax) - expenses
+            - withdrawal * np.where(indexed, factor, 1.0)
+        )
+        out["TotalIncome"][:, y] = total_income
+        out["NetIncomeAfterTax"][:, y] = total_income * (1 - tax)
+        out["TotalExpenses"][:, y] = expenses
+        out["EndingCorpus"][:, y] = balance
+
+    past = np.arange(T)[None, :] >= years[:, None]
+    for column in BATCH_COLUMNS:
+        out[column][past] = np.nan
+    out["years"] = years
+    return out
+
+
+def survives(result: dict) -> np.ndarray:
+    """Per variant: EndingCorpus >= 0 in every year of its horizon."""
+    return (np.nan_to_num(result["EndingCorpus"], nan=np.inf) >= 0).all(axis=1)
+
+
+def life_stage(age: int) -> str:
+    if age < 40:
+        return "fire"
+    if age < 50:
+        return "wealth"
+    if age < 60:
+        return "pre_retire"
+    return "retired"
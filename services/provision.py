@@ -0,0 +1,40 @@
+"""
+One-time host provisioning, run at deploy / container build time:
+
+    python -m services.provision
+
+Never called from the Streamlit request path.
+"""
+import os
+import subprocess
+import sys
+
+PLAYWRIGHT_BROWSERS_PATH = os.getenv(
+    "PLAYWRIGHT_BROWSERS_PATH",
+    os.path.expanduser("~/.cache/ms-playwright")
+)
+
+
+def playwright_browsers_installed() -> bool:
+    if not os.path.isdir(PLAYWRIGHT_BROWSERS_PATH):
+        return False
+    return any(
+        name.startswith("chromium")
+        for name in os.listdir(PLAYWRIGHT_BROWSERS_PATH)
+    )
+
+
+def ensure_playwright_browsers():
+    if playwright_browsers_installed():
+        print(f"[provision] Chromium already present in {PLAYWRIGHT_BROWSERS_PATH}")
+        return
+
+    print("[provision] Installing Playwright Chromium...")
+    subprocess.run(
+        [sys.executable, "-m", "playwright", "install", "chromium"],
+        check=True
+    )
+
+
+if __name__ == "__main__":
+    ensure_playwright_browsers()
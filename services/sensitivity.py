@@ -0,0 +1,33 @@
+from services.projection_engine import ProjectionInputs, apply_assumption_shifts, project_batch
+
+# -------------------------------------------------------------------
+# Sensitivity (tornado) analysis
+# -------------------------------------------------------------------
+# Moves each market assumption down and up by `delta` percentage points
+# on its own and reports how the ending corpus changes. The base case
+# and all 2 x k variants are one project_batch call.
+SENSITIVITY_DELTA = 1.0     # percentage points
+
+
+def tornado(inputs: ProjectionInputs, drivers, delta: float = SENSITIVITY_DELTA) -> dict:
+    """
+    {"base": ending corpus, "delta": delta, "rows": [{"driver", "low", "high"}]},
+    low/high being the ending-corpus change at -delta/+delta, largest swing
+    first. Drivers that do not affect these inputs are left out.
+    """
+    drivers = list(drivers)
+    batch = [inputs] + [
+        apply_assumption_shifts(inputs, {driver: shift})
+        for driver in drivers
+        for shift in (-delta, delta)
+    ]
+    ending = project_batch(batch)["EndingCorpus"][:, inputs.years - 1]
+    changes = (ending[1:] - ending[0]).reshape(len(drivers), 2)
+
+    rows = [
+        {"driver": driver, "low": float(low), "high": float(high)}
+        for driver, (low, high) in zip(drivers, changes)
+        if low or high
+    ]
+    rows.sort(key=lambda r: max(abs(r["low"]), abs(r["high"])), reverse=True)
+    return {"base": float(ending[0]), "delta": delta, "rows": rows}
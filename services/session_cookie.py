@@ -0,0 +1,46 @@
+import os
+import secrets
+import threading
+import time
+
+# -------------------------------------------------------------------
+# HttpOnly session cookie
+# -------------------------------------------------------------------
+# The session token from /auth/login must never be readable by page
+# scripts, so only server.py sets the cookie, as HttpOnly, Secure (over
+# https) and SameSite=Strict. A script run cannot set response headers,
+# so a login hands the token over through a one-time nonce: the script
+# stages the token here, the browser POSTs the nonce to
+# COOKIE_ROUTE and gets the cookie back in the response. The nonce is
+# single-use and short-lived, and the token never goes to the browser
+# in a form scripts can read. A DELETE to COOKIE_ROUTE expires the cookie.
+#
+# Hosts that run app.py without server.py have no such route: sign-in
+# still works, it just does not survive a refresh.
+SESSION_COOKIE = "ffs_session"
+SESSION_COOKIE_DAYS = float(os.getenv("SESSION_COOKIE_DAYS", "30"))
+COOKIE_ROUTE = "/auth/session-cookie"
+HANDOFF_TTL_SECONDS = 60
+
+_handoffs = {}      # nonce -> (token, max_age, expires_at)
+_handoffs_lock = threading.Lock()
+
+
+def stage(token: str, max_age: int) -> str:
+    """Park `token` for the browser to collect; returns the nonce to redeem it with."""
+    nonce = secrets.token_urlsafe(32)
+    now = time.monotonic()
+    with _handoffs_lock:
+        for stale in [n for n, (_, _, exp) in _handoffs.items() if exp < now]:
+            del _handoffs[stale]
+        _handoffs[nonce] = (token, int(max_age), now + HANDOFF_TTL_SECONDS)
+    return nonce
+
+
+def redeem(nonce: str):
+    """(token, max_age) for a staged nonce, once; None if unknown or expired."""
+    with _handoffs_lock:
+        entry = _handoffs.pop(nonce or "", None)
+    if entry is None or entry[2] < time.monotonic():
+        return None
+    return entry[0], entry[1]
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from services.metrics import inc, set_gauge
+
+# -------------------------------------------------------------------
+# Shared cache for configs, projections, figures and PDFs
+# -------------------------------------------------------------------
+# CACHE_BACKEND=memory  per-process LRU (default)
+# CACHE_BACKEND=sqlite  one SQLite file shared by every server process
+#                       on the host (SHARED_CACHE_PATH), so a value
+#                       computed by one process is a hit in all others
+#
+# Values are pickled in both backends, so every hit is an independent
+# copy (callers mutate figures after fetching them). The SQLite store
+# runs in WAL mode with memory-mapped reads; each write is a single
+# upsert transaction, so readers in other processes never see a
+# partial value. Entries expire per namespace (CACHE_TTLS) and the
+# least recently used go once SHARED_CACHE_MAX_MB is exceeded. SQLite
+# keeps the total size in a one-row table maintained by triggers, so a
+# write checks the budget without summing the table; expired rows are
+# swept at most every EXPIRED_SWEEP_SECONDS per process.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+SHARED_CACHE_PATH = os.getenv(
+    "SHARED_CACHE_PATH", os.path.join(tempfile.gettempdir(), "ffs-shared-cache.sqlite3")
+)
+SHARED_CACHE_MAX_MB = float(os.getenv("SHARED_CACHE_MAX_MB", "256"))
+
+CACHE_TTLS = {
+    "config": 300,
+    "projections": 3600,
+    "figures": 3600,
+    "pdf": 3600,
+}
+DEFAULT_TTL = 600
+
+# Reads refresh an entry's LRU position at most this often
+TOUCH_INTERVAL_SECONDS = 60
+EXPIRED_SWEEP_SECONDS = 60
+EVICT_BATCH = 64
+
+_MB = 2 ** 20
+
+
+def canonical(value):
+    """
+    JSON value with integral floats as ints, so inputs that differ only by
+    how a widget typed a number (50000 vs 50000.0) share a key.
+    """
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def cache_key(*parts) -> str:
+    """Stable digest of JSON-able values and DataFrames."""
+    h = hashlib.sha256()
+    for part in parts:
+        if hasattr(part, "columns") and hasattr(part, "to_numpy"):
+            import pandas as pd
+
+            h.update(json.dumps(list(map(str, part.columns))).encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        else:
+            h.update(json.dumps(canonical(part), sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+# ---------------- backends ----------------
+class MemoryBackend:
+
+    def __init__(self, max_bytes: float):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()    # (ns, key) -> (blob, expires)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, ns, key):
+        with self._lock:
+            hit = self._entries.get((ns, key))
+            if hit is None:
+                return None
+            blob, expires = hit
+            if expires < time.time():
+                self._drop((ns, key))
+                return None
+            self._entries.move_to_end((ns, key))
+            return blob
+
+    def set(self, ns, key, blob, ttl):
+        with self._lock:
+            if (ns, key) in self._entries:
+                self._drop((ns, key))
+            self._entries[(ns, key)] = (blob, time.time() + ttl)
+            self._bytes += len(blob)
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                inc("ffs_cache_evictions_total", backend="memory")
+
+    def _drop(self, k):
+        blob, _ = self._entries.pop(k)
+        self._bytes -= len(blob)
+
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class SQLiteBackend:
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        ns       TEXT NOT NULL,
+        key      TEXT NOT NULL,
+        value    BLOB NOT NULL,
+        size     INTEGER NOT NULL,
+        expires  REAL NOT NULL,
+        accessed REAL NOT NULL,
+        PRIMARY KEY (ns, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+    CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires);
+
+    CREATE TABLE IF NOT EXISTS cache_total (
+        id    INTEGER PRIMARY KEY CHECK (id = 0),
+        bytes INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO cache_total SELECT 0, COALESCE(SUM(size), 0) FROM cache;
+    CREATE TRIGGER IF NOT EXISTS cache_total_insert AFTER INSERT ON cache BEGIN
+        UPDATE cache_total SET bytes = bytes + NEW.size WHERE id = 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS cache_total_update AFTER UPDATE OF size ON cache BEGIN
+        UPDATE cache_total SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS cache_total_delete AFTER DELETE ON cache BEGIN
+        UPDATE cache_total SET bytes = bytes - OLD.size WHERE id = 0;
+    END;
+    """
+
+    def __init__(self, path: str, max_bytes: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._next_sweep = 0.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._conn() as db:
+            db.executescript(self.SCHEMA)
+
+    def _conn(self):
+        # One connection per thread; WAL lets them read concurrently
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA mmap_size={256 * _MB}")
+            self._local.db = db
+        return db
+
+    def get(self, ns, key):
+        db = self._conn()
+        row = db.execute(
+            "SELECT value, expires, accessed FROM cache WHERE ns = ? AND key = ?", (ns, key)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires, accessed = row
+        now = time.time()
+        if expires < now:
+            db.execute("DELETE FROM cache WHERE ns = ? AND key = ?", (ns, key))
+            return None
+        if now - accessed > TOUCH_INTERVAL_SECONDS:
+            db.execute("UPDATE cache SET accessed = ? WHERE ns = ? AND key = ?", (now, ns, key))
+        return value
+
+    def set(self, ns, key, blob, ttl):
+        db = self._conn()
+        now = time.time()
+        db.execute(
+            "INSERT INTO cache (ns, key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (ns, key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+            "expires = excluded.expires, accessed = excluded.accessed",
+            (ns, key, sqlite3.Binary(blob), len(blob), now + ttl, now),
+        )
+        self._evict(db, now)
+
+    def _evict(self, db, now):
+        if now >= self._next_sweep:
+            self._next_sweep = now + EXPIRED_SWEEP_SECONDS
+            db.execute("DELETE FROM cache WHERE expires < ?", (now,))
+        if self.size_bytes() <= self.max_bytes:
+            return
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                total = db.execute("SELECT bytes FROM cache_total WHERE id = 0").fetchone()[0]
+                if total <= self.max_bytes:
+                    break
+                batch = db.execute(
+                    "SELECT ns, key, size FROM cache ORDER BY accessed LIMIT ?", (EVICT_BATCH,)
+                ).fetchall()
+                if not batch:
+                    break
+                for ns, key, size in batch:
+                    if total <= self.max_bytes:
+                        break
+                    db.execute("DELETE FROM cache WHERE ns = ? AND key = ?", (ns, key))
+                    total -= size
+                    inc("ffs_cache_evictions_total", backend="sqlite")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def size_bytes(self) -> int:
+        return self._conn().execute("SELECT bytes FROM cache_total WHERE id = 0").fetchone()[0]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_stats = {}         # ns -> [hits, misses] (this process)
+_stats_lock = threading.Lock()
+
+
+def backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if CACHE_BACKEND == "sqlite":
+                    _backend = SQLiteBackend(SHARED_CACHE_PATH, SHARED_CACHE_MAX_MB * _MB)
+                else:
+                    _backend = MemoryBackend(SHARED_CACHE_MAX_MB * _MB)
+    return _backend
+
+
+# ---------------- API ----------------
+def _count(ns: str, hit: bool):
+    inc("ffs_cache_requests_total", namespace=ns, result="hit" if hit else "miss")
+    with _stats_lock:
+        s = _stats.setdefault(ns, [0, 0])
+        s[0 if hit else 1] += 1
+        set_gauge("ffs_cache_hit_ratio", s[0] / (s[0] + s[1]), namespace=ns)
+
+
+_MISSING = object()
+
+
+def get(ns: str, key: str, default=None):
+    try:
+        blob = backend().get(ns, key)
+    except sqlite3.Error as e:
+        print(f"[cache] read failed ({ns}): {e}")
+        blob = None
+    _count(ns, blob is not None)
+    return default if blob is None else pickle.loads(blob)
+
+
+def put(ns: str, key: str, value, ttl: float | None = None):
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        backend().set(ns, key, blob, CACHE_TTLS.get(ns, DEFAULT_TTL) if ttl is None else ttl)
+    except sqlite3.Error as e:
+        # A cache that cannot write is only slower, never wrong
+        print(f"[cache] write failed ({ns}): {e}")
+
+
+def get_or_compute(ns: str, key: str, compute, ttl: float | None = None):
+    """Cached value, or compute() stored for next time. Exceptions are not cached."""
+    value = get(ns, key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        put(ns, key, value, ttl)
+    return value
+
+
+def stats() -> dict:
+    """Hit ratio per namespace in this process, plus the store's size."""
+    with _stats_lock:
+        by_ns = {
+            ns: {"hits": h, "misses": m, "hit_ratio": round(h / (h + m), 3) if h + m else 0.0}
+            for ns, (h, m) in _stats.items()
+        }
+    size = backend().size_bytes()
+    set_gauge("ffs_cache_bytes", size, backend=CACHE_BACKEND)
+    return {"backend": CACHE_BACKEND, "bytes": size, "namespaces": by_ns}
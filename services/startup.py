@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+
+# -------------------------------------------------------------------
+# Cold-start tracking
+# -------------------------------------------------------------------
+# Measured from process start when the OS exposes it, otherwise from
+# the first import of this module (the first script run).
+def _process_started_at() -> float:
+    try:
+        return os.stat(f"/proc/{os.getpid()}").st_ctime
+    except OSError:
+        return time.time()
+
+
+PROCESS_STARTED_AT = _process_started_at()
+
+_first_paint = {}   # view -> seconds from process start
+
+
+def mark_first_paint(view: str):
+    """Record (once per process) how long it took until `view` was drawn; exported as ffs_first_paint_seconds."""
+    from services.metrics import set_gauge
+
+    if view in _first_paint:
+        return
+
+    elapsed = time.time() - PROCESS_STARTED_AT
+    _first_paint[view] = elapsed
+    set_gauge("ffs_first_paint_seconds", elapsed, view=view)
+    print(f"[startup] first paint of '{view}' after {elapsed * 1000:.0f} ms")
+
+
+# -------------------------------------------------------------------
+# Background provisioning
+# -------------------------------------------------------------------
+# Hosts that never ran `python -m services.provision` (e.g. Streamlit
+# Cloud) still get Chromium, but off the request path: the first run
+# starts the install on a daemon thread and moves on.
+_provision_thread = None
+
+
+def start_background_provisioning():
+    global _provision_thread
+
+    if _provision_thread is not None:
+        return
+
+    # Test/benchmark harnesses run without Chromium on purpose
+    if os.getenv("SKIP_BROWSER_PROVISIONING") == "1":
+        _provision_thread = False
+        return
+
+    from services.provision import ensure_playwright_browsers, playwright_browsers_installed
+
+    if playwright_browsers_installed():
+        _provision_thread = False
+        return
+
+    _provision_thread = threading.Thread(
+        target=ensure_playwright_browsers,
+        name="provision-playwright",
+        daemon=True,
+    )
+    _provision_thread.start()
+
+
+def wait_for_browser_provisioning(timeout: float | None = None) -> bool:
+    """Block until a background Chromium install (if any) has finished."""
+    if _provision_thread:
+        _provision_thread.join(timeout)
+        return not _provision_thread.is_alive()
+    return True
+
+
+# -------------------------------------------------------------------
+# Warm-up
+# -------------------------------------------------------------------
+# On a fresh process the first user would pay for every cold path:
+# configs, the pandas / plotly / playwright imports, Chromium launch.
+# A daemon thread does all of it instead, then precomputes the guest
+# demo (ui.demo). server.py starts it with the server; under plain
+# `streamlit run app.py` the first run starts it once its page has been
+# drawn, so the imports do not compete with the first paint. /readyz on METRICS_PORT
+# answers 503 until the warm-up steps have finished. STARTUP_WARMUP=0
+# turns it off (the process is then reported ready straight away).
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") == "1"
+
+WARMUP_COUNTRIES = ("IN", "US", "UK")
+WARMUP_MODULES = (
+    "pandas",
+    "numpy",
+    "plotly.express",
+    "plotly.graph_objects",
+    "fpdf",
+    "playwright.async_api",
+    "ui.summary",
+    "ui.investment_plan",
+    "ui.expenses",
+    "ui.pdf",
+)
+
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+_warmup = {"started": None, "finished": None, "steps": {}}
+
+
+def _warm_configs():
+    from services.api_client import get_config
+
+    for country in WARMUP_COUNTRIES:
+        get_config(country)
+
+
+def _warm_imports():
+    import importlib
+
+    for module in WARMUP_MODULES:
+        importlib.import_module(module)
+
+
+def _warm_allocation_tables():
+    from ui.allocations_engine import build_allocation_tables
+
+    build_allocation_tables()
+
+
+def _warm_pdf_browser():
+    from services import browser_pool
+
+    wait_for_browser_provisioning()
+    browser_pool.start()
+
+
+WARMUP_STEPS = (
+    ("configs", _warm_configs),
+    ("imports", _warm_imports),
+    ("allocation_tables", _warm_allocation_tables),
+    ("pdf_browser", _warm_pdf_browser),
+)
+
+
+def _run_warmup():
+    from services.metrics import inc, set_gauge
+
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+            result = {"status": "ok"}
+        except Exception as e:
+            # A failed step only means that path stays cold
+            result = {"status": "failed", "error": str(e)}
+            inc("ffs_warmup_failures_total", step=name)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        _warmup["steps"][name] = result
+        print(f"[startup] warm-up {name}: {result['status']} in {result['seconds'] * 1000:.0f} ms")
+
+    _warmup["finished"] = time.time()
+    set_gauge("ffs_warmup_ready", 1)
+    set_gauge("ffs_warmup_seconds", _warmup["finished"] - _warmup["started"])
+
+    from ui.demo import DEMO_PRECOMPUTE, precompute_all
+
+    if DEMO_PRECOMPUTE:
+        precompute_all()
+
+
+def start_warmup():
+    """Start the warm-up thread (once per process); never blocks the caller."""
+    global _warmup_thread
+
+    from services.metrics import set_health_probe
+
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return
+        set_health_probe(readiness)
+        if not STARTUP_WARMUP:
+            _warmup_thread = False
+            return
+
+        _warmup["started"] = time.time()
+        _warmup_thread = threading.Thread(target=_run_warmup, name="warmup", daemon=True)
+        _warmup_thread.start()
+
+
+def readiness() -> dict:
+    """Health-check payload: ready once every warm-up step has run."""
+    from ui.demo import demo_ready
+
+    return {
+        "ready": not STARTUP_WARMUP or _warmup["finished"] is not None,
+        "uptime_seconds": round(time.time() - PROCESS_STARTED_AT, 1),
+        "steps": dict(_warmup["steps"]),
+        "demo": demo_ready(),
+    }
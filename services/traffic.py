@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from services.metrics import inc
+
+# -------------------------------------------------------------------
+# Backend traffic record / replay
+# -------------------------------------------------------------------
+#   TRAFFIC_MODE=record TRAFFIC_LOG=session.jsonl streamlit run app.py
+#   TRAFFIC_MODE=replay TRAFFIC_LOG=session.jsonl TRAFFIC_REPLAY_SPEED=50 ...
+#
+# The log is append-only JSON Lines, one compact entry per call.
+# Passwords, tokens and keys are redacted from both the request payload
+# and the response before anything is written.
+#
+# Replay answers from an in-memory index keyed on (method, path + query,
+# payload hash). Repeated calls with the same key get the recorded
+# responses in order, then keep getting the last one (so a payment
+# status poll still goes pending -> paid). TRAFFIC_REPLAY_SPEED scales
+# the recorded backend time (50 = 50x faster); 0 answers immediately.
+TRAFFIC_MODE = os.getenv("TRAFFIC_MODE", "").lower()          # "", "record", "replay"
+TRAFFIC_LOG = os.getenv("TRAFFIC_LOG", "traffic.jsonl")
+TRAFFIC_REPLAY_SPEED = float(os.getenv("TRAFFIC_REPLAY_SPEED", "0"))
+
+RECORDING = TRAFFIC_MODE == "record"
+REPLAYING = TRAFFIC_MODE == "replay"
+
+SENSITIVE_KEYS = ("password", "token", "secret", "authorization", "api_key", "razorpay_key")
+REDACTED = "***"
+
+_write_lock = threading.Lock()
+_index = None                       # key -> [entry, ...]
+_cursor = defaultdict(int)          # key -> next position
+_index_lock = threading.Lock()
+
+
+def _is_sensitive(key) -> bool:
+    key = str(key).lower()
+    return any(s in key for s in SENSITIVE_KEYS)
+
+
+def sanitize(value):
+    """Copy of a JSON value with sensitive fields replaced by REDACTED."""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if _is_sensitive(k) else sanitize(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(v) for v in value]
+    return value
+
+
+def _compact(value) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+def request_key(method: str, path: str, params: dict | None, payload) -> tuple:
+    """
+    Index key for one call. The payload is hashed after redaction, so a
+    replayed login matches whatever password the replaying client sends.
+    """
+    if params:
+        path = f"{path}?{_compact(params)}"
+    digest = ""
+    if payload is not None:
+        digest = hashlib.sha1(_compact(sanitize(payload)).encode("utf-8")).hexdigest()[:16]
+    return method, path, digest
+
+
+# ---------------- record ----------------
+def record(method, path, params, payload, resp, elapsed):
+    """Append one call to TRAFFIC_LOG. Reads the whole body, even when streamed."""
+    content_type = resp.headers.get("Content-Type", "")
+    body = resp.content.decode(resp.encoding or "utf-8", errors="replace")
+    if "json" in content_type and "ndjson" not in content_type:
+        try:
+            body = _compact(sanitize(json.loads(body)))
+        except ValueError:
+            pass
+
+    m, p, h = request_key(method, path, params, payload)
+    entry = {
+        "t": round(time.time(), 3),
+        "m": m,
+        "p": p,
+        "h": h,
+        "rq": sanitize(payload),
+        "s": resp.status_code,
+        "ct": content_type,
+        "e": round(elapsed, 4),
+        "b": body,
+    }
+    line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+    with _write_lock:
+        with open(TRAFFIC_LOG, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+# ---------------- replay ----------------
+def load_index(path: str = None) -> dict:
+    index = defaultdict(list)
+    with open(path or TRAFFIC_LOG, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                index[(entry["m"], entry["p"], entry["h"])].append(entry)
+    print(f"[traffic] loaded {sum(len(v) for v in index.values())} calls "
+          f"({len(index)} distinct) from {path or TRAFFIC_LOG}")
+    return index
+
+
+def _next_entry(key):
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+        entries = _index.get(key)
+        if not entries:
+            return None
+        pos = _cursor[key]
+        _cursor[key] = pos + 1
+        return entries[min(pos, len(entries) - 1)]
+
+
+def replay(method, path, params, payload, url: str):
+    """The recorded `requests.Response` for this call; ConnectionError if none."""
+    key = request_key(method, path, params, payload)
+    entry = _next_entry(key)
+    if entry is None:
+        inc("ffs_traffic_replay_misses_total", method=method)
+        raise requests.ConnectionError(f"no recorded response for {method} {key[1]}")
+
+    if TRAFFIC_REPLAY_SPEED > 0:
+        time.sleep(entry["e"] / TRAFFIC_REPLAY_SPEED)
+
+    resp = requests.Response()
+    resp.status_code = entry["s"]
+    resp.headers = CaseInsensitiveDict({"Content-Type": entry["ct"]})
+    resp.encoding = "utf-8"
+    resp.url = url
+    resp._content = entry["b"].encode("utf-8")
+    # Body already in memory: lets iter_lines()/iter_content() work
+    # for stream=True callers without a socket behind it
+    resp._content_consumed = True
+    return resp
+
+
+def reset_replay():
+    """Forget the loaded index and cursors (e.g. between load-test sessions)."""
+    global _index
+    with _index_lock:
+        _index = None
+        _cursor.clear()
@@ -0,0 +1,78 @@
+import itertools
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import COUNTRIES, make_user_data
+from services.projection_engine import (
+    apply_assumption_shifts,
+    inputs_from_user_data,
+    project_batch,
+    project_stepwise,
+)
+
+ABS_TOL = 0.02      # stepwise rows are rounded to 2 decimals
+REL_TOL = 1e-9
+
+# Either side of the SCSS age limit, caps binding or not, withdrawals
+# that last / run out, rate shifts and a later one-time expense
+AGES = (35, 59, 60, 72)
+CORPUS_SCALES = (0.05, 1, 20)
+WITHDRAWALS = ((0, False), (0.04, True), (0.5, False))
+SHIFTS = ({}, {"GLInflationRate": 2, "GLSWPGrowthRate": -3})
+ONE_TIME = ("fixture", "year 5")
+
+
+def _scenarios(country: str, years: int) -> dict:
+    user_data = make_user_data(country, years)
+    plan = user_data["investment_plan"][country]
+    return {name: inputs_from_user_data(user_data, sc) for name, sc in plan["scenarios"].items()}
+
+
+def _variants(inputs) -> list:
+    batch = []
+    for age, scale, (rate, indexed), shifts, one_time in itertools.product(
+        AGES, CORPUS_SCALES, WITHDRAWALS, SHIFTS, ONE_TIME
+    ):
+        corpus = inputs.corpus * scale
+        schedule = inputs.one_time if one_time == "fixture" else {**inputs.one_time, 5: corpus * 0.1}
+        batch.append(apply_assumption_shifts(
+            replace(
+                inputs,
+                start_age=age,
+                corpus=corpus,
+                withdrawal=corpus * rate,
+                withdrawal_indexed=indexed,
+                one_time=schedule,
+            ),
+            shifts,
+        ))
+    return batch
+
+
+@pytest.mark.parametrize("country", COUNTRIES)
+@pytest.mark.parametrize("years", (2, 30, 60))
+def test_batch_matches_stepwise(country, years):
+    for scenario, inputs in _scenarios(country, years).items():
+        batch = _variants(inputs)
+        result = project_batch(batch)
+        for i, variant in enumerate(batch):
+            rows = project_stepwise(variant)
+            for column in ("StartingCorpus", "TotalIncome", "NetIncomeAfterTax", "TotalExpenses", "EndingCorpus"):
+                expected = np.array([row[column] for row in rows])
+                np.testing.assert_allclose(
+                    result[column][i, : variant.years], expected, rtol=REL_TOL, atol=ABS_TOL,
+                    err_msg=f"{scenario} {column} {variant}",
+                )
+            assert np.isnan(result["EndingCorpus"][i, variant.years:]).all()
+
+
+def test_batch_mixed_horizons():
+    short, long = _scenarios("IN", 2)["Base"], _scenarios("IN", 30)["Base"]
+    result = project_batch([short, long])
+    assert list(result["years"]) == [2, 30]
+    np.testing.assert_allclose(
+        result["EndingCorpus"][0, :2], [r["EndingCorpus"] for r in project_stepwise(short)], atol=ABS_TOL
+    )
+    assert np.isnan(result["EndingCorpus"][0, 2:]).all()
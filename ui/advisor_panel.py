@@ -1,8 +1,18 @@
+import time
+
 import streamlit as st
 
-def render_advisor_panel(advice: dict):
+def render_advisor_panel(advice: dict, expanded: bool = False, streaming: bool = False, timed_out: bool = False):
     st.subheader("🧠 Advisor Insights")
 
+    if streaming and not advice:
+        st.info("🧠 Preparing advisor insights…")
+        return
+
+    if timed_out and not advice:
+        st.info("🧠 Advisor insights are taking longer than usual. They will appear when you refresh the page.")
+        return
+
     if not advice or not isinstance(advice, dict):
         st.info("Advisor insights unavailable.")
         return
@@ -23,7 +33,7 @@ def render_advisor_panel(advice: dict):
     positives = advice.get("positives", [])
     if positives:
         has_any_content = True
-        with st.expander("✅ What’s Working Well"):
+        with st.expander("✅ What’s Working Well", expanded=expanded):
             for p in positives:
                 st.success(p)
 
@@ -33,7 +43,7 @@ def render_advisor_panel(advice: dict):
     warnings = advice.get("warnings", [])
     if warnings:
         has_any_content = True
-        with st.expander("⚠️ Warnings"):
+        with st.expander("⚠️ Warnings", expanded=expanded):
             for w in warnings:
                 st.warning(w)
 
@@ -43,12 +53,50 @@ def render_advisor_panel(advice: dict):
     recs = advice.get("recommendations", [])
     if recs:
         has_any_content = True
-        with st.expander("📌 Recommendations"):
+        with st.expander("📌 Recommendations", expanded=expanded):
             for r in recs:
                 st.info(r)
 
     # -----------------------------
     # FALLBACK (ONLY if truly empty)
     # -----------------------------
-    if not has_any_content:
+    if not has_any_content and not streaming:
         st.info("Advisor insights unavailable for this scenario.")
+    elif streaming:
+        st.caption("⏳ More insights on the way…")
+    elif timed_out:
+        st.caption("Further insights will appear when you refresh the page.")
+
+
+def render_advisor_panel_streaming(job, slot, timeout: float = 15):
+    """
+    Re-draws `slot` each time the advisor job receives new items, so
+    the first insight shows up as soon as the backend produces it.
+    """
+    deadline = time.monotonic() + timeout
+    version = -1
+
+    while True:
+        advice, current = job.snapshot()
+        finished = job.done.is_set()
+
+        if current != version or finished:
+            with slot.container():
+                render_advisor_panel(
+                    advice,
+                    expanded=True,
+                    streaming=not finished,
+                )
+            version = current
+
+        remaining = deadline - time.monotonic()
+        if finished:
+            return
+        if remaining <= 0:
+            # Replace the "on the way" state; the job keeps running and
+            # its result is cached for the next rerun
+            with slot.container():
+                render_advisor_panel(advice, expanded=True, timed_out=True)
+            return
+
+        job.wait_for_update(version, remaining)
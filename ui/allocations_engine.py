@@ -1,5 +1,6 @@
 # allocation_engine.py
 
+import copy
 from typing import Dict
 #from allocation_rules import COUNTRY_RULES
 
@@ -256,14 +257,44 @@ def _uk_model(age, corpus):
 # ---------------------------------------------------------
 # PUBLIC ENGINE — BUILD MODEL
 # ---------------------------------------------------------
+# Default models depend on age only through these bands (and not on
+# the corpus), so each (country, band) is built once and copied out.
+_BAND_AGES = {"growth": None, "pre_retire": 45, "retired": SCSS_MIN_AGE}
+_model_table = {}
+
+
+def _age_band(age):
+    if age and age >= SCSS_MIN_AGE:
+        return "retired"
+    if age and age >= 45:
+        return "pre_retire"
+    return "growth"
+
+
+def build_allocation_tables():
+    """Default allocation model for every (country, age band)."""
+    for country in COUNTRY_RULES:
+        for band, age in _BAND_AGES.items():
+            _model_table[(country, band)] = _build_allocation_model(country, age)
+    return _model_table
+
+
 def build_allocation_model(country: str, age: int, corpus: float):
+    key = (country, _age_band(age))
+    model = _model_table.get(key)
+    if model is None:
+        model = _model_table[key] = _build_allocation_model(country, age)
+    return copy.deepcopy(model)
+
+
+def _build_allocation_model(country: str, age: int):
 
     if country == "IN":
-        alloc, rates = _india_model(age, corpus)
+        alloc, rates = _india_model(age, None)
     elif country == "US":
-        alloc, rates = _us_model(age, corpus)
+        alloc, rates = _us_model(age, None)
     else:
-        alloc, rates = _uk_model(age, corpus)
+        alloc, rates = _uk_model(age, None)
 
     alloc = filter_instruments_by_age(alloc, age,country)
     #print("1# - calling normalize allications with country:", country)
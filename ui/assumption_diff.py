@@ -2,9 +2,11 @@ import streamlit as st
 import pandas as pd
 
 
-def build_assumption_diff(config_base_data: list, user_data: dict):
+def build_assumption_diff(config_base_data: list, user_data: dict, impacts: dict = None):
     """
-    Compare default assumptions vs user-modified assumptions
+    Compare default assumptions vs user-modified assumptions.
+    impacts: {field: {"EndingCorpus": .., "NetIncomeAfterTax": ..}} from
+    services.attribution, added as impact columns when given.
     """
     rows = []
 
@@ -23,24 +25,28 @@ def build_assumption_diff(config_base_data: list, user_data: dict):
             delta = current - default
             pct = (delta / default * 100) if default != 0 else None
 
-            rows.append({
+            row = {
                 "Assumption": label,
                 "Default": default,
                 "Current": current,
                 "Change": delta,
                 "Change %": pct
-            })
+            }
+            if impacts is not None:
+                impact = impacts.get(key, {})
+                row["Ending Corpus Impact"] = impact.get("EndingCorpus")
+                row["Year-1 Net Income Impact"] = impact.get("NetIncomeAfterTax")
+            rows.append(row)
 
     return pd.DataFrame(rows)
 
-def render_assumption_diff_panel(base_data_config: list, user_data: dict):
-    st.subheader("🧮 Assumption Changes")
 
-    df = build_assumption_diff(
-        config_base_data=base_data_config,
-        user_data=user_data
-    )
+def render_assumption_diff_panel(base_data_config: list, user_data: dict, user: dict = None):
+    from services.api_client import analysis_available, get_attribution
 
+    st.subheader("🧮 Assumption Changes")
+
+    df = build_assumption_diff(config_base_data=base_data_config, user_data=user_data)
     if df.empty:
         st.success("You are using all default assumptions 👍")
         return
@@ -50,6 +56,16 @@ def render_assumption_diff_panel(base_data_config: list, user_data: dict):
             "These assumptions differ from the default values used by the simulator."
         )
 
+        # Impacts only as the backend computed them (/projections/attribution),
+        # so they add up to the change the Report's projections show
+        attribution = get_attribution(user_data, user)
+        if attribution is not None:
+            df = build_assumption_diff(
+                config_base_data=base_data_config,
+                user_data=user_data,
+                impacts=attribution["fields"]
+            )
+
         def highlight(row):
             return (
                 ["background-color: #e0f7fa"] * len(row)
@@ -64,12 +80,32 @@ def render_assumption_diff_panel(base_data_config: list, user_data: dict):
                 "Default": "{:,.2f}",
                 "Current": "{:,.2f}",
                 "Change": "{:+,.2f}",
-                "Change %": lambda x: f"{x:+.1f}%" if x is not None else "—"
+                "Change %": lambda x: f"{x:+.1f}%" if x is not None else "—",
+                "Ending Corpus Impact": lambda x: f"{x:+,.0f}" if pd.notna(x) else "—",
+                "Year-1 Net Income Impact": lambda x: f"{x:+,.0f}" if pd.notna(x) else "—",
             })
         )
 
         st.dataframe(styled, use_container_width=True)
 
+        if attribution is None:
+            if analysis_available("/projections/attribution"):
+                st.caption("Per-assumption impacts are not available from the projection service right now.")
+            return
+        # Nothing attributed when only app-set fields (the horizon) differ
+        if not attribution["fields"]:
+            return
+
+        total = attribution["total"]
+        st.caption(
+            f"Together these changes move your ending corpus by {total['EndingCorpus']:+,.0f} "
+            f"and year-1 net income by {total['NetIncomeAfterTax']:+,.0f}; "
+            "each impact is that assumption's share of the change."
+        )
+        residual = attribution["residual"]["EndingCorpus"]
+        if abs(residual) >= 1:
+            st.caption(f"{residual:+,.0f} of the ending-corpus change comes from several changes acting together.")
+
 def build_assumption_diff_between(
     base_data_config: list,
     left_data: dict,
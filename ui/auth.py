@@ -28,27 +28,123 @@
 
 #    return _authenticator
 
-import streamlit_authenticator as stauth
-from services.api_client import get_users_for_auth
+import json
 
-#_authenticator = None
+import requests
+import streamlit as st
+from services import session_cookie
+from services.api_client import login_user, revoke_session, validate_session
 
+# Only the signed-in user's record lives in the session; the backend
+# checks the password, so login cost does not grow with the user base.
+AUTH_SESSION_KEYS = ("authentication_status", "username", "name", "auth_user")
 
-def get_authenticator():
-    #global _authenticator
+# The session token /auth/login returns is kept in an HttpOnly cookie
+# (set by server.py, see services/session_cookie.py), so a refresh or a
+# new tab signs the user back in (restore_session).
+SESSION_COOKIE = session_cookie.SESSION_COOKIE
+SESSION_COOKIE_DAYS = session_cookie.SESSION_COOKIE_DAYS
 
-   # if _authenticator is None:
 
-        users_config = get_users_for_auth()
+def _sign_in(user: dict, username: str):
+    st.session_state.authentication_status = True
+    st.session_state.username = user.get("username", username)
+    st.session_state.name = user.get("name")
+    st.session_state.auth_user = user
 
-        #for username, data in users_config["credentials"]["usernames"].items():
-            #print("DEBUG USER:", username, "PASSWORD:", data.get("password"))
-      #  _authenticator = stauth.Authenticate(
-        return stauth.Authenticate(
-            users_config["credentials"],
-            users_config["cookie"]["name"],
-            users_config["cookie"]["key"],
-            users_config["cookie"]["expiry_days"],
-        )
 
-    #return _authenticator
+def login_with_backend(username: str, password: str) -> bool:
+    """Sign in; raises requests.RequestException when the backend cannot answer."""
+    user = login_user(username.strip(), password)
+
+    if not user:
+        st.session_state.authentication_status = False
+        return False
+
+    token = user.pop("session_token", None)
+    _sign_in(user, username.strip())
+    if token:
+        st.session_state._session_token = token
+        _set_cookie(token, SESSION_COOKIE_DAYS * 86400)
+    return True
+
+
+def logout():
+    token = st.session_state.get("_session_token")
+    if token:
+        try:
+            revoke_session(token)
+        except requests.RequestException as e:
+            # The cookie is still cleared below; the token lapses on expiry
+            print(f"[auth] session revoke failed: {e}")
+    st.session_state._session_token = None
+
+    for k in AUTH_SESSION_KEYS:
+        st.session_state[k] = None
+    _set_cookie(None, 0)
+    # The cookie this page was loaded with must not sign the user back in
+    st.session_state._session_restored = True
+
+
+def restore_session():
+    """Once per browser session: sign in from the session cookie if it is still valid."""
+    if st.session_state.get("_session_restored"):
+        return
+    st.session_state._session_restored = True
+
+    if st.session_state.get("authentication_status") is True:
+        return
+    token = st.context.cookies.get(SESSION_COOKIE)
+    if not isinstance(token, str) or not token:
+        return
+
+    try:
+        user = validate_session(token)
+    except requests.RequestException as e:
+        print(f"[auth] session check failed: {e}")
+        return
+    if user is None:
+        _set_cookie(None, 0)
+        return
+
+    st.session_state._session_token = token
+    _sign_in(user, user.get("username", ""))
+    st.session_state.view = "app"
+
+
+def _set_cookie(token, max_age: float):
+    """Queue setting (token) or clearing (None) the session cookie for sync_session_cookie."""
+    # Sent on the next run; a write queued just before st.rerun() would
+    # otherwise never reach the browser. The token itself stays on the
+    # server: the browser only ever sees a one-time nonce for it.
+    st.session_state._pending_cookie = session_cookie.stage(token, max_age) if token else ""
+    st.session_state._cookie_writes = st.session_state.get("_cookie_writes", 0) + 1
+
+
+def sync_session_cookie():
+    """Have server.py set (or clear) the session cookie if a login or logout queued it."""
+    pending = st.session_state.get("_pending_cookie")
+    if pending is None:
+        return
+
+    from streamlit_javascript import st_javascript
+
+    nonce = pending
+    if nonce:
+        options = "method: 'POST', headers: {'Content-Type': 'application/json'}, body: " + json.dumps(
+            json.dumps({"nonce": nonce})
+        )
+    else:
+        options = "method: 'DELETE'"
+    js = (
+        f"await fetch('{session_cookie.COOKIE_ROUTE}', {{{options}, credentials: 'same-origin'}})"
+        ".then(r => r.ok ? 'ok' : 'status ' + r.status, e => 'error ' + e)"
+    )
+    result = st_javascript(js, key=f"session_cookie_{st.session_state._cookie_writes}")
+    if result == "ok":
+        st.session_state._pending_cookie = None
+    elif isinstance(result, str) and result:
+        # No cookie route (app.py served without server.py) or an expired
+        # nonce: the session just does not outlive this tab
+        print(f"[auth] session cookie not {'set' if nonce else 'cleared'}: {result}")
+        st.session_state._pending_cookie = None
@@ -1,7 +1,7 @@
-import streamlit as st
 import requests
-from ui.auth import get_authenticator
-from services.api_client import BACKEND_BASE_URL
+import streamlit as st
+from ui.auth import login_with_backend
+from services.api_client import register_user
 
 
 # ================================
@@ -13,9 +13,22 @@ def render_login():
 
     st.info("👉 Username is your email ID without '@domain'\n\nExample: testuser@gmail.com → username = testuser")
 
-    authenticator = get_authenticator()
-    #print("Authenticator instance in login:", authenticator)  # Debug print
-    authenticator.login(location="main")
+    with st.form("login_form"):
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        submitted = st.form_submit_button("Login")
+
+    if submitted:
+        if not username or not password:
+            st.error("Username and password required")
+        else:
+            try:
+                login_with_backend(username, password)
+            except requests.RequestException as e:
+                # Backend down or erroring (5xx): not the user's credentials
+                print(f"[auth] login failed: {e}")
+                st.session_state.authentication_status = None
+                st.error("We couldn't reach the login service. Please try again in a moment.")
 
     if st.session_state.authentication_status is True:
         st.session_state.view = "app"
@@ -46,23 +59,13 @@ def render_register():
             st.error("All fields required")
             return
 
-        resp = requests.post(
-            f"{BACKEND_BASE_URL}/auth/register",
-            json={
-                "name": name,
-                "email": email,
-                "password": password
-            }
-        )
+        resp = register_user(name, email, password)
 
         if resp.status_code != 200:
             st.error(resp.text)
             return
 
         st.success("Account created. Please login.")
-        #import auth  # your auth.py module
-
-        #auth._authenticator = None   # reset cached authenticator
         #st.session_state.authentication_status = None
         st.session_state.clear()  # Clear all session state to reset authentication
         st.session_state.view = "login"
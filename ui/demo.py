@@ -0,0 +1,119 @@
+import os
+import time
+
+from services.metrics import inc, set_gauge
+
+# -------------------------------------------------------------------
+# Precomputed demo
+# -------------------------------------------------------------------
+# Until a guest edits something, every guest in a country has the same
+# inputs (config defaults, 2-year horizon), so they all send the same
+# projection payload and draw the same Report. Projections, figures,
+# chart HTML and PDFs are cached by their inputs (services.shared_cache),
+# so precomputing the demo is running those exact inputs once per
+# country before the first guest arrives. A guest who changes an input
+# produces new cache keys and is computed as before.
+#
+# Pages also write a few derived fields as a guest looks around (the
+# Profile page stores the gender default, the Expenses page the annual
+# expense totals), so an untouched demo is one of four input sets per
+# country. All four are precomputed.
+#
+# Run by the startup warm-up (services.startup); DEMO_PRECOMPUTE=0
+# turns it off.
+DEMO_COUNTRIES = ("IN", "US", "UK")
+DEMO_PDF_YEARS = 2
+DEMO_PRECOMPUTE = os.getenv("DEMO_PRECOMPUTE", "1") == "1"
+
+_ready = {}     # country -> seconds taken
+
+
+def demo_user_data(country: str) -> dict:
+    """A fresh guest's user_data, hydrated exactly as run_simulator does it."""
+    from services.api_client import get_config
+    from ui.base_data import hydrate_initial_corpus_defaults
+    from ui.investment_plan import ensure_scenarios
+    from ui.simulator import apply_guest_defaults
+
+    user_data = {"country": country}
+    apply_guest_defaults(user_data, get_config(country))
+    hydrate_initial_corpus_defaults(user_data, country)
+    ensure_scenarios(user_data.setdefault("investment_plan", {}), country)
+    return user_data
+
+
+def _profile_fields(user_data: dict) -> dict:
+    # render_base_data's default
+    return {"GLGender": {"input": "Male"}}
+
+
+def _expense_fields(user_data: dict) -> dict:
+    # Annual totals as the recurring expenses page stores them
+    must_yearly = 0.0
+    optional_yearly = 0.0
+    for name, data in user_data["recurring_expenses"][user_data["country"]].items():
+        annual = data.get("monthly", 0) * 12
+        if name.endswith("Opt"):
+            optional_yearly += annual
+        else:
+            must_yearly += annual
+    return {
+        "AnnualMustExpenses": {"input": round(must_yearly, 2)},
+        "AnnualOptionalExpenses": {"input": round(optional_yearly, 2)},
+    }
+
+
+def demo_variants(country: str) -> list:
+    """Every untouched-demo user_data: fresh, after Profile, after Expenses, after both."""
+    base = demo_user_data(country)
+    profile, expenses = _profile_fields(base), _expense_fields(base)
+    return [
+        base,
+        {**base, **profile},
+        {**base, **expenses},
+        {**base, **profile, **expenses},
+    ]
+
+
+def precompute_demo(country: str):
+    """Projections, figures, advice and the sample PDF for one country's demo."""
+    from services.api_client import calculate_projections
+    from services.startup import wait_for_browser_provisioning
+    from ui.simulator import get_user_context
+    from ui.summary import warm_report_cache
+
+    started = time.perf_counter()
+    user = get_user_context(is_guest=True)
+    variants = demo_variants(country)
+    results = [calculate_projections(user_data, user) for user_data in variants]
+
+    wait_for_browser_provisioning()
+    errors = []
+    for user_data, result in zip(variants, results):
+        # A PDF failure (e.g. no Chromium) still leaves the figures warm
+        try:
+            warm_report_cache(result, user_data, user, pdf_years=DEMO_PDF_YEARS)
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+    _ready[country] = time.perf_counter() - started
+    set_gauge("ffs_demo_ready", 1, country=country)
+    print(f"[demo] {country} precomputed in {_ready[country] * 1000:.0f} ms")
+
+
+def precompute_all(countries=DEMO_COUNTRIES):
+    """Precompute every demo country; failures are logged, not raised."""
+    for country in countries:
+        try:
+            precompute_demo(country)
+        except Exception as e:
+            # The guest who gets here first computes it instead
+            inc("ffs_demo_precompute_failures_total", country=country)
+            print(f"[demo] precompute failed for {country}: {e}")
+
+
+def demo_ready() -> dict:
+    """{country: seconds it took} for every demo precomputed so far."""
+    return dict(_ready)
@@ -0,0 +1,72 @@
+import streamlit as st
+
+# label -> services.goal_seek goal
+GOALS = {
+    "Max monthly withdrawal": "max_withdrawal",
+    "Min starting corpus": "min_corpus",
+    "Latest year for a one-time expense": "latest_expense_year",
+}
+
+
+def render_goal_seek(user_data: dict, user: dict, scenario: dict, currency: str):
+    """Solve for a withdrawal, corpus or expense year on the backend (/projections/solve)."""
+    from services.api_client import analysis_available, solve_goal
+    from services.goal_seek import INFEASIBLE, UNBOUNDED
+
+    # Hidden when the backend has no solver: there is no other source
+    # of numbers that match the projections shown around it
+    if not analysis_available("/projections/solve"):
+        return
+
+    with st.expander("🎯 Solve for a target"):
+        st.caption("Instead of trying values by hand, find the limit that keeps your corpus above zero for the whole plan.")
+
+        label = st.radio("Find", list(GOALS), horizontal=True, key="goal_seek_goal")
+        goal = GOALS[label]
+        amount = None
+        if goal == "latest_expense_year":
+            amount = st.number_input(
+                f"One-time expense ({currency})",
+                min_value=0.0,
+                step=10000.0,
+                value=100000.0,
+                key="goal_seek_amount",
+            )
+
+        if not st.button("Solve", key="goal_seek_solve"):
+            return
+
+        result = solve_goal(user_data, user, scenario, goal, amount)
+        if result is None:
+            if analysis_available("/projections/solve"):
+                st.caption("Solving is not available from the projection service right now.")
+            else:
+                st.caption("This projection service does not offer solving.")
+            return
+
+        horizon = f"{result['years']} years"
+        status, value = result["status"], result["value"]
+
+        if goal == "max_withdrawal":
+            if status == INFEASIBLE:
+                st.warning(f"Your expenses alone exhaust the corpus within {horizon}.")
+            elif status == UNBOUNDED:
+                st.success(f"Your income covers any withdrawal we tried for the full {horizon}.")
+            else:
+                st.success(f"Up to **{currency}{value:,.0f} / month** lasts the full {horizon}.")
+        elif goal == "min_corpus":
+            if status == INFEASIBLE:
+                st.warning("No starting corpus covers these expenses at the current rates.")
+            else:
+                st.success(
+                    f"A starting corpus of **{currency}{value:,.0f}** lasts the full {horizon} "
+                    f"(you have {currency}{result['corpus']:,.0f})."
+                )
+        else:
+            if status == INFEASIBLE:
+                st.warning(f"{currency}{amount:,.0f} cannot be spent in any year without running out within {horizon}.")
+            else:
+                st.success(
+                    f"The latest you can spend {currency}{amount:,.0f} is **year {value}** "
+                    f"(age {result['start_age'] + value - 1})."
+                )
@@ -10,6 +10,7 @@ from ui import scenario
 #from ui import scenario
 from ui.currency import get_currency
 from ui.expense_summary import render_expense_summary
+from ui.stale_notice import render_stale_notice
 
 from ui.allocations_engine import (
     build_allocation_model,
@@ -812,6 +813,10 @@ def render_investment_plan(user_data: dict, user: dict):
                 f"📅 Yearly: {currency}{scenario['withdrawal']['monthly'] * 12:,.0f}"
             )
 
+            from ui.goal_seek import render_goal_seek
+
+            render_goal_seek(user_data, user, scenario, currency)
+
         st.divider()
 
     with ui_section("Lifestyle Cost Context", "🏡"):
@@ -1177,6 +1182,7 @@ def render_investment_plan(user_data: dict, user: dict):
 
 
         result = calculate_projections(user_data, user)
+        render_stale_notice(result)
 
         #result = calculate_projections(user_data, user)
 
@@ -1679,6 +1685,7 @@ def render_investment_plan_mobile_old_working(user_data: dict, user: dict):
         scenario["allocations"]["SCSS"] = 0 if age is None or age < SCSS_MIN_AGE else scenario["allocations"]["SCSS"]
 
         result = calculate_projections(user_data, user)
+        render_stale_notice(result)
         active_res = result.get("active_result", {})
         projections = active_res.get("projections", [])
 
@@ -1998,6 +2005,7 @@ def render_investment_plan_mobile_old_working_redesigned(user_data: dict, user:
 
     # ---- Calculate Math ----
     result = calculate_projections(user_data, user)
+    render_stale_notice(result)
     active_res = result.get("active_result", {})
     projections = active_res.get("projections", [])
 
@@ -2210,6 +2218,10 @@ def render_investment_plan_mobile(user_data: dict, user: dict):
         scenario["withdrawal"]["monthly"] = st.session_state[wd_key]
         st.caption(f"📅 Yearly Impact: **{currency}{scenario['withdrawal']['monthly'] * 12:,.0f}**")
 
+        from ui.goal_seek import render_goal_seek
+
+        render_goal_seek(user_data, user, scenario, currency)
+
     # =========================================================
     # 4. INVESTMENT ALLOCATION (TILE GRID & CUSTOM ASSETS)
     # =========================================================
@@ -2369,6 +2381,7 @@ def render_investment_plan_mobile(user_data: dict, user: dict):
 
     # ---- Calculate Math ----
     result = calculate_projections(user_data, user)
+    render_stale_notice(result)
     active_res = result.get("active_result", {})
     projections = active_res.get("projections", [])
 
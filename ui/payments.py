@@ -1,6 +1,57 @@
 import streamlit as st
-import time
-from services.api_client import create_payment_order, get_entitlement
+from services.api_client import create_payment_order
+from services.payment_status import (
+    PAID,
+    PENDING,
+    forget_payment,
+    payment_status,
+    watch_payment,
+)
+
+PAYMENT_CHECK_SECONDS = 2
+
+
+@st.fragment(run_every=PAYMENT_CHECK_SECONDS)
+def _render_payment_confirmation(order_id: str, username: str):
+    """
+    Reads the shared watcher's in-memory status; only this fragment
+    refreshes while waiting, and the full app reruns once it settles
+    (paid, failed or expired), which also stops this fragment.
+    """
+    status = payment_status(order_id)
+
+    if status is None:
+        if st.session_state.get("pending_order_id") != order_id:
+            # Already settled; the full rerun is on its way
+            return
+        # Watcher lost the order (server restart) — pick it up again
+        watch_payment(order_id, username)
+        status = PENDING
+
+    if status == PENDING:
+        st.info("After completing payment, please wait for confirmation...")
+        return
+
+    forget_payment(order_id)
+    st.session_state.pending_order_id = None
+    st.session_state.payment_in_progress = False
+    st.session_state.payment_result = status
+
+    if status == PAID:
+        st.session_state.view = "app"
+    st.rerun()
+
+
+def _render_payment_result(status: str):
+    if status == PAID:
+        st.success("🎉 Payment confirmed! Premium activated.")
+        st.balloons()
+    else:
+        st.warning(
+            "Payment not confirmed yet.\n\n"
+            "If you've paid, it may take a few seconds to reflect. "
+            "You can safely refresh this page."
+        )
 
 
 def render_payments(username: str):
@@ -77,26 +128,13 @@ def render_payments(username: str):
 
         st.components.v1.html(checkout_html, height=520)
 
-        st.info("After completing payment, please wait for confirmation...")
+        # ---- Confirmation (UX only; webhook is authority) ----
+        st.session_state.pending_order_id = order_id
+        watch_payment(order_id, username)
 
-        # ---- Poll entitlement (UX only; webhook is authority) ----
-        for _ in range(30):
-            time.sleep(2)
-            entitlement = get_entitlement(username)
+    result = st.session_state.pop("payment_result", None)
+    if result:
+        _render_payment_result(result)
 
-            if entitlement.get("is_premium"):
-                st.success("🎉 Payment confirmed! Premium activated.")
-                st.balloons()
-
-                # Reset state
-                st.session_state.payment_in_progress = False
-                st.session_state.view = "app"
-                st.rerun()
-
-        st.warning(
-            "Payment not confirmed yet.\n\n"
-            "If you've paid, it may take a few seconds to reflect. "
-            "You can safely refresh this page."
-        )
-
-        st.session_state.payment_in_progress = False
+    if st.session_state.get("pending_order_id"):
+        _render_payment_confirmation(st.session_state.pending_order_id, username)
@@ -5,6 +5,7 @@ import pandas as pd
 import tempfile
 
 from streamlit import html, pdf
+from services.metrics import span
 
 from streamlit import pdf
 
@@ -212,7 +213,6 @@ def generate_financial_summary_pdf_old(
 
 ##NOTE: The above function is the old version. The new version is more modular and supports additional features like charts and scenario comparisons. The old version is kept for reference and can be removed if not needed.
 
-import asyncio
 import datetime
 import pandas as pd
 from playwright.async_api import async_playwright
@@ -663,68 +663,72 @@ async def generate_pdf(html_file, output_pdf):
     async with async_playwright() as p:
         browser = await p.chromium.launch()
         page = await browser.new_page()
-
-        # Load file
-        #-await page.goto(f"file://{html_file}", wait_until="networkidle")
-        await page.set_content(html_file, wait_until="networkidle")
-
-
-        # Render like browser (NOT print)
-        await page.emulate_media(media="screen")
-
-        # Wait for charts / JS
-        await page.wait_for_timeout(2000)
-
-        # Fix pagination + clipping
-        await page.add_style_tag(content="""
-        * {
-            page-break-inside: avoid !important;
-            break-inside: avoid !important;
-        }
-
-        .chart-container, canvas, .plotly {
-            overflow: visible !important;
-            height: auto !important;
-            min-height: 400px !important;
-        }
-        """)
-
-        # Generate PDF
-        pdf_bytes = await page.pdf(
-            format="A4",
-            print_background=True,
-            prefer_css_page_size=True,
-            display_header_footer=True,
-            margin={"top":"15mm","bottom":"15mm","left":"10mm","right":"10mm"},
-            header_template="""
-            <div style="
-                width:100%;
-                font-size:20px;
-                padding:0 20px;
-                color:#6b7280;
-                text-align:center;
-                border-bottom:1px solid #e5e7eb;
-            ">
-                Retirement Financial Summary · Future Finance Simulator
-            </div>
-            """,
-            footer_template="""
-            <div style="
-                width:100%;
-                font-size:15px;
-                padding:0 20px;
-                color:#9ca3af;
-                text-align:right;
-            ">
-                Page <span class="pageNumber"></span> of <span class="totalPages"></span>
-            </div>
-            """
-        )
-        
+        pdf_bytes = await _render_pdf_page(page, html_file)
         await browser.close()
         #print(f"DEBUG: PDF generated and saved to {output_pdf}")
         return pdf_bytes
 
+
+async def _render_pdf_page(page, html_file):
+    """Lay out the report HTML on an open page and print it to PDF bytes."""
+    # Load file
+    #-await page.goto(f"file://{html_file}", wait_until="networkidle")
+    await page.set_content(html_file, wait_until="networkidle")
+
+
+    # Render like browser (NOT print)
+    await page.emulate_media(media="screen")
+
+    # Wait for charts / JS
+    await page.wait_for_timeout(2000)
+
+    # Fix pagination + clipping
+    await page.add_style_tag(content="""
+    * {
+        page-break-inside: avoid !important;
+        break-inside: avoid !important;
+    }
+
+    .chart-container, canvas, .plotly {
+        overflow: visible !important;
+        height: auto !important;
+        min-height: 400px !important;
+    }
+    """)
+
+    # Generate PDF
+    pdf_bytes = await page.pdf(
+        format="A4",
+        print_background=True,
+        prefer_css_page_size=True,
+        display_header_footer=True,
+        margin={"top":"15mm","bottom":"15mm","left":"10mm","right":"10mm"},
+        header_template="""
+        <div style="
+            width:100%;
+            font-size:20px;
+            padding:0 20px;
+            color:#6b7280;
+            text-align:center;
+            border-bottom:1px solid #e5e7eb;
+        ">
+            Retirement Financial Summary · Future Finance Simulator
+        </div>
+        """,
+        footer_template="""
+        <div style="
+            width:100%;
+            font-size:15px;
+            padding:0 20px;
+            color:#9ca3af;
+            text-align:right;
+        ">
+            Page <span class="pageNumber"></span> of <span class="totalPages"></span>
+        </div>
+        """
+    )
+    return pdf_bytes
+
 from playwright.sync_api import sync_playwright
 
 def _html_to_pdf_bytes(html: str) -> bytes:
@@ -849,29 +853,34 @@ def generate_financial_summary_pdf_playwright(
     expense_growth_chart_html: str = "",
 ):
     #print("DEBUG 2: Building HTML for PDF...")
-    html = build_financial_html(
-        username,
-        base_context,
-        projection_df,
-        currency,
-        retirement_score=retirement_score,
-        score_breakdown=score_breakdown,
-        advisor_advice=advisor_advice,
-        income_expense_chart_html=income_expense_chart_html,
-        corpus_chart_html=corpus_chart_html,
-        tax_chart_html=tax_chart_html,
-        scenario_comparison_df=scenario_comparison_df,
-        onetime_chart_html=onetime_chart_html,
-        recurring_chart_html=recurring_chart_html,
-        expense_growth_chart_html=expense_growth_chart_html,
-    )
+    with span("pdf_build_html"):
+        html = build_financial_html(
+            username,
+            base_context,
+            projection_df,
+            currency,
+            retirement_score=retirement_score,
+            score_breakdown=score_breakdown,
+            advisor_advice=advisor_advice,
+            income_expense_chart_html=income_expense_chart_html,
+            corpus_chart_html=corpus_chart_html,
+            tax_chart_html=tax_chart_html,
+            scenario_comparison_df=scenario_comparison_df,
+            onetime_chart_html=onetime_chart_html,
+            recurring_chart_html=recurring_chart_html,
+            expense_growth_chart_html=expense_growth_chart_html,
+        )
     #with open("debug.html", "w") as f:
     #    f.write(html)
 
     # return _html_to_pdf_bytes(html)
     # generate_pdf(html, "output.pdf")
     #print("DEBUG: Starting PDF generation...")
-    return asyncio.run(generate_pdf(html, "output.pdf"))
+    # Rendered on the shared, already-running browser (services.browser_pool)
+    with span("pdf_render"):
+        from services import browser_pool
+
+        return browser_pool.render(lambda page: _render_pdf_page(page, html))
 
 #from weasyprint import HTML
 #import datetime
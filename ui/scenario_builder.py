@@ -4,7 +4,7 @@ import pandas as pd
 
 from services.api_client import calculate_projections
 from ui.charts import plot_income_vs_expenses
-from ui.assumption_diff import render_assumption_diff_between, extract_diffs
+from ui.assumption_diff import render_assumption_diff_between
 from ui.scenario_engine import apply_scenario_diff
 
 
@@ -0,0 +1,53 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+
+def build_tornado_figure(rows: list, labels: dict, delta: float):
+    """Horizontal bars: ending-corpus change with each assumption moved -delta / +delta."""
+    rows = rows[::-1]   # largest swing on top
+    names = [labels.get(r["driver"], r["driver"]) for r in rows]
+    fig = go.Figure()
+    fig.add_bar(y=names, x=[r["low"] for r in rows], orientation="h",
+                name=f"−{delta:g} pt", marker_color="#ef4444")
+    fig.add_bar(y=names, x=[r["high"] for r in rows], orientation="h",
+                name=f"+{delta:g} pt", marker_color="#22c55e")
+    fig.update_layout(
+        barmode="overlay",
+        xaxis_title="Change in ending corpus",
+        legend=dict(orientation="h", y=-0.2),
+    )
+    return fig
+
+
+def render_sensitivity(user_data: dict, user: dict, currency: str, is_mobile: bool = False):
+    """Tornado chart of the active scenario's ending corpus over SCENARIO_ASSUMPTIONS (/projections/sensitivity)."""
+    from services.api_client import analysis_available, get_config, get_sensitivity
+    from services.metrics import span
+    from ui.scenario_builder import SCENARIO_ASSUMPTIONS
+    from ui.summary import cached_figure
+
+    with span("sensitivity"):
+        result = get_sensitivity(user_data, user, SCENARIO_ASSUMPTIONS)
+    if result is None:
+        # Left out entirely when the backend has no sensitivity endpoint
+        if analysis_available("/projections/sensitivity"):
+            st.caption("Sensitivity is not available from the projection service right now.")
+        return
+
+    if not result["rows"]:
+        st.info("None of the market assumptions affect this plan.")
+        return
+
+    base_data = get_config(user_data.get("country", "IN"))["base_data"]
+    labels = {f["Field Name"]: f.get("Field Description") or f["Field Name"] for f in base_data}
+    top = result["rows"][0]
+    swing = max(abs(top["low"]), abs(top["high"]))
+    st.caption(
+        f"Moving **{labels.get(top['driver'], top['driver'])}** by {result['delta']:g} percentage point "
+        f"shifts your ending corpus by up to {currency}{swing:,.0f}."
+    )
+
+    with span("build_figures"):
+        fig = cached_figure(build_tornado_figure, result["rows"], labels, result["delta"])
+    fig.update_layout(height=320 if is_mobile else 420, margin=dict(l=0, r=0, t=20, b=0))
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,20 +1,20 @@
 import streamlit as st
-import pandas as pd
 from streamlit_option_menu import option_menu
 from ui.base_data import hydrate_initial_corpus_defaults
 from services.api_client import (
     get_config,
     get_user_data,
     save_user_data,
-    get_entitlement,
+    get_entitlement_cached,
     calculate_projections
 )
 from ui.base_data import render_base_data, render_base_data_mobile
-from ui.payments import render_payments
-from ui.investment_plan import ensure_scenarios
-from ui.expenses import render_expenses
-from ui.investment_plan import render_investment_plan,render_investment_plan_mobile
-from ui.summary import render_summary,render_summary_mobile
+from services.metrics import span, set_rerun_page
+from services.profiler import profile_rerun, profiling_requested, render_profiler_controls
+from ui.speculation import on_rerun, speculate_report
+
+# Page modules below pull in pandas / plotly / playwright / fpdf, so
+# they are imported inside the page branch that needs them.
 
 # -------------------------------------------------------------------
 # User Context Resolver (SAFE)
@@ -28,7 +28,8 @@ def get_user_context(is_guest: bool):
         }
 
     username = st.session_state.get("username")
-    entitlement = get_entitlement(username)
+    with span("get_entitlement"):
+        entitlement = get_entitlement_cached(username)
 
     return {
         "username": username,
@@ -214,6 +215,35 @@ def apply_defaults_from_config(
     # ---------------------------------------------------------
     user_data.setdefault("_defaults_applied", True)
 
+def apply_guest_defaults(user_data: dict, config: dict):
+    """Guest: always deterministic fresh state, capped at a 2-year horizon."""
+    apply_defaults_from_config(
+        user_data,
+        {
+            "base_data": config["base_data"],
+            "onetime_expenses": config["onetime_expenses"],
+            "recurring_expenses": config["recurring_expenses"],
+            "investment_plan": config["investment_plan"],
+        },
+        force=True
+    )
+    user_data.setdefault("GLProjectionYears", {"input": 2})
+    user_data["GLProjectionYears"]["input"] = min(
+        user_data["GLProjectionYears"]["input"], 2
+    )
+
+def report_inputs(user_data: dict, config: dict, user: dict) -> dict:
+    """A copy of user_data prepared exactly as the next Report rerun will send it."""
+    import copy
+    from ui.investment_plan import ensure_scenarios
+
+    data = copy.deepcopy(user_data)
+    if user["is_guest"]:
+        apply_guest_defaults(data, config)
+    hydrate_initial_corpus_defaults(data, data["country"])
+    ensure_scenarios(data.setdefault("investment_plan", {}), data.get("country", "IN"))
+    return data
+
 def default_investment_scenario(country: str) -> dict:
     """
     Country-aware base investment defaults
@@ -456,18 +486,23 @@ def render_welcome_page_mobile_old():
 # MAIN SIMULATOR
 # -------------------------------------------------------------------
 def run_simulator(is_guest: bool = False):
+    # Admins can capture a stack profile of one rerun (?profile=1)
+    admin_check = {"is_guest": is_guest, "username": st.session_state.get("username")}
+    render_profiler_controls(admin_check)
+
+    if profiling_requested(admin_check):
+        with profile_rerun(st.session_state.get("page", "Home")):
+            _run_simulator(is_guest)
+    else:
+        _run_simulator(is_guest)
+
+
+def _run_simulator(is_guest: bool):
     # ==========================================================
     # 1. USER CONTEXT
     # ==========================================================
-    #is_mobile = st.session_state.is_mobile
-    # Simple mobile detection using query params fallback
-    is_mobile = st.session_state.get("is_mobile", False)
-
     user = get_user_context(is_guest)
 
-    # A free user is someone who is logged in (not a guest) but hasn't paid
-    is_registered_free = not user["is_guest"] and not user["is_premium"]
-
     # ---------------- Sidebar ----------------
     if user["is_guest"]:
         st.sidebar.title("Demo Mode")
@@ -491,7 +526,8 @@ def run_simulator(is_guest: bool = False):
             st.session_state.user_data = {}
         else:
             print(f"Loading user data for '{user['username']}' from backend...")
-            st.session_state.user_data = get_user_data(user["username"]) or {}
+            with span("get_user_data"):
+                st.session_state.user_data = get_user_data(user["username"]) or {}
 
     user_data = st.session_state.user_data
 
@@ -505,7 +541,8 @@ def run_simulator(is_guest: bool = False):
     # ==========================================================
     # 3. LOAD CONFIG (country-aware)
     # ==========================================================
-    config = get_config(country)
+    with span("get_config"):
+        config = get_config(country)
     #print("COMFIG ",config["investment_plan"])
 
     #def prune_by_config(container: dict, valid_keys: set):
@@ -585,21 +622,7 @@ def run_simulator(is_guest: bool = False):
     #    user_data.clear()
         user_data.setdefault("country", country)
         #user_data["country"] = country
-        # Guest: always deterministic fresh state
-        apply_defaults_from_config(
-            user_data,
-            {
-                "base_data": config["base_data"],
-                "onetime_expenses": config["onetime_expenses"],
-                "recurring_expenses": config["recurring_expenses"],
-                "investment_plan": config["investment_plan"],
-            },
-            force=True
-        )
-        user_data.setdefault("GLProjectionYears", {"input": 2})
-        user_data["GLProjectionYears"]["input"] = min(
-            user_data["GLProjectionYears"]["input"], 2
-        )
+        apply_guest_defaults(user_data, config)
     else:
         # Logged-in user: hydrate only once per DB record
         #print("I am here")
@@ -684,6 +707,8 @@ def run_simulator(is_guest: bool = False):
         st.rerun()
 
     page = st.session_state.page
+    set_rerun_page(page)
+    on_rerun(page)
     #pages = [
     #    "Welcome",
     #    "Your Financial Profile",
@@ -763,10 +788,18 @@ def run_simulator(is_guest: bool = False):
             # -------------------------------------------------
             # ENSURE SCENARIOS EXIST (CRITICAL – SINGLE PLACE)
             # -------------------------------------------------
+            from ui.investment_plan import ensure_scenarios
+
             plan = user_data.setdefault("investment_plan", {})
-            ensure_scenarios(plan, user_data.get("country", "IN"))
+            with span("ensure_scenarios"):
+                ensure_scenarios(plan, user_data.get("country", "IN"))
+
+            with span("calculate_projections"):
+                result = calculate_projections(user_data, user)
 
-            result = calculate_projections(user_data, user)
+            from ui.stale_notice import render_stale_notice
+
+            render_stale_notice(result)
 
             active = result.get("active_result", {})
             projections = active.get("projections", [])
@@ -806,6 +839,29 @@ def run_simulator(is_guest: bool = False):
     # ==========================================================
     # 8. PAGE RENDERING (PURE UI)
     # ==========================================================
+    with span("render_page"):
+        complete = _render_page(page, config, user_data, user, projections, base_context, result if page == "Report" else None)
+
+    # Report is usually next: precompute it once the user goes idle here
+    if page == "Strategy":
+        speculate_report(user_data, user, lambda: report_inputs(user_data, config, user))
+
+    # ==========================================================
+    # 9. SAVE USER DATA (ONLY AFTER FULL HYDRATION)
+    # ==========================================================
+    if not user["is_guest"] and complete:
+        #print(f"Saving user data for '{user['username']}' with keys: {list(user_data.keys())}")
+        #print(" From Simulatoe savinbg session states user data : ", st.session_state.user_data)
+        with span("save_user_data"):
+            save_user_data(user["username"], st.session_state.user_data)
+
+
+def _render_page(page, config, user_data, user, projections, base_context, result):
+    """Render one page; False if it stopped early because inputs are incomplete."""
+    is_mobile = st.session_state.get("is_mobile", False)
+
+    # A free user is someone who is logged in (not a guest) but hasn't paid
+    is_registered_free = not user["is_guest"] and not user["is_premium"]
     
     #    st.markdown(config["about"])
     if page == "Home":
@@ -821,7 +877,8 @@ def run_simulator(is_guest: bool = False):
             render_base_data(config["base_data"], user_data, user)
 
     elif page == "Expenses":
-        
+        from ui.expenses import render_expenses
+
         render_expenses(config=config, user_data=user_data, user=user)
 
     elif page == "Strategy" or page == "Report":
@@ -833,6 +890,8 @@ def run_simulator(is_guest: bool = False):
             with st.container(border=True):
                 st.markdown("<h4 style='text-align: center;'>Unlock Your Future</h4>", unsafe_allow_html=True)
                 if st.button("⭐ Upgrade to Premium Now", type="primary", use_container_width=True):
+                    from ui.payments import render_payments
+
                     # Trigger your Razorpay payment modal/flow here
                     st.write("Redirecting to secure payment...")
                     render_payments(user["username"])
@@ -841,15 +900,18 @@ def run_simulator(is_guest: bool = False):
             st.stop()
         else:
             if page == "Strategy":
+                from ui.investment_plan import render_investment_plan, render_investment_plan_mobile
+
                 if is_mobile:
                     render_investment_plan_mobile(user_data=user_data, user=user)
                 else:
                     render_investment_plan(user_data=user_data, user=user)
             elif page == "Report":
-                
+                from ui.summary import render_summary, render_summary_mobile
+
                 if not projections or not base_context:
                     st.warning("Please complete inputs to view summary.")
-                    return
+                    return False
                 if is_mobile:
                         render_summary_mobile(
                             projections=projections,
@@ -870,12 +932,8 @@ def run_simulator(is_guest: bool = False):
                     )
 
     elif page == "Upgrade":
+        from ui.payments import render_payments
+
         render_payments(user["username"])
 
-    # ==========================================================
-    # 9. SAVE USER DATA (ONLY AFTER FULL HYDRATION)
-    # ==========================================================
-    if not user["is_guest"]:
-        #print(f"Saving user data for '{user['username']}' with keys: {list(user_data.keys())}")
-        #print(" From Simulatoe savinbg session states user data : ", st.session_state.user_data)
-        save_user_data(user["username"], st.session_state.user_data)
+    return True
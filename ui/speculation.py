@@ -0,0 +1,153 @@
+import os
+import threading
+from collections import OrderedDict
+
+from services import shared_cache
+from services.metrics import inc
+
+# -------------------------------------------------------------------
+# Speculative Report precompute
+# -------------------------------------------------------------------
+# Users nearly always go from Strategy to Report. Once a Strategy rerun
+# has finished and no widget changes for SPECULATIVE_IDLE_SECONDS, the
+# Report's projections and figures for the current inputs are built in
+# the background into the shared caches, so the Report tab opens from
+# cache. The advisor (a paid LLM call) and the PDF are left to the
+# Report itself: a guess that the user goes there must not cost money.
+#
+# Each session has at most one job, keyed by its live inputs; the
+# inputs are copied only when a job for a new key is created. Any rerun
+# restarts the idle timer of a job that has not started; leaving
+# Strategy, or inputs that differ from the job's, cancel it. A cancelled
+# job stops at its next stage boundary; whatever it had already computed
+# is keyed by the old inputs and simply goes unused. Inputs a job has
+# already finished for are not speculated on again. SPECULATION=0
+# turns it off.
+SPECULATIVE_IDLE_SECONDS = float(os.getenv("SPECULATIVE_IDLE_SECONDS", "1.5"))
+SPECULATION = os.getenv("SPECULATION", "1") == "1"
+FINISHED_MAX_SESSIONS = 4096
+
+_jobs = {}          # session id -> SpeculativeJob
+_finished = OrderedDict()   # session id -> key of its last completed job
+_lock = threading.Lock()
+
+
+class SpeculativeJob:
+
+    def __init__(self, session_id, key, user_data, user):
+        self.session_id = session_id
+        self.key = key
+        self.user_data = user_data
+        self.user = user
+        self.cancelled = threading.Event()
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self._timer = None
+
+    def schedule(self):
+        """Start, or restart, the idle timer (no-op once running)."""
+        if self.started.is_set():
+            return
+        self.pause()
+        self._timer = threading.Timer(SPECULATIVE_IDLE_SECONDS, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def pause(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def cancel(self):
+        if not self.done.is_set():
+            self.cancelled.set()
+            self.pause()
+            inc("ffs_speculation_total", outcome="cancelled")
+
+    def _run(self):
+        from services.api_client import calculate_projections
+        from ui.summary import warm_report_cache
+
+        with _lock:
+            # A timer restarted just as it fired must not run the job twice
+            if self.started.is_set() or self.cancelled.is_set():
+                return
+            self.started.set()
+        inc("ffs_speculation_total", outcome="started")
+        completed = False
+        try:
+            result = calculate_projections(self.user_data, self.user)
+            if not self.cancelled.is_set() and not result.get("_stale"):
+                warm_report_cache(
+                    result, self.user_data, self.user, pdf=False, advice=False, cancelled=self.cancelled
+                )
+            if not self.cancelled.is_set():
+                completed = True
+                inc("ffs_speculation_total", outcome="completed")
+        except Exception as e:
+            inc("ffs_speculation_total", outcome="failed")
+            print(f"[speculation] Report precompute failed: {e}")
+        finally:
+            self.done.set()
+            with _lock:
+                if _jobs.get(self.session_id) is self:
+                    del _jobs[self.session_id]
+                if completed:
+                    _finished[self.session_id] = self.key
+                    _finished.move_to_end(self.session_id)
+                    while len(_finished) > FINISHED_MAX_SESSIONS:
+                        _finished.popitem(last=False)
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def on_rerun(page: str):
+    """
+    Call at the start of every rerun: the user is not idle. A pending job
+    waits again (speculate_report restarts its timer) while on Strategy;
+    running work survives only while on Strategy or Report (it is for
+    their inputs).
+    """
+    sid = _session_id()
+    with _lock:
+        job = _jobs.get(sid)
+        if job is None:
+            return
+        if page == "Strategy" or (page == "Report" and job.started.is_set()):
+            job.pause()
+            return
+        job.cancel()
+        del _jobs[sid]
+
+
+def speculate_report(user_data: dict, user: dict, report_inputs):
+    """
+    Call when a Strategy rerun has finished. Schedules (or keeps) the
+    precompute for the live `user_data`; `report_inputs()` returns a
+    private copy prepared as the next Report rerun will send it, and is
+    only called when a new job is created.
+    """
+    sid = _session_id()
+    if not SPECULATION or sid is None:
+        return
+
+    key = shared_cache.cache_key(user_data, user)
+    with _lock:
+        job = _jobs.get(sid)
+        if job is not None and job.key == key and not job.cancelled.is_set():
+            job.schedule()
+            return
+        if job is None and _finished.get(sid) == key:
+            return
+
+    job = SpeculativeJob(sid, key, report_inputs(), dict(user))
+    with _lock:
+        previous = _jobs.get(sid)
+        if previous is not None:
+            previous.cancel()
+        _jobs[sid] = job
+    job.schedule()
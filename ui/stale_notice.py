@@ -0,0 +1,40 @@
+import time
+
+import streamlit as st
+
+STALE_RECHECK_SECONDS = 3
+
+
+def _age(seconds: int) -> str:
+    if seconds < 90:
+        return "a moment"
+    if seconds < 5400:
+        return f"{round(seconds / 60)} minutes"
+    return f"{round(seconds / 3600)} hours"
+
+
+def render_stale_notice(result: dict):
+    """Say so when calculate_projections served a stale result."""
+    stale = (result or {}).get("_stale")
+    if not stale:
+        return
+
+    cause = "is slow" if stale["reason"] == "slow" else "is unavailable"
+    inputs = "your inputs" if stale["exact"] else "your previous inputs"
+    st.warning(
+        f"⏳ The projection service {cause}. Showing results for {inputs} "
+        f"from {_age(stale['age_seconds'])} ago; they refresh automatically.",
+    )
+    _rerun_when_refreshed(stale["key"], time.monotonic())
+
+
+@st.fragment(run_every=STALE_RECHECK_SECONDS)
+def _rerun_when_refreshed(key, shown_at: float):
+    """Rerun the app once the background refresh lands (or may be retried)."""
+    from services.api_client import projection_refresh_ready
+
+    # Not on the first run, inline with the page: only on the timer's ticks
+    if time.monotonic() - shown_at < STALE_RECHECK_SECONDS / 2:
+        return
+    if projection_refresh_ready(key):
+        st.rerun()
@@ -2,10 +2,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from ui.pdf import generate_financial_summary_pdf_playwright
 from ui.retirement_profiles import RETIREMENT_PROFILES
-from services.api_client import get_advisor_recommendations
-from ui.advisor_panel import render_advisor_panel
+from services.advisor_cache import request_advice
+from ui.advisor_panel import render_advisor_panel, render_advisor_panel_streaming
+from services import artifacts, shared_cache
+from services.metrics import span
 
 import plotly.graph_objects as go
 
@@ -17,6 +18,59 @@ def section(title, subtitle=None):
         st.caption(subtitle)
     return st.container(border=True)
 
+
+def cached_report_pdf(advisor_job=None, **pdf_kwargs) -> str:
+    """
+    Artifact key of the PDF for these inputs, rendering it only if no
+    session (in any process) has built it yet. The advice comes from
+    `advisor_job` and is keyed by the job (the inputs it was asked
+    for), not by its text: a PDF built before the advice finished is
+    returned but never cached.
+    """
+    from ui.pdf import generate_financial_summary_pdf_playwright
+
+    parts = ["advisor", advisor_job.key if advisor_job else None]
+    for name in sorted(pdf_kwargs):
+        parts += [name, pdf_kwargs[name]]
+    cache_key = shared_cache.cache_key("report_pdf", *parts)
+
+    artifact = shared_cache.get("pdf", cache_key)
+    if artifacts.exists(artifact):
+        return artifact
+
+    advice = advisor_job.wait() if advisor_job else None
+    pdf_bytes = generate_financial_summary_pdf_playwright(advisor_advice=advice, **pdf_kwargs)
+    if isinstance(pdf_bytes, bytearray):
+        pdf_bytes = bytes(pdf_bytes)
+    artifact = artifacts.put(pdf_bytes)
+    if advisor_job is None or (advisor_job.done.is_set() and advisor_job.error is None):
+        shared_cache.put("pdf", cache_key, artifact)
+    return artifact
+
+
+def generate_report_pdf(file_name, **pdf_kwargs):
+    """Keep the PDF on disk; the session holds only its artifact key."""
+    st.session_state["generated_pdf_key"] = cached_report_pdf(**pdf_kwargs)
+    st.session_state["generated_pdf_name"] = file_name
+
+
+def render_pdf_download(label, **kwargs):
+    """Download button for the stored PDF, read from disk only on click."""
+    key = st.session_state.get("generated_pdf_key")
+    if not artifacts.exists(key):
+        # Expired from the store (or evicted): generate again
+        st.session_state.pop("generated_pdf_key", None)
+        return
+
+    st.download_button(
+        label=label,
+        # Streamlit reads the file once on click and drops it, closing it
+        data=lambda: artifacts.open_artifact(key),
+        file_name=st.session_state["generated_pdf_name"],
+        mime="application/pdf",
+        **kwargs,
+    )
+
 # -------------------------------------------------
 # Safe nested getter
 # -------------------------------------------------
@@ -106,6 +160,305 @@ def style_chart_for_pdf(fig):
         autosize=False
     )
     return fig
+
+# -------------------------------------------------
+# Figure builders (no st.* calls; shared by desktop, mobile and PDF)
+# -------------------------------------------------
+def build_score_figure(breakdown: dict):
+    breakdown_df = pd.DataFrame({
+        "Category": breakdown.keys(),
+        "Score": breakdown.values()
+    })
+    return px.bar(
+        breakdown_df,
+        x="Category",
+        y="Score",
+        color="Score",
+        color_continuous_scale="Blues"
+    )
+
+
+def build_income_expense_figure(df):
+    return px.line(
+        df,
+        x="Year",
+        y=["TotalIncome", "TotalExpenses"],
+        markers=True,
+        color_discrete_sequence=["#22c55e", "#ef4444"],
+    )
+
+
+def build_corpus_figure(df):
+    return px.area(
+        df,
+        x="Year",
+        y="EndingCorpus",
+        color_discrete_sequence=["#6366f1"],
+    )
+
+
+def build_tax_figure(df):
+    return px.line(
+        df,
+        x="Year",
+        y=["TotalTax", "NetIncomeAfterTax"],
+        markers=True,
+        color_discrete_sequence=["#f59e0b", "#22c55e"],
+    )
+
+
+def expense_rows(user_data: dict):
+    """(onetime_rows, recurring_rows) for the current country, zero entries dropped."""
+    country = user_data.get("country")
+
+    onetime = user_data.get("onetime_expenses", {}).get(country, {})
+    onetime_rows = [
+        {"Category": k, "Amount": v.get("input", 0)}
+        for k, v in onetime.items()
+        if v.get("input", 0) > 0
+    ]
+
+    recurring = user_data.get("recurring_expenses", {}).get(country, {})
+    recurring_rows = []
+    for k, v in recurring.items():
+        yearly = v.get("monthly", 0) * 12
+        if yearly > 0:
+            recurring_rows.append({"Category": k, "Amount": yearly})
+
+    return onetime_rows, recurring_rows
+
+
+def build_onetime_figure(onetime_rows: list):
+    if not onetime_rows:
+        return go.Figure()
+
+    fig_ot = px.pie(pd.DataFrame(onetime_rows), names="Category", values="Amount", title="One-Time Expenses")
+    fig_ot.update_layout(
+        showlegend=True,
+        legend=dict(
+            font=dict(color="black"),
+            orientation="h",
+            yanchor="bottom",
+            y=-0.1,
+            xanchor="center",
+            x=0.5
+        ),
+        font=dict(color="#111827"),   # force visible text
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        template="plotly_white",
+    )
+    return fig_ot
+
+
+def build_recurring_figure(recurring_rows: list):
+    if not recurring_rows:
+        return go.Figure()
+
+    fig_rec = px.pie(pd.DataFrame(recurring_rows), names="Category", values="Amount", title="Recurring Expenses (Year 1)")
+    fig_rec.update_traces(
+        textinfo="label+percent",
+        textposition="inside",
+        insidetextorientation="radial",
+        showlegend=True
+    )
+    fig_rec.update_layout(
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            font=dict(color="black"),
+        ),
+        font=dict(color="#111827"),   # force visible text
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        template="plotly_white",
+    )
+    return fig_rec
+
+
+def build_expense_growth_figure(df):
+    fig_exp_growth = px.line(
+        df,
+        x="Year",
+        y=["AnnualMustExpenses", "AnnualOptionalExpenses", "TotalExpenses"],
+        markers=True,
+        color_discrete_sequence=[
+            "#6366f1",
+            "#22c55e",
+            "#f59e0b",
+            "#ef4444",
+        ],
+        title="Expense Growth Over Time"
+    )
+    fig_exp_growth.update_layout(
+        template="plotly_white",
+        legend_title="Expense Growth Over Time",
+    )
+    return fig_exp_growth
+
+
+def build_scenario_comparison_df(base_context: dict):
+    rows = []
+    for name, proj in base_context.get("scenario_results", {}).items():
+        df_s = pd.DataFrame(proj)
+        last = df_s.iloc[-1]
+
+        rows.append({
+            "Scenario": name,
+            "Ending Corpus": last["EndingCorpus"],
+            "Year-1 Income": df_s.iloc[0]["TotalIncome"],
+            "Year-1 Expenses": df_s.iloc[0]["TotalExpenses"],
+            "Year-1 Net Income": df_s.iloc[0]["NetIncomeAfterTax"],
+        })
+
+    return pd.DataFrame(rows)
+
+
+def build_scenario_comparison_figure(cmp_df):
+    return px.bar(
+        cmp_df,
+        x="Scenario",
+        y="Ending Corpus",
+        color="Scenario",
+        color_discrete_sequence=["#6366f1", "#22c55e", "#ef4444"],
+    )
+
+
+def build_pdf_chart_html(fig_ie, fig_corpus, fig_tax, fig_ot, fig_rec, fig_exp_growth) -> dict:
+    """Restyle the report figures for A4 and return the chart_html kwargs for the PDF."""
+    return {
+        "income_expense_chart_html": style_chart_for_pdf(fig_ie).to_html(full_html=False, include_plotlyjs=False),
+        "corpus_chart_html": style_chart_for_pdf(fig_corpus).to_html(full_html=False, include_plotlyjs=False),
+        "tax_chart_html": style_chart_for_pdf(fig_tax).to_html(full_html=False, include_plotlyjs=False),
+        "onetime_chart_html": style_chart_for_pdf(fig_ot).to_html(full_html=False, include_plotlyjs=False),
+        "recurring_chart_html": style_chart_for_pdf(fig_rec).to_html(full_html=False, include_plotlyjs=False),
+        "expense_growth_chart_html": style_chart_for_pdf(fig_exp_growth).to_html(full_html=False, include_plotlyjs=False),
+    }
+
+def cached_figure(builder, *args):
+    """builder(*args), shared across sessions and processes by input."""
+    key = shared_cache.cache_key(builder.__name__, *args)
+    return shared_cache.get_or_compute("figures", key, lambda: builder(*args))
+
+
+def cached_pdf_chart_html(df, onetime_rows, recurring_rows, figs) -> dict:
+    """build_pdf_chart_html(*figs), skipping the HTML export when cached."""
+    key = shared_cache.cache_key("pdf_chart_html", df, onetime_rows, recurring_rows)
+    chart_html = shared_cache.get("figures", key)
+    if chart_html is None:
+        chart_html = build_pdf_chart_html(*figs)
+        shared_cache.put("figures", key, chart_html)
+    else:
+        # A fresh build restyles the figures in place; keep that on screen
+        for fig in figs:
+            style_chart_for_pdf(fig)
+    return chart_html
+
+
+def warm_report_cache(result, user_data, user, pdf_years=None, pdf=True, advice=True, cancelled=None):
+    """
+    Build what render_summary draws for this projection result (figures,
+    PDF chart HTML, with `advice` the advisor advice and, with `pdf`, the
+    PDF, optionally only its first `pdf_years` years) into the shared cache without
+    rendering anything, so the Report page finds every piece cached.
+    Safe off the script thread. Stops early once `cancelled` (an Event)
+    is set. Returns the PDF's artifact key, if one was built.
+    """
+    def stop():
+        return cancelled is not None and cancelled.is_set()
+
+    projections = result["active_result"]["projections"]
+    base_context = result["base_context"]
+    meta = base_context["_meta"]
+    scenario_name = meta.get("scenario", "Base")
+
+    df = pd.DataFrame(projections)
+    score, breakdown = compute_retirement_score(df, base_context)
+    cached_figure(build_score_figure, breakdown)
+    if stop():
+        return None
+
+    onetime_rows, recurring_rows = expense_rows(user_data)
+    chart_html = cached_pdf_chart_html(
+        df, onetime_rows, recurring_rows,
+        (
+            cached_figure(build_income_expense_figure, df),
+            cached_figure(build_corpus_figure, df),
+            cached_figure(build_tax_figure, df),
+            cached_figure(build_onetime_figure, onetime_rows),
+            cached_figure(build_recurring_figure, recurring_rows),
+            cached_figure(build_expense_growth_figure, df),
+        ),
+    )
+    if stop():
+        return None
+
+    cmp_df = build_scenario_comparison_df(base_context)
+    cached_figure(build_scenario_comparison_figure, cmp_df)
+
+    advisor_job = None
+    if advice:
+        advisor_job = request_advice(
+            projections=projections,
+            base_context=base_context,
+            scenario=user_data["investment_plan"]["scenarios"][scenario_name],
+            user_data=user_data,
+        )
+    if not pdf or stop():
+        return None
+
+    return cached_report_pdf(
+        username=user.get("username", "Guest"),
+        base_context=base_context,
+        projection_df=df if pdf_years is None else df.head(pdf_years),
+        currency=meta.get("currency", "₹"),
+        retirement_score=score,
+        score_breakdown=breakdown,
+        advisor_job=advisor_job,
+        scenario_comparison_df=cmp_df,
+        **chart_html,
+    )
+
+
+# -------------------------------------------------
+# Advisor (cached, fetched in background)
+# -------------------------------------------------
+def start_advisor_slot(projections, user_data, base_context, scenario_name):
+    """
+    Reserves the advisor slot and starts (or reuses) the cached fetch.
+    Returns (job, pending_slot); pending_slot is None when the advice
+    was already rendered.
+    """
+    slot = st.empty()
+    try:
+        job = request_advice(
+            projections=projections,
+            base_context=base_context,
+            scenario=user_data["investment_plan"]["scenarios"][scenario_name],
+            user_data=user_data,
+        )
+    except Exception:
+        slot.info("Advisor insights unavailable.")
+        return None, None
+
+    if job.done.is_set():
+        with slot.container():
+            render_advisor_panel(job.advice)
+        return job, None
+
+    advice, _ = job.snapshot()
+    with slot.container():
+        render_advisor_panel(advice, expanded=True, streaming=True)
+    return job, slot
+
+
+def finish_advisor_slot(job, slot):
+    """Stream the remaining insights into a pending slot once the rest of the page is drawn."""
+    if job is None or slot is None:
+        return
+    with span("advisor_stream"):
+        render_advisor_panel_streaming(job, slot)
+
 # -------------------------------------------------
 # MAIN SUMMARY
 # -------------------------------------------------
@@ -115,8 +468,6 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
     is_mobile = st.session_state.get("is_mobile", False)
     is_guest = st.session_state.get("is_guest",False)
 
-    fig_ot = go.Figure()
-    fig_rec = go.Figure()
     with section(
         "Scenario Overview",
         "Your financial outcome based on current inputs"
@@ -212,18 +563,8 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
 
         st.markdown("### 📊 Score Breakdown")
 
-        breakdown_df = pd.DataFrame({
-            "Category": breakdown.keys(),
-            "Score": breakdown.values()
-        })
-
-        fig_score = px.bar(
-            breakdown_df,
-            x="Category",
-            y="Score",
-            color="Score",
-            color_continuous_scale="Blues"
-        )
+        with span("build_figures"):
+            fig_score = cached_figure(build_score_figure, breakdown)
         height = 320 if is_mobile else 500
         fig_score.update_layout(height=height)
         st.plotly_chart(fig_score, width='stretch')
@@ -256,36 +597,22 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
     with section("📈 Financial Trajectory", "Income, savings and tax evolution"):
     
         st.markdown("**📈 Will My Income Cover My Expenses? - Income vs Expenses*")
-        fig_ie = px.line(
-            df,
-            x="Year",
-            y=["TotalIncome", "TotalExpenses"],
-            markers=True,
-            color_discrete_sequence=["#22c55e", "#ef4444"],
-        )
+        with span("build_figures"):
+            fig_ie = cached_figure(build_income_expense_figure, df)
         height = 320 if is_mobile else 500
         fig_ie.update_layout(height=height)
         st.plotly_chart(fig_ie, width='stretch')
 
         st.markdown("**Corpus Growth 💰 - How Your Savings Change Over Time**")
-        fig_corpus = px.area(
-            df,
-            x="Year",
-            y="EndingCorpus",
-            color_discrete_sequence=["#6366f1"],
-        )
+        with span("build_figures"):
+            fig_corpus = cached_figure(build_corpus_figure, df)
         height = 320 if is_mobile else 500
         fig_corpus.update_layout(height=height)
         st.plotly_chart(fig_corpus, width='stretch')
 
         st.markdown("**Tax Impact**")
-        fig_tax = px.line(
-            df,
-            x="Year",
-            y=["TotalTax", "NetIncomeAfterTax"],
-            markers=True,
-            color_discrete_sequence=["#f59e0b", "#22c55e"],
-        )
+        with span("build_figures"):
+            fig_tax = cached_figure(build_tax_figure, df)
         height = 320 if is_mobile else 500
         fig_tax.update_layout(height=height)
         st.plotly_chart(fig_tax, width='stretch')
@@ -364,132 +691,17 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
     # PDF Export
     # -------------------------------------------------
     
-    # Try to generate chart images for PDF; gracefully skip if kaleido unavailable
-    income_expense_png = None
-    corpus_png = None
-    country = user_data.get("country")
-
-    onetime = user_data.get("onetime_expenses", {}).get(country, {})
-    onetime_rows = [
-        {"Category": k, "Amount": v.get("input", 0)}
-        for k, v in onetime.items()
-        if v.get("input", 0) > 0
-    ]
-
-    onetime_chart_html = ""
-    if onetime_rows:
-        df_ot = pd.DataFrame(onetime_rows)
-        fig_ot = px.pie(df_ot, names="Category", values="Amount", title="One-Time Expenses")
-        #fig_ot.update_traces(
-        #    textinfo="label+percent",
-        #    textposition="inside",   # or "outside"
-        #    insidetextorientation="radial",
-        #    showlegend=True
-        #)
-        fig_ot.update_layout(
-            showlegend=True,
-            legend=dict(
-                font=dict(color="black"),
-                orientation="h",
-                yanchor="bottom",
-                y=-0.1,
-                xanchor="center",
-                x=0.5
-            ),
-            font=dict(color="#111827"),   # force visible text
-            paper_bgcolor="white",
-            plot_bgcolor="white",
-            
-            template="plotly_white",
-        )
-        #fig_ot.update_layout(
-        #            template="plotly_white",
-        #            legend_title="One Time Expense Category",
-        #            showlegend=True,
-        #            legend=dict(
-        #                orientation="v",
-        #                font=dict(size=12)
-        #            ),
-        #        )
-        
-    
-    recurring = user_data.get("recurring_expenses", {}).get(country, {})
-
-    recurring_rows = []
-    for k, v in recurring.items():
-        yearly = v.get("monthly", 0) * 12
-        if yearly > 0:
-            recurring_rows.append({"Category": k, "Amount": yearly})
-
-    recurring_chart_html = ""
-    if recurring_rows:
-        df_rec = pd.DataFrame(recurring_rows)
-        fig_rec = px.pie(df_rec, names="Category", values="Amount", title="Recurring Expenses (Year 1)")
-        fig_rec.update_traces(
-            textinfo="label+percent",
-            textposition="inside",   # or "outside"
-            insidetextorientation="radial",
-            showlegend=True
-        )
-        fig_rec.update_layout(
-            showlegend=True,
-            legend=dict(
-                orientation="v",
-                font=dict(color="black"),
-                #yanchor="bottom",
-                #y=-0.2,
-                #xanchor="center",
-                #x=0.5
-            ),
-            font=dict(color="#111827"),   # force visible text
-            paper_bgcolor="white",
-            plot_bgcolor="white",
-            template="plotly_white",
-        )
-        #fig_rec.update_layout(
-        #            template="plotly_white",
-        #            legend_title="Recurring Expense Category",
-        #            showlegend=True,
-        #            legend=dict(
-        #                orientation="v",
-        #                font=dict(size=12)
-        #            ),
-        #        )
-        
-
-    expense_growth_chart_html = ""
-
-    if not df.empty:
-        fig_exp_growth = px.line(
-            df,
-            x="Year",
-            y=["AnnualMustExpenses", "AnnualOptionalExpenses", "TotalExpenses"],
-            markers=True,
-            color_discrete_sequence=[
-                "#6366f1",
-                "#22c55e",
-                "#f59e0b",
-                "#ef4444",
-            ],
-            title="Expense Growth Over Time"
-        )
-        fig_exp_growth.update_layout(
-                    template="plotly_white",
-                    legend_title="Expense Growth Over Time",
-                )
-        
-       # Expense breakdown charts (country-safe)
-    fig_ot = style_chart_for_pdf(fig_ot)
-    onetime_chart_html = fig_ot.to_html(full_html=False, include_plotlyjs=False)
-    fig_rec = style_chart_for_pdf(fig_rec)
-    recurring_chart_html = fig_rec.to_html(full_html=False, include_plotlyjs=False)
-    fig_exp_growth = style_chart_for_pdf(fig_exp_growth)
-    fig_ie = style_chart_for_pdf(fig_ie)
-    fig_corpus = style_chart_for_pdf(fig_corpus)
-    fig_tax = style_chart_for_pdf(fig_tax)
-    income_expense_chart_html = fig_ie.to_html(full_html=False, include_plotlyjs=False)
-    corpus_chart_html = fig_corpus.to_html(full_html=False, include_plotlyjs=False)
-    tax_chart_html = fig_tax.to_html(full_html=False, include_plotlyjs=False)
+    onetime_rows, recurring_rows = expense_rows(user_data)
+    with span("build_figures"):
+        fig_ot = cached_figure(build_onetime_figure, onetime_rows)
+        fig_rec = cached_figure(build_recurring_figure, recurring_rows)
+        fig_exp_growth = cached_figure(build_expense_growth_figure, df)
+
+    # Restyled for the PDF before the expense charts are drawn below
+    chart_html = cached_pdf_chart_html(
+        df, onetime_rows, recurring_rows,
+        (fig_ie, fig_corpus, fig_tax, fig_ot, fig_rec, fig_exp_growth),
+    )
 
     with section("💸 Expense Structure", "Where your money goes"):
     
@@ -516,34 +728,12 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
 
     with section("🔀 Scenario Comparison", "Compare financial outcomes"):
 
-        scenario_results = base_context.get("scenario_results", {})
-        #scenario_results = base_context.get("scenario_results", {})
-
-
-        rows = []
-        for name, proj in scenario_results.items():
-            df_s = pd.DataFrame(proj)
-            last = df_s.iloc[-1]
-
-            rows.append({
-                "Scenario": name,
-                "Ending Corpus": last["EndingCorpus"],
-                "Year-1 Income": df_s.iloc[0]["TotalIncome"],
-                "Year-1 Expenses": df_s.iloc[0]["TotalExpenses"],
-                "Year-1 Net Income": df_s.iloc[0]["NetIncomeAfterTax"],
-            })
-
-        cmp_df = pd.DataFrame(rows)
+        cmp_df = build_scenario_comparison_df(base_context)
 
         st.dataframe(cmp_df, width='stretch')
 
-        fig = px.bar(
-            cmp_df,
-            x="Scenario",
-            y="Ending Corpus",
-            color="Scenario",
-            color_discrete_sequence=["#6366f1", "#22c55e", "#ef4444"],
-        )
+        with span("build_figures"):
+            fig = cached_figure(build_scenario_comparison_figure, cmp_df)
         height = 320 if is_mobile else 500
         fig.update_layout(height=height)
         st.plotly_chart(fig, width='stretch')
@@ -551,21 +741,22 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
         #st.dataframe(cmp_df, use_container_width=True)
         #st.plotly_chart(fig, use_container_width=True)
 
+    with section("🌪️ What Moves Your Outcome", "Each market assumption nudged on its own"):
+        from services.api_client import get_config
+        from ui.assumption_diff import render_assumption_diff_panel
+        from ui.sensitivity import render_sensitivity
+
+        render_sensitivity(user_data, user, currency, is_mobile)
+        render_assumption_diff_panel(get_config(user_data.get("country", "IN"))["base_data"], user_data, user)
+
     with section("🧠 Advisor Insights"):
 
     # -------------------------------------------------
     # Advisor Insights
         # -------------------------------------------------
-        try:
-            advice = get_advisor_recommendations(
-                projections=projections,
-                base_context=base_context,
-                scenario=user_data["investment_plan"]["scenarios"][scenario_name],
-                user_data=user_data,
-            )
-            render_advisor_panel(advice)
-        except Exception:
-            st.info("Advisor insights unavailable.")
+        advisor_job, advisor_slot = start_advisor_slot(
+            projections, user_data, base_context, scenario_name
+        )
         #try:
         #    advice = get_advisor_recommendations(...)
         #    render_advisor_panel(advice)
@@ -587,40 +778,27 @@ def render_summary(projections, user_data, user, base_context,life_stage=None,st
             # The actual generation logic
             if st.button(btn_text, use_container_width=True):
                 with st.spinner("Generating your PDF report... Please wait."):
-                    
-                    pdf_bytes = generate_financial_summary_pdf_playwright(
+                    generate_report_pdf(
+                        f"{user.get('username', 'Demo')}_summary.pdf",
                         username=user.get("username", "Guest"),
                         base_context=base_context,
                         projection_df=pdf_df, # Uses the capped or full DF based on tier
                         currency=currency,
                         retirement_score=score,
                         score_breakdown=breakdown,
-                        advisor_advice=advice,
-                        income_expense_chart_html=income_expense_chart_html,
-                        corpus_chart_html=corpus_chart_html,
-                        tax_chart_html=tax_chart_html,
-                        scenario_comparison_df=cmp_df, 
-                        onetime_chart_html=onetime_chart_html,
-                        recurring_chart_html=recurring_chart_html,
-                        expense_growth_chart_html=expense_growth_chart_html,
+                        advisor_job=advisor_job,
+                        scenario_comparison_df=cmp_df,
+                        **chart_html,
                     )
 
-                    if isinstance(pdf_bytes, bytearray):
-                        pdf_bytes = bytes(pdf_bytes)
-
-                    st.session_state["generated_pdf"] = pdf_bytes
-                    st.session_state["generated_pdf_name"] = f"{user.get('username', 'Demo')}_summary.pdf"
+            # Display the download button once a PDF has been generated
+            render_pdf_download(
+                "⬇️ Click here to Download PDF",
+                type="primary",
+                use_container_width=True,
+            )
 
-            # Display the download button if the PDF exists in memory
-            if "generated_pdf" in st.session_state:
-                st.download_button(
-                    label="⬇️ Click here to Download PDF",
-                    data=st.session_state["generated_pdf"],
-                    file_name=st.session_state["generated_pdf_name"],
-                    mime="application/pdf",
-                    type="primary",
-                    use_container_width=True
-                )
+    finish_advisor_slot(advisor_job, advisor_slot)
 
 # -------------------------------------------------
 # MAIN SUMMARY
@@ -629,8 +807,6 @@ def render_summary_mobile(projections, user_data, user, base_context, life_stage
     st.title("📊 Financial Outcome Summary")
 
     is_mobile = st.session_state.get("is_mobile", False)
-    fig_ot = go.Figure()
-    fig_rec = go.Figure()
     
     with section("Scenario Overview", "Your financial outcome based on current inputs"):
         if not projections or not isinstance(base_context, dict):
@@ -684,8 +860,8 @@ def render_summary_mobile(projections, user_data, user, base_context, life_stage
             st.error("Retirement plan needs strengthening.")
 
         st.markdown("### 📊 Score Breakdown")
-        breakdown_df = pd.DataFrame({"Category": breakdown.keys(), "Score": breakdown.values()})
-        fig_score = px.bar(breakdown_df, x="Category", y="Score", color="Score", color_continuous_scale="Blues")
+        with span("build_figures"):
+            fig_score = cached_figure(build_score_figure, breakdown)
         
         # Tighter mobile layout
         fig_score.update_layout(height=320 if is_mobile else 500, margin=dict(l=0, r=0, t=20, b=0))
@@ -709,76 +885,36 @@ def render_summary_mobile(projections, user_data, user, base_context, life_stage
 
     with section("📈 Financial Trajectory", "Income, savings and tax evolution"):
         st.markdown("**📈 Will My Income Cover My Expenses?**")
-        fig_ie = px.line(df, x="Year", y=["TotalIncome", "TotalExpenses"], markers=True, color_discrete_sequence=["#22c55e", "#ef4444"])
+        with span("build_figures"):
+            fig_ie = cached_figure(build_income_expense_figure, df)
         fig_ie.update_layout(height=320 if is_mobile else 500, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_ie, use_container_width=True)
 
         st.markdown("**💰 Corpus Growth Over Time**")
-        fig_corpus = px.area(df, x="Year", y="EndingCorpus", color_discrete_sequence=["#6366f1"])
+        with span("build_figures"):
+            fig_corpus = cached_figure(build_corpus_figure, df)
         fig_corpus.update_layout(height=320 if is_mobile else 500, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_corpus, use_container_width=True)
 
         st.markdown("**🧾 Tax Impact**")
-        fig_tax = px.line(df, x="Year", y=["TotalTax", "NetIncomeAfterTax"], markers=True, color_discrete_sequence=["#f59e0b", "#22c55e"])
+        with span("build_figures"):
+            fig_tax = cached_figure(build_tax_figure, df)
         fig_tax.update_layout(height=320 if is_mobile else 500, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_tax, use_container_width=True)
 
     # -------------------------------------------------
     # PDF Export Generation (Logic preserved)
     # -------------------------------------------------
-    income_expense_png = None
-    corpus_png = None
-    country = user_data.get("country")
-
-    onetime = user_data.get("onetime_expenses", {}).get(country, {})
-    onetime_rows = [{"Category": k, "Amount": v.get("input", 0)} for k, v in onetime.items() if v.get("input", 0) > 0]
-    onetime_chart_html = ""
-    
-    if onetime_rows:
-        df_ot = pd.DataFrame(onetime_rows)
-        fig_ot = px.pie(df_ot, names="Category", values="Amount", title="One-Time Expenses")
-        fig_ot.update_layout(
-            showlegend=True, legend=dict(font=dict(color="black"), orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
-            font=dict(color="#111827"), paper_bgcolor="white", plot_bgcolor="white", template="plotly_white",
-        )
-        
-    recurring = user_data.get("recurring_expenses", {}).get(country, {})
-    recurring_rows = []
-    for k, v in recurring.items():
-        yearly = v.get("monthly", 0) * 12
-        if yearly > 0:
-            recurring_rows.append({"Category": k, "Amount": yearly})
-
-    recurring_chart_html = ""
-    if recurring_rows:
-        df_rec = pd.DataFrame(recurring_rows)
-        fig_rec = px.pie(df_rec, names="Category", values="Amount", title="Recurring Expenses (Year 1)")
-        fig_rec.update_traces(textinfo="label+percent", textposition="inside", insidetextorientation="radial", showlegend=True)
-        fig_rec.update_layout(
-            showlegend=True, legend=dict(orientation="v", font=dict(color="black")),
-            font=dict(color="#111827"), paper_bgcolor="white", plot_bgcolor="white", template="plotly_white",
-        )
-
-    expense_growth_chart_html = ""
-    if not df.empty:
-        fig_exp_growth = px.line(
-            df, x="Year", y=["AnnualMustExpenses", "AnnualOptionalExpenses", "TotalExpenses"],
-            markers=True, color_discrete_sequence=["#6366f1", "#22c55e", "#f59e0b", "#ef4444"], title="Expense Growth Over Time"
-        )
-        fig_exp_growth.update_layout(template="plotly_white", legend_title="Expense Growth Over Time")
-        
-    # PDF generation calls
-    fig_ot = style_chart_for_pdf(fig_ot)
-    onetime_chart_html = fig_ot.to_html(full_html=False, include_plotlyjs=False)
-    fig_rec = style_chart_for_pdf(fig_rec)
-    recurring_chart_html = fig_rec.to_html(full_html=False, include_plotlyjs=False)
-    fig_exp_growth = style_chart_for_pdf(fig_exp_growth)
-    fig_ie = style_chart_for_pdf(fig_ie)
-    fig_corpus = style_chart_for_pdf(fig_corpus)
-    fig_tax = style_chart_for_pdf(fig_tax)
-    income_expense_chart_html = fig_ie.to_html(full_html=False, include_plotlyjs=False)
-    corpus_chart_html = fig_corpus.to_html(full_html=False, include_plotlyjs=False)
-    tax_chart_html = fig_tax.to_html(full_html=False, include_plotlyjs=False)
+    onetime_rows, recurring_rows = expense_rows(user_data)
+    with span("build_figures"):
+        fig_ot = cached_figure(build_onetime_figure, onetime_rows)
+        fig_rec = cached_figure(build_recurring_figure, recurring_rows)
+        fig_exp_growth = cached_figure(build_expense_growth_figure, df)
+
+    chart_html = cached_pdf_chart_html(
+        df, onetime_rows, recurring_rows,
+        (fig_ie, fig_corpus, fig_tax, fig_ot, fig_rec, fig_exp_growth),
+    )
 
     # -------------------------------------------------
     # Expense Structure UI (Stacked for Mobile)
@@ -801,83 +937,58 @@ def render_summary_mobile(projections, user_data, user, base_context, life_stage
     # Scenario Comparison UI (Cards + Expander)
     # -------------------------------------------------
     with section("🔀 Scenario Comparison", "Compare financial outcomes"):
-        scenario_results = base_context.get("scenario_results", {})
-        rows = []
-        for name, proj in scenario_results.items():
-            df_s = pd.DataFrame(proj)
-            last = df_s.iloc[-1]
-            rows.append({
-                "Scenario": name,
-                "Ending Corpus": last["EndingCorpus"],
-                "Year-1 Income": df_s.iloc[0]["TotalIncome"],
-                "Year-1 Expenses": df_s.iloc[0]["TotalExpenses"],
-                "Year-1 Net Income": df_s.iloc[0]["NetIncomeAfterTax"],
-            })
-
-        if rows:
+        cmp_df = build_scenario_comparison_df(base_context)
+
+        if not cmp_df.empty:
             # Display beautifully as cards
-            for row in rows:
+            for row in cmp_df.to_dict("records"):
                 with st.container(border=True):
                     st.markdown(f"### {row['Scenario']}")
                     st.metric("Ending Corpus", f"{currency}{row['Ending Corpus']:,.0f}")
                     st.caption(f"Year-1 Net Income: **{currency}{row['Year-1 Net Income']:,.0f}**")
 
-            cmp_df = pd.DataFrame(rows)
-            
             # Hide the raw data frame table to prevent horizontal scrolling
             with st.expander("📄 View Comparison Data Table"):
                 st.dataframe(cmp_df, use_container_width=True)
 
-            fig = px.bar(
-                cmp_df, x="Scenario", y="Ending Corpus", color="Scenario",
-                color_discrete_sequence=["#6366f1", "#22c55e", "#ef4444"],
-            )
+            with span("build_figures"):
+                fig = cached_figure(build_scenario_comparison_figure, cmp_df)
             fig.update_layout(height=350 if is_mobile else 500, margin=dict(l=0, r=0, t=20, b=0))
             st.plotly_chart(fig, use_container_width=True)
 
+    with section("🌪️ What Moves Your Outcome", "Each market assumption nudged on its own"):
+        from services.api_client import get_config
+        from ui.assumption_diff import render_assumption_diff_panel
+        from ui.sensitivity import render_sensitivity
+
+        render_sensitivity(user_data, user, currency, is_mobile)
+        render_assumption_diff_panel(get_config(user_data.get("country", "IN"))["base_data"], user_data, user)
+
     with section("🧠 Advisor Insights"):
-        try:
-            advice = get_advisor_recommendations(
-                projections=projections,
-                base_context=base_context,
-                scenario=user_data["investment_plan"]["scenarios"][scenario_name],
-                user_data=user_data,
-            )
-            render_advisor_panel(advice)
-        except Exception:
-            st.info("Advisor insights unavailable.")
+        advisor_job, advisor_slot = start_advisor_slot(
+            projections, user_data, base_context, scenario_name
+        )
 
     with section("📄 Report Export"):
         if user.get("is_premium"):
             st.markdown("Download a comprehensive PDF version of this outlook.")
             if st.button("📥 Download Detailed Financial Report (PDF)", use_container_width=True, type="primary"):
                 with st.spinner("Generating PDF report..."):
-                    pdf_bytes = generate_financial_summary_pdf_playwright(
+                    generate_report_pdf(
+                        f"{user['username']}_{scenario_name}_summary.pdf",
                         username=user["username"],
                         base_context=base_context,
                         projection_df=df,
                         currency=currency,
                         retirement_score=score,
                         score_breakdown=breakdown,
-                        advisor_advice=advice,
-                        income_expense_chart_html=income_expense_chart_html,
-                        corpus_chart_html=corpus_chart_html,
-                        tax_chart_html=tax_chart_html,
+                        advisor_job=advisor_job,
                         scenario_comparison_df=cmp_df,
-                        onetime_chart_html=onetime_chart_html,
-                        recurring_chart_html=recurring_chart_html,
-                        expense_growth_chart_html=expense_growth_chart_html,
+                        **chart_html,
                     )
 
-                    if isinstance(pdf_bytes, bytearray):
-                        pdf_bytes = bytes(pdf_bytes)
-
-                    st.download_button(
-                        "Click here to save your PDF",
-                        pdf_bytes,
-                        file_name=f"{user['username']}_{scenario_name}_summary.pdf",
-                        mime="application/pdf",
-                        use_container_width=True
-                    )
+            render_pdf_download("Click here to save your PDF", use_container_width=True)
         else:
-            st.info("Upgrade to Premium to download detailed PDF reports.")
\ No newline at end of file
+            st.info("Upgrade to Premium to download detailed PDF reports.")
+
+    finish_advisor_slot(advisor_job, advisor_slot)